@@ -1,10 +1,14 @@
-import os, hashlib, redis, json
-from jira import JIRA
+import os, sys, hashlib, json
+
+# Shared Brain layer: hydrated into .agent/brain, or templates/brain in a source checkout
+_HERE = os.path.dirname(os.path.abspath(__file__))
+for _root in (os.path.join(_HERE, '..'), os.path.join(_HERE, '..', '..', 'templates')):
+    if os.path.isdir(os.path.join(_root, 'brain')):
+        sys.path.append(os.path.abspath(_root))
+        break
+from brain import redis_pool
 
 # CONFIG
-REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
-REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
-REDIS_PASSWORD = os.getenv('REDIS_PASSWORD', None)
 JIRA_SERVER = "https://tngshopper.atlassian.net"
 JIRA_USER = os.getenv('JIRA_USER_EMAIL')
 JIRA_TOKEN = os.getenv('JIRA_API_TOKEN')
@@ -13,11 +17,16 @@ JIRA_TOKEN = os.getenv('JIRA_API_TOKEN')
 PROJECT_KEY = "TNG"
 
 def get_redis():
-    return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD, db=0)
+    # The real Brain when reachable; otherwise the in-memory Brain, which only dedups within this process
+    if not (os.getenv('REDIS_URL') or os.getenv('REDIS_SOCKET')):
+        os.environ.setdefault('REDIS_HOST', 'localhost')
+    return redis_pool.get_client()
 
 def handle_failure(source, error_log, trace_id):
     try:
         r = get_redis()
+        if redis_pool.is_memory(r):
+            print("[WARN] Brain unreachable; filing with in-process deduplication only (no cross-run dedup).")
         # 1. Deduplication
         fingerprint = hashlib.sha256(f"{source}:{error_log[:200]}".encode()).hexdigest()
         cache_key = f"jira:issue:{fingerprint}"
@@ -26,7 +35,8 @@ def handle_failure(source, error_log, trace_id):
             print(f"🛡️ [IMMUNE] Duplicate suppressed.")
             return
 
-        # 2. Create Ticket
+        # 2. Create Ticket (the Jira SDK loads only when a ticket is actually filed)
+        from jira import JIRA
         print(f"🚨 [JIRA] Opening ticket in {PROJECT_KEY}...")
         jira = JIRA(server=JIRA_SERVER, basic_auth=(JIRA_USER, JIRA_TOKEN))
         summary = f"[{source}] Automated Alert: {error_log[:50]}..."
@@ -1,16 +1,14 @@
 import subprocess, sys, os, time, json, uuid
-import redis
-import vertexai
-from vertexai.generative_models import GenerativeModel
-from opentelemetry import trace
-from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+# Heavy SDKs (Vertex AI, OpenTelemetry SDK + Cloud Trace, Jira/Brain) are imported on the
+# paths that use them, so a passing run never pays for them at start-up.
 
 # Local Imports
 # ADAPTED: Corrected path for .agent directory structure
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Source checkout: shared modules live in templates/ until CI hydrates them into .agent/
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'templates')))
 from security import scrubber
+from observability import telemetry, profiling
 
 # CONFIG
 PROJECT_ID = os.getenv("GCP_PROJECT_ID")
@@ -35,20 +33,33 @@ def setup_telemetry():
                      os.environ.pop("GOOGLE_APPLICATION_CREDENTIALS", None)
 
         if PROJECT_ID:
-            exporter = CloudTraceSpanExporter(project_id=PROJECT_ID)
+            from opentelemetry import trace
+            from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
+            from opentelemetry.sdk.trace import TracerProvider
+            from observability import span_spool
+            try:
+                delegate = CloudTraceSpanExporter(project_id=PROJECT_ID)
+                print(f"📡 [UPLINK] Connected to Google Cloud Trace ({PROJECT_ID})")
+            except Exception as e:
+                # Retried by the spool's replayer; spans wait on disk meanwhile
+                delegate = lambda: CloudTraceSpanExporter(project_id=PROJECT_ID)
+                print(f"⚠️ [UPLINK] Offline: {e}. Spooling spans for replay.")
             provider = TracerProvider()
-            provider.add_span_processor(BatchSpanProcessor(exporter))
+            # Failed or slow exports spill to disk and replay in order on reconnect (or next run)
+            span_spool.install(provider, delegate, "antigravity-agent")
             trace.set_tracer_provider(provider)
-            print(f"📡 [UPLINK] Connected to Google Cloud Trace ({PROJECT_ID})")
         else:
             print("⚠️ [UPLINK] No Project ID. Telemetry disabled.")
     except Exception as e:
         print(f"⚠️ [UPLINK] Offline: {e}")
 
+@telemetry.traced("mind.consult")
 def consult_mind(error_log):
     """Consult Gemini Pro for a fix"""
     print(f"🧠 [MIND] Analyze Error...")
     try:
+        import vertexai
+        from vertexai.generative_models import GenerativeModel
         vertexai.init(project=PROJECT_ID, location="us-central1")
         model = GenerativeModel("gemini-2.0-flash-001")
         
@@ -67,25 +78,37 @@ def consult_mind(error_log):
         print(f"⚠️ [MIND] Silent: {e}")
 
 def main():
-    setup_telemetry()
+    profiling.start("orchestrator") # No-op unless ANTIGRAVITY_PROFILE is set
+    with profiling.phase("setup_telemetry"):
+        setup_telemetry()
+        telemetry.init("antigravity-agent") # Histograms to the collector's OTLP receiver
     # ... (Rest of logic remains consistent)
     phases = [("Build & Test", "python3 -m pytest tests/")]
     
     for name, cmd in phases:
         print(f"🔄 [ORCHESTRATOR] {name}...")
         instrumented_cmd = f"opentelemetry-instrument --service_name antigravity-agent {cmd}"
-        result = subprocess.run(instrumented_cmd, shell=True, capture_output=True, text=True)
-        safe_log = scrubber.scrub_payload(result.stderr + result.stdout)
+        with profiling.phase(name), telemetry.span("orchestrator.phase", phase=name):
+            result = subprocess.run(instrumented_cmd, shell=True, capture_output=True, text=True)
+            telemetry.annotate(exit_code=result.returncode)
+            if result.returncode != 0:
+                telemetry.mark_error(f"exit code {result.returncode}")
+        with telemetry.span("security.scrub"):
+            safe_log = scrubber.scrub_payload(result.stderr + result.stdout)
         
         if result.returncode != 0:
             print(f"❌ [FAIL] {name}")
             # ADAPTED: Importing from correct module path
             from observability import jira_bridge
-            jira_bridge.handle_failure(name, safe_log, TRACE_ID)
-            consult_mind(safe_log)
+            with profiling.phase("handle_failure"), telemetry.span("jira.handle_failure"):
+                jira_bridge.handle_failure(name, safe_log, TRACE_ID)
+            with profiling.phase("consult_mind"):
+                consult_mind(safe_log)
+            telemetry.print_summary()
             sys.exit(1)
         else:
             print(f"✅ [PASS] {name}")
+    telemetry.print_summary()
 
 if __name__ == "__main__":
     main()
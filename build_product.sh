@@ -65,8 +65,8 @@ EOF
 # Rule 07 (Telemetry)
 cat <<EOF > templates/rules/07-telemetry.md
 # Rule 07: Telemetry & Evolution
-1. **Friction Logging**: If a task fails validation or enters a loop (count > 2), you MUST append a row to \`docs/SDLC_Friction_Log.md\`.
-2. **Format**: \`| Date | Trace ID | Loop Count | Error Summary | Root Cause |\`
+1. **Friction Logging**: If a task fails validation or enters a loop (count > 2), you MUST log it with \`python3 .agent/observability/friction_log.py append --trace-id <id> --loop-count <n> --error "<summary>" --cause "<root cause>"\`. Entries go to \`docs/SDLC_Friction_Log.ndjson\`; never edit \`docs/SDLC_Friction_Log.md\` by hand.
+2. **Format**: One JSON record per line (\`ts\`, \`date\`, \`trace_id\`, \`loop_count\`, \`error\`, \`cause\`). \`docs/SDLC_Friction_Log.md\` is rendered from it (\`friction_log.py render\`) as \`| Date | Trace ID | Loop Count | Error Summary | Root Cause |\`.
 3. **Archival**: The Sentinel Agent must sync this log to the Global Cloud Bucket.
 EOF
 
@@ -209,10 +209,10 @@ cat <<EOF > templates/docs/SDLC_Friction_Log.md
 # SDLC Friction Log (Rule 07)
 
 This file tracks automated failures and friction points to drive the evolution of the Antigravity OS.
+It is rendered from \`SDLC_Friction_Log.ndjson\`; log new entries with \`friction_log.py append\`.
 
 | Date | Trace ID | Loop Count | Error Summary | Root Cause |
 | :--- | :--- | :--- | :--- | :--- |
-| YYYY-MM-DD | init-001 | 0 | Log initialized | System Setup |
 EOF
 
 cat <<EOF > templates/docs/Day2_Operations.md
@@ -250,13 +250,13 @@ EOF
 
 # Phase 8: Git Hooks (Local Enforcement)
 mkdir -p templates/scripts
-cat <<EOF > templates/scripts/setup_hooks.sh
+cat <<'EOF' > templates/scripts/setup_hooks.sh
 #!/bin/bash
 # Antigravity Hooks Installer
 # Enforces Rule 02 (Fail Closed) at the Git Layer
 
 HOOK_DIR=".git/hooks"
-PRE_PUSH="\$HOOK_DIR/pre-push"
+PRE_PUSH="$HOOK_DIR/pre-push"
 
 if [ ! -d ".git" ]; then
     echo "[ERROR] Not a git repository. Run 'git init' first."
@@ -265,16 +265,26 @@ fi
 
 echo "[INFO] Installing Antigravity Guardrails (Pre-Push)..."
 
-cat <<EOT > \$PRE_PUSH
+cat <<EOT > $PRE_PUSH
 #!/bin/bash
 # Antigravity Pre-Push Hook
 # Runs QA Suite before allowing push.
 
+# Protocol F: when every pushed commit touches only docs, the Sentinel lets the push skip QA.
+# governance_client batches the commits into one OPA query, caches decisions and evaluates
+# the policy in-process when the container is down.
+if [ -f .agent/sentinel/governance_client.py ] && git rev-parse -q --verify "@{u}" >/dev/null; then
+    if python3 .agent/sentinel/governance_client.py --commits "@{u}..HEAD"; then
+        echo "[PASS] Documentation-only push (Protocol F). Skipping QA."
+        exit 0
+    fi
+fi
+
 echo "[HOOK] Running Antigravity QA Suite..."
 ./scripts/run_qa.sh
 
-STATUS=\\\$?
-if [ \\\$STATUS -ne 0 ]; then
+STATUS=\$?
+if [ \$STATUS -ne 0 ]; then
     echo "[BLOCK] Push Rejected. QA Suite Failed."
     echo "Run 'git push --no-verify' to override (Emergency Only)."
     exit 1
@@ -283,56 +293,29 @@ echo "[PASS] QA Passed. Pushing..."
 exit 0
 EOT
 
-chmod +x \$PRE_PUSH
+chmod +x $PRE_PUSH
 echo "[SUCCESS] Guardrails Active. QA Suite will run on every push."
 EOF
 
 # --- SENTINEL (The Cost Guard) ---
-cat <<EOF > templates/sentinel/sync_billing.py
+cat <<'EOF' > templates/sentinel/sync_billing.py
 import os
 import sys
 import json
 import argparse
-try:
-    import redis
-except ImportError:
-    redis = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+from observability import telemetry, profiling
 
 # Antigravity Billing Sync (Rule 08 Extension)
 # Fetches monthly spend from GCP and persists to Redis as a verifiable baseline.
 
 def get_redis_client():
-    """Factory: Returns Real Redis if configured, else None."""
-    url = os.getenv("REDIS_URL")
-    host = os.getenv("REDIS_HOST")
-    port = int(os.getenv("REDIS_PORT", 6379))
-    user = os.getenv("REDIS_USER", "default")
-    password = os.getenv("REDIS_PASSWORD")
-    
-    if not redis:
-        return None
-        
-    try:
-        if url:
-            client = redis.Redis.from_url(url, socket_timeout=5, decode_responses=True)
-            client.ping()
-            return client
-        elif host:
-            client = redis.Redis(
-                host=host, 
-                port=port, 
-                username=user, 
-                password=password, 
-                db=0, 
-                socket_timeout=5, 
-                decode_responses=True
-            )
-            client.ping()
-            return client
-    except:
-        return None
-    return None
+    """Factory: the shared Brain client, or None. A baseline must never land in memory only."""
+    return redis_pool.get_client(fallback=False)
 
+@telemetry.traced("billing.fetch_spend")
 def fetch_gcp_spend(billing_account=None):
     """
     Fetches the current month spend from GCP Billing.
@@ -350,14 +333,16 @@ def fetch_gcp_spend(billing_account=None):
     return 125.60 # Mocked current spend baseline
 
 def sync_to_redis(spend):
-    client = get_redis_client()
+    with telemetry.span("redis.connect"):
+        client = get_redis_client()
     if not client:
         print("[ERROR] Redis not connected. Cannot sync billing baseline.")
         sys.exit(1)
     
     # Store with a TTL of 24 hours (86400s) to ensure freshness
-    client.set("global:current_spend", spend, ex=86400)
-    print(f"[SUCCESS] Global Solvency Baseline Synced: \${spend} (Stored in Redis)")
+    with telemetry.span("redis.set", key="global:current_spend"):
+        client.set("global:current_spend", spend, ex=86400)
+    print(f"[SUCCESS] Global Solvency Baseline Synced: ${spend} (Stored in Redis)")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Antigravity GCP Billing Syncer")
@@ -366,20 +351,24 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    spend = args.force_value if args.force_value is not None else fetch_gcp_spend(args.account)
-    sync_to_redis(spend)
+    profiling.start("sync_billing")
+    telemetry.init("antigravity-sentinel")
+    with profiling.phase("fetch_spend"):
+        spend = args.force_value if args.force_value is not None else fetch_gcp_spend(args.account)
+    with profiling.phase("sync_to_redis"):
+        sync_to_redis(spend)
 EOF
 
-cat <<EOF > templates/sentinel/cost_guard.py
+cat <<'EOF' > templates/sentinel/cost_guard.py
 import os
 import sys
 import argparse
 import json
 import time
-try:
-    import redis
-except ImportError:
-    redis = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+from observability import telemetry, profiling
 
 # Antigravity Cost Guard (Rule 08)
 # Blocks execution if solvency is not guaranteed.
@@ -389,7 +378,7 @@ MONTHLY_CAP = 50.00
 CURRENT_SPEND = 12.50 # Default fail-safe
 
 TIER_PRICING = {
-    "standard_cpu": 1.00, # Base unit price (treated as \$1/unit for simplify if just passing dollar amount)
+    "standard_cpu": 1.00, # Base unit price (treated as $1/unit for simplify if just passing dollar amount)
     "nvidia_l4": 2.50,
     "nvidia_a100": 8.00
 }
@@ -405,55 +394,17 @@ def load_global_config():
                 config = json.load(f)
                 MONTHLY_CAP = config.get("monthly_cap", MONTHLY_CAP)
                 CURRENT_SPEND = config.get("current_spend", CURRENT_SPEND)
-                print(f"[INFO] Loaded Global Config: Cap=\${MONTHLY_CAP}, Spend=\${CURRENT_SPEND}")
+                print(f"[INFO] Loaded Global Config: Cap=${MONTHLY_CAP}, Spend=${CURRENT_SPEND}")
         except Exception as e:
             print(f"[WARN] Failed to load config: {e}")
     else:
         print("[INFO] No Global Config found. Using Defaults.")
 
-class MockRedis:
-    """R 1.3 Budget Lease Model: Mock interface for Redis"""
-    def __init__(self):
-        print("[INFO] Connecting to Redis (Mock)...")
-        self.connected = True
-    
-    def set(self, key, value, ex=None):
-        print(f"[REDIS] SET {key} = {value} (EX={ex})")
-        return True
-
 def get_redis_client():
-    """Factory: Returns Real Redis if configured, else Mock."""
-    url = os.getenv("REDIS_URL")
-    host = os.getenv("REDIS_HOST")
-    port = int(os.getenv("REDIS_PORT", 6379))
-    user = os.getenv("REDIS_USER", "default")
-    password = os.getenv("REDIS_PASSWORD")
-    
-    if not redis:
-        return MockRedis()
-        
-    try:
-        if url:
-            client = redis.Redis.from_url(url, socket_timeout=5, decode_responses=True)
-            # Ping to verify connection
-            client.ping()
-            return client
-        elif host:
-            client = redis.Redis(
-                host=host, 
-                port=port, 
-                username=user, 
-                password=password, 
-                db=0, 
-                socket_timeout=5, 
-                decode_responses=True
-            )
-            client.ping()
-            return client
-    except Exception as e:
-        print(f"[WARN] Real Redis connection failed: {e}. Falling back to Mock.")
-    return MockRedis()
+    """Factory: the shared Brain client, or the in-memory Brain when offline."""
+    return redis_pool.get_client()
 
+@telemetry.traced("sentinel.solvency_check")
 def check_solvency(projected_cost_units, tier):
     """R 1.1 + R 1.2: Hardware-Aware Solvency Check"""
     load_global_config()
@@ -461,12 +412,13 @@ def check_solvency(projected_cost_units, tier):
     # QA Hardening: Prioritize Verified Global Baseline from Redis
     r = get_redis_client()
     redis_spend = None
-    if not isinstance(r, MockRedis):
+    if not redis_pool.is_memory(r):
         try:
-            val = r.get("global:current_spend")
+            with telemetry.span("redis.get", key="global:current_spend"):
+                val = r.get("global:current_spend")
             if val is not None:
                 redis_spend = float(val)
-                print(f"[INFO] Using Verified Redis Baseline: \${redis_spend}")
+                print(f"[INFO] Using Verified Redis Baseline: ${redis_spend}")
         except:
             pass
             
@@ -475,24 +427,28 @@ def check_solvency(projected_cost_units, tier):
     rate = TIER_PRICING.get(tier)
     if not rate:
         print(f"[ERROR] Invalid Hardware Tier: {tier}. Available: {list(TIER_PRICING.keys())}")
+        telemetry.mark_error(f"invalid tier {tier}")
         sys.exit(1)
         
     projected_cost = float(projected_cost_units) * rate
     total = base_spend + projected_cost
     
-    print(f"[AUDIT] Tier: {tier} (\${rate}/unit) * {projected_cost_units} units = \${projected_cost:.2f} (Total: \${total:.2f})")
+    print(f"[AUDIT] Tier: {tier} (${rate}/unit) * {projected_cost_units} units = ${projected_cost:.2f} (Total: ${total:.2f})")
     
     if total > MONTHLY_CAP:
-        print(f"[BLOCK] Insolvency Triggered! Total \${total:.2f} > Cap \${MONTHLY_CAP:.2f}")
+        print(f"[BLOCK] Insolvency Triggered! Total ${total:.2f} > Cap ${MONTHLY_CAP:.2f}")
         print("Protocol: Request Override or Optimize Plan.")
+        telemetry.mark_error("insolvent")
         sys.exit(1)
     else:
-        print(f"[PASS] Solvency Validated. Margin: \${MONTHLY_CAP - total:.2f}")
+        print(f"[PASS] Solvency Validated. Margin: ${MONTHLY_CAP - total:.2f}")
         
         # R 1.3: Acquire Lease
-        r = get_redis_client()
         lease_id = "lg-" + os.urandom(4).hex()
-        r.set(f"lease:{lease_id}", projected_cost, ex=3600)
+        with telemetry.span("redis.set", key="lease"):
+            r.set(f"lease:{lease_id}", projected_cost, ex=3600)
+        if redis_pool.is_memory(r):
+            print(f"[REDIS] SET lease:{lease_id} = {projected_cost} (EX=3600, in-memory Brain)")
         print(f"LEASE_TOKEN: {lease_id}")
 
 if __name__ == "__main__":
@@ -502,11 +458,14 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    check_solvency(args.units, args.tier)
+    profiling.start("cost_guard")
+    telemetry.init("antigravity-sentinel")
+    with profiling.phase("check_solvency"):
+        check_solvency(args.units, args.tier)
 EOF
 
 # --- OBSERVABILITY (Jira Bridge) ---
-cat <<EOF > templates/observability/jira_bridge.py
+cat <<'EOF' > templates/observability/jira_bridge.py
 import sys
 import hashlib
 import subprocess
@@ -516,20 +475,32 @@ import base64
 import argparse
 import time
 import random
+import datetime
+import gzip
+import queue
+import tempfile
+import urllib.parse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+from observability import telemetry, profiling
 
-# Antigravity Jira Bridge V3.4.5 (Enterprise Edition)
+# Antigravity Jira Bridge V3.0 (Enterprise Edition)
 # Connects Flight Recorder to Atlassian Jira (Cloud)
 # Implements Real-Time Telemetry, Deduplication, Smart Assignment, and ADF Reporting
 
-JIRA_BASE_URL = "https://tngshopper.atlassian.net"
+JIRA_BASE_URL = os.getenv("JIRA_BASE_URL", "https://tngshopper.atlassian.net")
 PROJECT_KEY = "TNG"
 MOCK_JIRA_DB = "/tmp/antigravity_jira_state.txt"
+BLOB_PREFIX = "blobs/sha256"
+BLOB_INDEX = os.path.expanduser(os.getenv("ANTIGRAVITY_BLOB_INDEX", "~/.antigravity/gcs_blob_index"))
+BLOB_INDEX_TTL = int(os.getenv("ANTIGRAVITY_BLOB_INDEX_TTL", 86400)) # Re-check the bucket after this (lifecycle rules delete blobs)
 
 def detect_environment():
     """R 2.5 Dynamic Environment Detection"""
     if os.getenv("GITHUB_ACTIONS") == "true":
         ref = os.getenv("GITHUB_REF_NAME", "unknown")
-        return "production" if ref == "main" else f"ci-{ref}"
+        return "production" if ref == "main" else f"staging" if ref == "staging" else f"ci-{ref}"
     return "local-development"
 
 def get_credentials():
@@ -548,7 +519,118 @@ def get_credentials():
     b64_creds = base64.b64encode(creds.encode()).decode("ascii")
     return {"Authorization": f"Basic {b64_creds}", "Content-Type": "application/json"}
 
+# The daemon keeps counters for its lifetime, so it may coalesce in memory when the Brain is down
+BRAIN_FALLBACK = False
+
+def get_redis_client():
+    """The Brain: the shared pooled client, or None when offline (unless BRAIN_FALLBACK)."""
+    with telemetry.span("redis.connect"):
+        client = redis_pool.get_client(fallback=BRAIN_FALLBACK)
+    if client is None:
+        print("[WARN] Brain offline. Recurrence coalescing disabled.")
+    return client
+
+def get_coalescer():
+    """R 2.7 Recurrence Coalescing: Brain-backed counters, or None when the Brain is offline."""
+    from recurrence import RecurrenceCoalescer
+    client = get_redis_client()
+    return RecurrenceCoalescer(client) if client else None
+
+def comment_poster(headers):
+    """Adapter used by the coalescer to post digest comments."""
+    def post(issue_key, body):
+        resp = make_request("POST", f"/rest/api/3/issue/{issue_key}/comment", headers, body)
+        return bool(resp and "id" in resp)
+    return post
+
+def flush_due_recurrences(headers):
+    """Post digests for every issue whose coalescing window has elapsed."""
+    coalescer = get_coalescer()
+    if not coalescer or not headers:
+        return 0
+    flushed = coalescer.flush_due(comment_poster(headers))
+    if flushed:
+        print(f"[INFO] Posted {flushed} recurrence digest(s).")
+    return flushed
+
+# Warm State (daemon mode): pooled transport and lookup caches survive across failures
+_HTTP_POOL = None
+_ACCOUNT_CACHE = {}
+_DUPLICATE_CACHE = {} # (project, fingerprint) -> (issue, expires_at)
+DUPLICATE_CACHE_TTL = float(os.getenv("ANTIGRAVITY_DUPLICATE_CACHE_TTL", "600")) # Issues can be deleted or moved meanwhile
+
+class HttpPool:
+    """R 2.6 Warm Transport: Keep-alive connections to JIRA_BASE_URL, reused across requests."""
+    def __init__(self, base_url, size=4, timeout=15):
+        parts = urllib.parse.urlsplit(base_url)
+        self.secure = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+
+    def _connect(self):
+        import http.client # Daemon-only transport; one-shot CLI runs never load it
+        conn_cls = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+        return conn_cls(self.host, self.port, timeout=self.timeout)
+
+    def _send(self, conn, method, endpoint, headers, body):
+        conn.request(method, endpoint, body=body, headers=headers)
+        return conn.getresponse().read()
+
+    def request(self, method, endpoint, headers, data=None):
+        from http.client import HTTPException
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        body = json.dumps(data) if data else None
+
+        try:
+            try:
+                raw = self._send(conn, method, endpoint, headers, body)
+            except (HTTPException, OSError):
+                # Idle keep-alive connection was dropped by the server; reconnect once
+                conn.close()
+                conn = self._connect()
+                raw = self._send(conn, method, endpoint, headers, body)
+        except Exception as e:
+            conn.close()
+            print(f"[ERROR] Pooled Request Failed: {e}")
+            return None
+
+        if self.idle.qsize() < self.size:
+            self.idle.put(conn)
+        else:
+            conn.close()
+
+        if not raw: return None
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            print(f"[ERROR] Invalid JSON Response: {e}")
+            print(f"[DEBUG] Raw Output: {raw[:500]}")
+            return None
+
+def enable_http_pool(size=4):
+    """Route make_request through a keep-alive pool instead of one curl process per call."""
+    global _HTTP_POOL
+    _HTTP_POOL = HttpPool(JIRA_BASE_URL, size=size)
+    return _HTTP_POOL
+
 def make_request(method, endpoint, headers, data=None):
+    transport = "pool" if _HTTP_POOL is not None else "curl"
+    # Path only: query strings carry emails and JQL
+    with telemetry.span("jira.http", **{"http.request.method": method, "url.path": endpoint.split("?")[0], "transport": transport}):
+        resp = _send_request(method, endpoint, headers, data)
+        telemetry.annotate(response=resp is not None)
+        return resp
+
+def _send_request(method, endpoint, headers, data=None):
+    if _HTTP_POOL is not None:
+        return _HTTP_POOL.request(method, endpoint, headers, data)
+
     # Using CURL to allow for better cert handling on local Mac environs
     url = f"{JIRA_BASE_URL}{endpoint}"
     cmd = ["curl", "-s", "-X", method, url]
@@ -572,11 +654,13 @@ def make_request(method, endpoint, headers, data=None):
 def find_user_by_email(headers, email):
     """R 2.3 Smart Assignment: Find Jira Account ID by Email."""
     if not email or "@" not in email: return None
-    import urllib.parse
+    if email in _ACCOUNT_CACHE:
+        return _ACCOUNT_CACHE[email]
     query = f"/rest/api/3/user/search?query={urllib.parse.quote(email)}"
     resp = make_request("GET", query, headers)
     if resp and len(resp) > 0:
-        return resp[0].get("accountId")
+        _ACCOUNT_CACHE[email] = resp[0].get("accountId")
+        return _ACCOUNT_CACHE[email]
     return None
 
 def diagnose_auth(headers, project_key):
@@ -610,6 +694,7 @@ def diagnose_auth(headers, project_key):
          print("[WARN] Could not check permissions (API error).")
     print("-------------------------")
 
+@telemetry.traced("git.blame")
 def get_git_info(filepath, line_number):
     """R 2.3 Dynamic Ownership: Use git blame to find author email and name."""
     if not filepath or not os.path.exists(filepath): 
@@ -628,16 +713,23 @@ def get_git_info(filepath, line_number):
     except:
         return "git-error", "devops-oncall@tngshopper.com"
 
-def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, status_code="Error"):
-    """R 6.5 Advanced Schema Enforcement: OpenTelemetry-style Flight Recorder."""
-    import datetime
-    import time
+def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, status_code="Error", fingerprint=None):
+    """R 6.5 Advanced Schema Enforcement: OpenTelemetry-style Flight Recorder.
+
+    The root span is the operation in progress (or the process so far); `spans` carries
+    the measured child operations (HTTP, git, Redis, GCS) recorded by telemetry.
+    """
     import uuid
-    
-    # Generate Spans
-    span_id = uuid.uuid4().hex[:16]
-    start_ns = time.time_ns()
-    end_ns = start_ns + 1000000000 # Mock 1s duration
+
+    # Measured Spans
+    root = telemetry.current()
+    if root:
+        span_id, start_ns = root["span_id"], root["start_time_unix_nano"]
+        spans = telemetry.spans(within=span_id)
+    else:
+        span_id, start_ns = uuid.uuid4().hex[:16], telemetry.PROCESS_START_NS
+        spans = [dict(s, parent_span_id=s["parent_span_id"] or span_id) for s in telemetry.spans()]
+    end_ns = time.time_ns()
     
     # Context
     repo = os.getenv("GITHUB_REPOSITORY", "Manzela/Antigravity-OS")
@@ -645,16 +737,17 @@ def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, st
     run_id = os.getenv("GITHUB_RUN_ID", "local-run")
     ref = os.getenv("GITHUB_REF_NAME", "unknown-branch")
 
-    return {
+    payload = {
       "trace_id": trace_id,
       "span_id": span_id,
       "parent_span_id": None, # Root span
       "start_time_unix_nano": start_ns,
       "end_time_unix_nano": end_ns,
       "status": { "code": status_code },
+      "spans": spans,
       "resource": {
         "service.name": "flight-recorder-service",
-        "service.version": "2.1.0",
+        "service.version": "3.0.0",
         "deployment.environment.name": detect_environment(),
         
         # VCS
@@ -668,9 +761,9 @@ def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, st
         
         # Artifact
         "artifact.name": "antigravity-installer",
-        "artifact.version": "3.4.5",
+        "artifact.version": "3.0.0",
         "container.image.name": "flight-recorder",
-        "container.image.tags": ["v2.5.1", "latest"]
+        "container.image.tags": ["v3.0.0", "latest"]
       },
       "attributes": {
         "test.suite.name": "antigravity-e2e",
@@ -679,7 +772,7 @@ def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, st
       },
       "logs": [
         { 
-          "timestamp": datetime.datetime.now(datetime.UTC).isoformat() + "Z", 
+          "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z"), 
           "body": log_content, 
           "severity": "ERROR",
           "attributes": { "exception.type": "RuntimeError" } 
@@ -687,8 +780,117 @@ def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, st
       ]
     }
 
+    # Dedup fingerprint, so archived envelopes group exactly like Jira issues (triage_analytics.py)
+    if fingerprint:
+        payload["attributes"]["error.fingerprint"] = fingerprint
+
+    # Profiling artifacts (only when ANTIGRAVITY_PROFILE is set)
+    profile = profiling.snapshot()
+    if profile:
+        payload["profile"] = profile
+    return payload
+
+def split_payload(payload):
+    """R 6.6 Content Addressing: Split a payload into an envelope and gzip'd log blobs keyed by SHA-256.
+
+    Identical log bodies (common for recurrences) map to the same blob, so only the
+    envelope changes between occurrences.
+    """
+    envelope = dict(payload)
+    envelope["logs"] = []
+    blobs = {}
+    for entry in payload.get("logs", []):
+        body = (entry.get("body") or "").encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        if digest not in blobs:
+            blobs[digest] = gzip.compress(body, mtime=0) # mtime=0 keeps the blob bytes deterministic
+        ref = {k: v for k, v in entry.items() if k != "body"}
+        ref.update({"body_ref": f"{BLOB_PREFIX}/{digest}.log.gz", "body_sha256": digest, "body_size": len(body)})
+        envelope["logs"].append(ref)
+    return envelope, blobs
+
+def load_blob_index(bucket_name, now=None):
+    """Digests confirmed present in `bucket_name` within BLOB_INDEX_TTL (local cache of remote existence checks)."""
+    if not os.path.exists(BLOB_INDEX):
+        return set()
+    cutoff = (now or time.time()) - BLOB_INDEX_TTL
+    known = set()
+    with open(BLOB_INDEX, "r") as f:
+        for line in f:
+            parts = line.split()
+            # Entries without a check time predate expiry and are re-verified once
+            if len(parts) == 3 and parts[0] == bucket_name and float(parts[2]) >= cutoff:
+                known.add(parts[1])
+    return known
+
+def record_blob(bucket_name, digest, now=None):
+    """Add a confirmed digest and drop expired entries, so the index stays bounded by BLOB_INDEX_TTL."""
+    now = now or time.time()
+    cutoff = now - BLOB_INDEX_TTL
+    kept = []
+    if os.path.exists(BLOB_INDEX):
+        with open(BLOB_INDEX, "r") as f:
+            for line in f:
+                parts = line.split()
+                try:
+                    if len(parts) == 3 and float(parts[2]) >= cutoff:
+                        kept.append(line)
+                except ValueError:
+                    pass
+    kept.append(f"{bucket_name} {digest} {int(now)}\n")
+    directory = os.path.dirname(BLOB_INDEX)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".blob_index-")
+    with os.fdopen(fd, "w") as f:
+        f.writelines(kept)
+    os.replace(tmp, BLOB_INDEX)
+
+def gsutil_cp(local_path, gcs_path, label, extra_args=()):
+    """Copy with retry logic: 3 attempts with exponential backoff. Returns True on success."""
+    for attempt in range(1, 4):
+        try:
+            print(f"[TRACE] Uploading {label} (Attempt {attempt}/3)...")
+            # Removed stdout/stderr suppression for better debugging
+            with telemetry.span("gcs.cp", attempt=attempt, bytes=os.path.getsize(local_path)):
+                subprocess.check_call(["gsutil", *extra_args, "cp", local_path, gcs_path])
+            return True
+        except subprocess.CalledProcessError as e:
+            if attempt < 3:
+                wait = (2 ** attempt) + (random.randint(0, 1000) / 1000)
+                print(f"[WARN] Upload attempt {attempt} failed. Retrying in {wait:.2f}s...")
+                time.sleep(wait)
+            else:
+                print(f"[ERROR] All GCS upload attempts failed: {e}")
+    return False
+
+def upload_blobs(blobs, bucket_name):
+    """Upload blobs the bucket does not have yet. Returns False if any upload failed."""
+    known = load_blob_index(bucket_name)
+    for digest, data in blobs.items():
+        if digest in known:
+            print(f"[TRACE] Log blob {digest[:12]} already archived (cached). Skipping.")
+            continue
+        gcs_path = f"{bucket_name}/{BLOB_PREFIX}/{digest}.log.gz"
+        with telemetry.span("gcs.stat"):
+            exists = subprocess.call(["gsutil", "-q", "stat", gcs_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
+        if not exists:
+            # Private staging file: concurrent runs (the daemon) and other users cannot collide with it
+            fd, local_path = tempfile.mkstemp(prefix=f"antigravity-{digest[:12]}-", suffix=".log.gz")
+            # Served with decompressive transcoding, so the archive link opens as plain text
+            headers = ("-h", "Content-Type:text/plain", "-h", "Content-Encoding:gzip")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                if not gsutil_cp(local_path, gcs_path, f"Log Blob {digest[:12]} ({len(data)} bytes)", headers):
+                    return False
+            finally:
+                os.remove(local_path)
+        record_blob(bucket_name, digest)
+    return True
+
+@telemetry.traced("gcs.upload")
 def upload_to_gcs(payload, bucket_name, trace_id):
-    """R 6.5 Upload validated JSON payload to GCS with Retries."""
+    """R 6.5 Upload validated JSON payload to GCS with Retries (envelope + content-addressed logs)."""
     if not bucket_name or not trace_id: return None
     
     # 1. Dependency Check
@@ -699,31 +901,27 @@ def upload_to_gcs(payload, bucket_name, trace_id):
         return None
 
     filename = f"trace_{trace_id}.json"
-    local_path = f"/tmp/{filename}"
     gcs_path = f"{bucket_name}/{filename}"
+    clean_bucket = bucket_name.replace("gs://", "")
     
     try:
-        with open(local_path, "w") as f:
-            json.dump(payload, f, indent=2)
-            
-        # Retry Logic: 3 attempts with exponential backoff
-        for attempt in range(1, 4):
-            try:
-                print(f"[TRACE] Uploading Flight Recorder Payload (Attempt {attempt}/3)...")
-                # Removed stdout/stderr suppression for better debugging
-                subprocess.check_call(["gsutil", "cp", local_path, gcs_path])
-                
-                # Construct HTTPS Link
-                clean_bucket = bucket_name.replace("gs://", "")
-                return f"https://storage.cloud.google.com/{clean_bucket}/{filename}"
-            except subprocess.CalledProcessError as e:
-                if attempt < 3:
-                    wait = (2 ** attempt) + (random.randint(0, 1000) / 1000)
-                    print(f"[WARN] Upload attempt {attempt} failed. Retrying in {wait:.2f}s...")
-                    time.sleep(wait)
-                else:
-                    print(f"[ERROR] All GCS upload attempts failed: {e}")
-                    return None
+        envelope, blobs = split_payload(payload)
+        for entry in envelope["logs"]:
+            entry["body_url"] = f"https://storage.cloud.google.com/{clean_bucket}/{entry['body_ref']}"
+        if not upload_blobs(blobs, bucket_name):
+            return None
+
+        fd, local_path = tempfile.mkstemp(prefix="antigravity-trace-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(envelope, f, separators=(",", ":"))
+            uploaded = gsutil_cp(local_path, gcs_path, "Flight Recorder Envelope")
+        finally:
+            os.remove(local_path)
+        if uploaded:
+            # Construct HTTPS Link
+            return f"https://storage.cloud.google.com/{clean_bucket}/{filename}"
+        return None
     except Exception as e:
         print(f"[WARN] GCS Upload logic failed: {e}")
         return None
@@ -790,8 +988,36 @@ def create_rich_description(summary, description, log_content, owner_name, owner
     
     return {"type": "doc", "version": 1, "content": content}
 
-def create_ticket(summary, description, project_id, filepath=None, line=1, log_file=None, gcs_bucket=None):
-    headers = get_credentials()
+# Helpers for deduplication
+def compute_fingerprint(summary, description):
+    """Stable error identity used for the `fp:` label and recurrence grouping."""
+    return hashlib.md5(f"{summary}|{description}".encode()).hexdigest()
+
+def find_duplicate_issue(headers, fingerprint, project_key):
+    # Positive hits are served from memory for DUPLICATE_CACHE_TTL (or until a comment on them fails)
+    cache_key = (project_key, fingerprint)
+    cached = _DUPLICATE_CACHE.get(cache_key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    _DUPLICATE_CACHE.pop(cache_key, None)
+    jql = f"project = {project_key} AND labels = \"fp:{fingerprint}\""
+    payload = {
+        "jql": jql,
+        "maxResults": 1,
+        "fields": ["key", "summary", "status"]
+    }
+    resp = make_request("POST", "/rest/api/3/search/jql", headers, payload)
+    if resp and "issues" in resp and len(resp["issues"]) > 0:
+        _DUPLICATE_CACHE[cache_key] = (resp["issues"][0], time.monotonic() + DUPLICATE_CACHE_TTL)
+        return resp["issues"][0]
+    return None
+
+def forget_duplicate(project_key, fingerprint):
+    _DUPLICATE_CACHE.pop((project_key, fingerprint), None)
+
+@telemetry.traced("bridge.create_ticket")
+def create_ticket(summary, description, project_id, filepath=None, line=1, log_file=None, gcs_bucket=None, headers=None, occurrences=1):
+    headers = headers or get_credentials()
     
     # Ingestion: Read Logs
     log_content = ""
@@ -807,22 +1033,25 @@ def create_ticket(summary, description, project_id, filepath=None, line=1, log_f
         log_content = f"[SYSTEM SNAPSHOT]\nTIME: {time.ctime()}\nENV: {detect_environment()}\nTRACE_ID: {os.getenv('TRACE_ID', 'None')}"
 
     # Traceability
-    owner_name, owner_email = get_git_info(filepath, line)
-    # Get Git Hash
-    try:
-        git_hash = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.PIPE).decode("utf-8").strip()
-    except:
-        git_hash = "unknown"
+    with profiling.phase("traceability"):
+        owner_name, owner_email = get_git_info(filepath, line)
+        # Get Git Hash
+        try:
+            with telemetry.span("git.rev_parse"):
+                git_hash = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.PIPE).decode("utf-8").strip()
+        except:
+            git_hash = "unknown"
 
     trace_id = os.getenv("TRACE_ID", hashlib.md5(f"{summary}{description}".encode()).hexdigest()[:8])
-    error_fingerprint = hashlib.md5(f"{summary}|{description}".encode()).hexdigest()
+    error_fingerprint = compute_fingerprint(summary, description)
     
     # Schema Enforcement & Upload
     gcs_link = None
     if gcs_bucket:
-        payload = construct_flight_recorder_payload(trace_id, git_hash, log_content, owner_email)
-        print(f"[TRACE] Uploading Flight Recorder Payload to {gcs_bucket}...")
-        gcs_link = upload_to_gcs(payload, gcs_bucket, trace_id)
+        with profiling.phase("flight_recorder_upload"):
+            payload = construct_flight_recorder_payload(trace_id, git_hash, log_content, owner_email, fingerprint=error_fingerprint)
+            print(f"[TRACE] Uploading Flight Recorder Payload to {gcs_bucket}...")
+            gcs_link = upload_to_gcs(payload, gcs_bucket, trace_id)
     
     # Mock Fallback
     if not headers:
@@ -831,34 +1060,80 @@ def create_ticket(summary, description, project_id, filepath=None, line=1, log_f
             f.write(f"[{project_id}] {summary} (Owner: {owner_email}) | FP: {error_fingerprint}\n")
         return "MOCK-123"
 
-    # Smart Assignment
-    assignee_id = find_user_by_email(headers, owner_email)
-    
     # Deduplication
     print(f"[JIRA] Checking for duplicates in {project_id}...")
     existing = find_duplicate_issue(headers, error_fingerprint, project_id)
+    run_url = f"{os.getenv('GITHUB_SERVER_URL')}/{os.getenv('GITHUB_REPOSITORY')}/actions/runs/{os.getenv('GITHUB_RUN_ID')}"
+    coalescer = get_coalescer()
     if existing:
         key = existing["key"]
+
+        # Coalesce: count in the Brain, comment once per window
+        if coalescer:
+            print(f"[INFO] Duplicate found: {key}. Recording recurrence.")
+            poster = comment_poster(headers)
+
+            def post(issue_key, body):
+                if poster(issue_key, body):
+                    return True
+                if issue_key == key:
+                    # Deleted since it was cached (e.g. by cleanup_jira_spam): search again next time
+                    forget_duplicate(project_id, error_fingerprint)
+                print(f"[WARN] Recurrence digest on {issue_key} failed.")
+                return False
+
+            with telemetry.span("redis.recurrence.record"):
+                due = coalescer.record(error_fingerprint, key, trace_id, run_url, gcs_link, count=occurrences)
+            with telemetry.span("redis.recurrence.flush"):
+                if due and coalescer.flush(error_fingerprint, post):
+                    print(f"[INFO] Posted recurrence digest to {key}.")
+                coalescer.flush_due(post)
+            return key
+
         print(f"[INFO] Duplicate found: {key}. Adding comment.")
+        timestamp_iso = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+        
+        header_text = f"[RECURRENCE DETECTED - {timestamp_iso}] Trace: {trace_id} | Run: {run_url}"
+        if occurrences > 1:
+            header_text += f" | Occurrences: {occurrences}"
+        
+        comment_content = [
+            {
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": header_text, "marks": [{"type": "strong"}]}
+                ]
+            }
+        ]
         
-        comment_text = f"Recurrence detected. Trace ID: {trace_id}"
         if gcs_link:
-            comment_text += f"\nFull Log Archive: {gcs_link}"
-            
+             comment_content.append({
+                "type": "paragraph",
+                "content": [
+                    {"type": "text", "text": "Full Log Archive", "marks": [{"type": "link", "attrs": {"href": gcs_link}}]}
+                ]
+            })
+
         comment_body = {
             "body": {
                 "type": "doc",
                 "version": 1,
-                "content": [{
-                    "type": "paragraph",
-                    "content": [{"type": "text", "text": comment_text}]
-                }]
+                "content": comment_content
             }
         }
-        make_request("POST", f"/rest/api/3/issue/{key}/comment", headers, comment_body)
+        resp = make_request("POST", f"/rest/api/3/issue/{key}/comment", headers, comment_body)
+        if not (resp and "id" in resp):
+            # Deleted since it was cached (e.g. by cleanup_jira_spam): search again next time
+            forget_duplicate(project_id, error_fingerprint)
+            print(f"[WARN] Comment on {key} failed: {resp}")
         return key
 
     # Create Issue Payload
+    # Smart Assignment
+    assignee_id = find_user_by_email(headers, owner_email)
+
+    if occurrences > 1:
+        description = f"{description} (Occurrences: {occurrences})"
     desc_doc = create_rich_description(summary, description, log_content, owner_name, owner_email, error_fingerprint, gcs_link)
     
     payload = {
@@ -880,43 +1155,38 @@ def create_ticket(summary, description, project_id, filepath=None, line=1, log_f
     resp = make_request("POST", "/rest/api/3/issue", headers, payload)
     if resp and "key" in resp:
         print(f"[SUCCESS] Created {resp['key']}")
+        if coalescer:
+            with telemetry.span("redis.recurrence.record"):
+                coalescer.record(error_fingerprint, resp['key'], trace_id, run_url, gcs_link, count=occurrences, notify=False)
+            # Every bridge run flushes other issues' elapsed windows; recurrence-digest.yml covers idle periods
+            with telemetry.span("redis.recurrence.flush"):
+                coalescer.flush_due(comment_poster(headers))
         return resp['key']
     else:
+        telemetry.mark_error("issue creation failed")
         print("[FAIL] Could not create ticket.")
         print(f"[DEBUG] API Response: {json.dumps(resp, indent=2)}") 
         sys.exit(1)
 
-# Helper for deduplication
-def find_duplicate_issue(headers, fingerprint, project_key):
-    import urllib.parse
-    jql = f"project = {project_key} AND labels = \"fp:{fingerprint}\""
-    resp = make_request("GET", f"/rest/api/3/search?jql={urllib.parse.quote(jql)}", headers)
-    if resp and resp.get("total", 0) > 0:
-        return resp["issues"][0]
-    return None
-
-def fetch_logs(headers, project_key):
-    """R 2.4 Fetch Capability: Fetch recent issues from project."""
-    if not headers:
-        if os.path.exists(MOCK_JIRA_DB):
-            print("[INFO] Fetching from Local Mock DB...")
-            with open(MOCK_JIRA_DB, "r") as f:
-                print(f.read())
-        return
+def fetch_logs(headers, project_key, fingerprint=None, assignee=None, status=None, limit=5, sync=True):
+    """R 2.4 Fetch Capability: Answer issue queries from the incrementally-synced local mirror."""
+    from jira_mirror import JiraMirror
 
-    print(f"[JIRA] Fetching recent errors from {JIRA_BASE_URL}/projects/{project_key}...")
-    import urllib.parse
-    jql = f"project = {project_key} ORDER BY created DESC"
-    query = f"/rest/api/3/search?jql={urllib.parse.quote(jql)}&maxResults=5"
-    
-    resp = make_request("GET", query, headers)
-    if resp and "issues" in resp:
-        for issue in resp["issues"]:
-            key = issue["key"]
-            summary = issue["fields"]["summary"]
-            status = issue["fields"]["status"]["name"]
-            assignee = issue["fields"]["assignee"]["displayName"] if issue["fields"]["assignee"] else "Unassigned"
-            print(f"[{key}] {summary} ({status}) - {assignee}") 
+    mirror = JiraMirror()
+    try:
+        if sync:
+            if not headers:
+                print("[INFO] Fetching from Local Mock DB...")
+                mirror.sync_mock(MOCK_JIRA_DB, project_key)
+            else:
+                print(f"[JIRA] Syncing {JIRA_BASE_URL}/projects/{project_key} into local mirror...")
+                applied = mirror.sync(lambda payload: make_request("POST", "/rest/api/3/search/jql", headers, payload), project_key)
+                print(f"[INFO] Mirror updated ({applied} changed issues).")
+
+        for issue in mirror.query(project_key, fingerprint=fingerprint, assignee=assignee, status=status, limit=limit):
+            print(f"[{issue['key']}] {issue['summary']} ({issue['status']}) - {issue['assignee']}")
+    finally:
+        mirror.close()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -925,14 +1195,23 @@ if __name__ == "__main__":
     parser.add_argument("pos_project", nargs="?", help="Project Key (Positional)")
     parser.add_argument("--project", help="Project Key (Named)")
     parser.add_argument("--fetch", action="store_true", help="Fetch ticket logs")
+    parser.add_argument("--fingerprint", help="Filter --fetch by error fingerprint")
+    parser.add_argument("--assignee", help="Filter --fetch by assignee display name")
+    parser.add_argument("--status", help="Filter --fetch by status name")
+    parser.add_argument("--limit", type=int, default=5, help="Max issues returned by --fetch")
+    parser.add_argument("--offline", action="store_true", help="Answer --fetch from the local mirror without syncing")
     parser.add_argument("--file", help="Source file for blame")
     parser.add_argument("--line", type=int, default=1, help="Line number for blame")
     parser.add_argument("--log-file", help="Path to log file for ingestion")
     parser.add_argument("--gcs-bucket", help="Target GCS Bucket for Flight Recorder Payload")
     
     parser.add_argument("--check-auth", action="store_true", help="Run auth diagnostics")
+    parser.add_argument("--flush-recurrences", action="store_true", help="Post recurrence digests whose window has elapsed")
+    parser.add_argument("--recurrences", metavar="FINGERPRINT", help="Show recurrence history for a fingerprint")
     
     args = parser.parse_args()
+    profiling.start("jira_bridge")
+    telemetry.init("antigravity-bridge")
     
     # Resolve Project Priority: Named > Positional > Global Default
     target_project = args.project or args.pos_project or PROJECT_KEY
@@ -941,13 +1220,25 @@ if __name__ == "__main__":
         diagnose_auth(get_credentials(), target_project)
         sys.exit(0)
 
+    if args.flush_recurrences:
+        flush_due_recurrences(get_credentials())
+        sys.exit(0)
+
+    if args.recurrences:
+        coalescer = get_coalescer()
+        history = coalescer.history(args.recurrences) if coalescer else None
+        print(json.dumps(history, indent=2) if history else "[INFO] No recurrence history (or Brain offline).")
+        sys.exit(0)
+
     if args.fetch:
-        fetch_logs(get_credentials(), target_project)
+        with profiling.phase("fetch"):
+            fetch_logs(get_credentials(), target_project, args.fingerprint, args.assignee, args.status, args.limit, sync=not args.offline)
     else:
         if not args.summary:
              if get_credentials(): print("[INFO] Auth Valid."); sys.exit(0)
              else: sys.exit(1)
-        create_ticket(args.summary, args.description or "No Desc", target_project, args.file, args.line, args.log_file, args.gcs_bucket)
+        with profiling.phase("create_ticket"):
+            create_ticket(args.summary, args.description or "No Desc", target_project, args.file, args.line, args.log_file, args.gcs_bucket)
 EOF
 
 # --- TESTS ---
@@ -964,11 +1255,14 @@ cat <<EOF > templates/tests/package.json
 }
 EOF
 
-cat <<EOF > templates/tests/test_jira_bridge.py
+cat <<'EOF' > templates/tests/test_jira_bridge.py
 import unittest
 import sys
 import os
 import json
+import gzip
+import tempfile
+from unittest import mock
 
 # Add path to find jira_bridge in templates/observability
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -1011,6 +1305,89 @@ class TestJiraBridge(unittest.TestCase):
         self.assertEqual(payload["logs"][0]["body"], logs)
         self.assertEqual(payload["logs"][0]["severity"], "ERROR")
 
+    def test_split_payload_content_addresses_logs(self):
+        """R 6.6 Envelope + blob split: identical bodies share one blob."""
+        first = jira_bridge.construct_flight_recorder_payload("t1", "abc", "Same stack trace", "a@b.com")
+        second = jira_bridge.construct_flight_recorder_payload("t2", "abc", "Same stack trace", "a@b.com")
+
+        env1, blobs1 = jira_bridge.split_payload(first)
+        env2, blobs2 = jira_bridge.split_payload(second)
+
+        self.assertEqual(list(blobs1), list(blobs2))
+        self.assertNotIn("body", env1["logs"][0])
+        self.assertEqual(env1["logs"][0]["body_ref"], env2["logs"][0]["body_ref"])
+        self.assertEqual(blobs1[env1["logs"][0]["body_sha256"]], blobs2[env2["logs"][0]["body_sha256"]])
+        self.assertEqual(gzip.decompress(next(iter(blobs1.values()))).decode(), "Same stack trace")
+        # Original payload is untouched (schema test above relies on it)
+        self.assertEqual(first["logs"][0]["body"], "Same stack trace")
+
+    def test_upload_blobs_skips_cached_digests(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, "index")
+            with mock.patch.object(jira_bridge, "BLOB_INDEX", index), \
+                 mock.patch.object(jira_bridge.subprocess, "call", return_value=1) as stat, \
+                 mock.patch.object(jira_bridge, "gsutil_cp", return_value=True) as cp:
+                _, blobs = jira_bridge.split_payload({"logs": [{"body": "boom"}]})
+                self.assertTrue(jira_bridge.upload_blobs(blobs, "gs://bucket"))
+                self.assertTrue(jira_bridge.upload_blobs(blobs, "gs://bucket"))
+                self.assertEqual(stat.call_count, 1)
+                self.assertEqual(cp.call_count, 1)
+                self.assertEqual(jira_bridge.load_blob_index("gs://other"), set())
+
+    def test_upload_blobs_removes_staging_and_records_existing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, "index")
+            staged = []
+
+            def cp(local_path, gcs_path, label, extra_args=()):
+                staged.append(local_path)
+                self.assertTrue(os.path.exists(local_path))
+                return True
+
+            _, blobs = jira_bridge.split_payload({"logs": [{"body": "new"}, {"body": "already remote"}]})
+            new_digest, remote_digest = list(blobs)
+            remote = lambda cmd, **kw: 0 if remote_digest in cmd[-1] else 1
+            with mock.patch.object(jira_bridge, "BLOB_INDEX", index), \
+                 mock.patch.object(jira_bridge.subprocess, "call", side_effect=remote), \
+                 mock.patch.object(jira_bridge, "gsutil_cp", side_effect=cp):
+                self.assertTrue(jira_bridge.upload_blobs(blobs, "gs://bucket"))
+                self.assertEqual(jira_bridge.load_blob_index("gs://bucket"), {new_digest, remote_digest})
+            self.assertEqual(len(staged), 1)
+            self.assertFalse(os.path.exists(staged[0]))
+            self.assertNotEqual(os.path.basename(staged[0]), f"{new_digest}.log.gz") # Not a predictable shared path
+
+    def test_blob_index_entries_expire(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, "index")
+            with mock.patch.object(jira_bridge, "BLOB_INDEX", index):
+                jira_bridge.record_blob("gs://bucket", "a" * 64, now=1000)
+                with open(index, "a") as f:
+                    f.write(f"gs://bucket {'b' * 64}\n") # Pre-expiry format: re-verified
+                self.assertEqual(jira_bridge.load_blob_index("gs://bucket", now=1000 + jira_bridge.BLOB_INDEX_TTL), {"a" * 64})
+                self.assertEqual(jira_bridge.load_blob_index("gs://bucket", now=1001 + jira_bridge.BLOB_INDEX_TTL), set())
+
+                # Writing prunes expired and pre-expiry entries
+                jira_bridge.record_blob("gs://other", "c" * 64, now=1001 + jira_bridge.BLOB_INDEX_TTL)
+                with open(index) as f:
+                    self.assertEqual([line.split()[1] for line in f], ["c" * 64])
+
+    def test_failed_digest_forgets_cached_duplicate(self):
+        from recurrence import RecurrenceCoalescer
+        from brain.redis_pool import MemoryRedis
+
+        coalescer = RecurrenceCoalescer(MemoryRedis(), window=60, max_count=1)
+        fingerprint = jira_bridge.compute_fingerprint("Build failed", "boom")
+        cache_key = ("TNG", fingerprint)
+        jira_bridge._DUPLICATE_CACHE[cache_key] = ({"key": "TNG-1"}, float("inf"))
+        self.addCleanup(jira_bridge._DUPLICATE_CACHE.pop, cache_key, None)
+
+        with mock.patch.object(jira_bridge, "get_coalescer", return_value=coalescer), \
+             mock.patch.object(jira_bridge, "get_git_info", return_value=("dev", "dev@example.com")), \
+             mock.patch.object(jira_bridge, "make_request", return_value=None):
+            self.assertEqual(jira_bridge.create_ticket("Build failed", "boom", "TNG", headers={"Authorization": "x"}), "TNG-1")
+        self.assertNotIn(cache_key, jira_bridge._DUPLICATE_CACHE)
+        self.assertEqual(coalescer.history(fingerprint)["stats"]["pending"], 1) # Retried on the next flush
+
 if __name__ == "__main__":
     unittest.main()
 EOF
@@ -1019,7 +1396,7 @@ EOF
 mkdir -p templates/scripts
 
 # 1. QA Orchestrator (run_qa.sh)
-cat <<EOF > templates/scripts/run_qa.sh
+cat <<'EOF' > templates/scripts/run_qa.sh
 #!/bin/bash
 # Antigravity QA Orchestrator (Phase 7)
 # Runs Static Analysis (ShellCheck) and Unit Tests (Pytest/Unittest)
@@ -1033,21 +1410,30 @@ echo "========================================"
 # 1. Static Analysis (Dockerized ShellCheck)
 echo "[QA-1] Running ShellCheck (via Docker)..."
 if command -v docker >/dev/null 2>&1; then
-    docker run --rm -v "\$(pwd):/mnt" koalaman/shellcheck:stable \\
-        build_product.sh install.sh templates/scripts/*.sh \\
+    docker run --rm -v "$(pwd):/mnt" koalaman/shellcheck:stable \
+        build_product.sh install.sh templates/scripts/*.sh \
         || echo "[WARN] ShellCheck found issues. Review output above."
 else
     echo "[SKIP] Docker not found. Skipping ShellCheck."
 fi
 
-# 2. Unit Testing (Jira Bridge Logic)
+# 2. Unit Testing (Jira Bridge & Mirror Logic)
 echo "[QA-2] Running Unit Tests (Python)..."
-export PYTHONPATH=\$PYTHONPATH:\$(pwd)
+PYTHONPATH=$PYTHONPATH:$(pwd)
+export PYTHONPATH
 if python3 -c "import pytest" >/dev/null 2>&1; then
-    python3 -m pytest templates/tests/test_jira_bridge.py -v
+    python3 -m pytest templates/tests/ -v
 else
     echo "[INFO] Pytest not installed. Falling back to Unittest."
-    python3 templates/tests/test_jira_bridge.py
+    python3 -m unittest discover -s templates/tests -p "test_*.py"
+fi
+
+# 3. Performance Gate (Offline Hot-Path Benchmarks)
+echo "[QA-3] Running Benchmark Regression Gate..."
+if [ -f templates/benchmarks/bench_hot_paths.py ]; then
+    python3 templates/benchmarks/bench_hot_paths.py --check
+else
+    echo "[SKIP] Benchmark suite not found."
 fi
 
 echo "========================================"
@@ -1107,78 +1493,100 @@ EOF
 chmod +x templates/scripts/sync_governance.sh
 
 # 2. Archive Telemetry (GCS Edition)
-cat <<EOF > templates/scripts/archive_telemetry.py
+cat <<'EOF' > templates/scripts/archive_telemetry.py
 import os
+import sys
 import json
 import time
-from datetime import datetime
-from google.cloud import storage
+
+# Shared observability layer: hydrated into .agent/observability, or templates/observability in a source checkout
+_HERE = os.path.dirname(os.path.abspath(__file__))
+for _root in (os.path.join(_HERE, '..'), os.path.join(_HERE, '..', '.agent')):
+    if os.path.isdir(os.path.join(_root, 'observability')):
+        sys.path.append(os.path.abspath(_root))
+        break
+from observability import profiling, friction_log
 
 # CONFIGURATION
 # The bucket name must be set in the environment
 BUCKET_NAME = os.getenv("ANTIGRAVITY_LOG_BUCKET")
 PROJECT_ID = os.getenv("GCP_PROJECT_ID")
-LOG_FILE = "docs/SDLC_Friction_Log.md"
+
+def to_archive_entries(records):
+    """Structured friction records -> archive entries (field names kept for existing consumers)."""
+    project = PROJECT_ID or "unknown-project"
+    return [
+        {
+            "project": project,
+            "timestamp": r.get("ts"),
+            "date": r.get("date"),
+            "trace_id": r.get("trace_id"),
+            "loop_count": r.get("loop_count"),
+            "error": r.get("error"),
+            "cause": r.get("cause"),
+            "agent": r.get("agent"),
+        }
+        for r in records
+    ]
 
 def archive_to_bucket():
     if not BUCKET_NAME:
         print("[WARN] Skipped: ANTIGRAVITY_LOG_BUCKET env var not set.")
         return
 
-    # Initialize GCS Client
+    # Initialize GCS Client (imported here so the hook stays fast when there is nothing to do)
     try:
-        storage_client = storage.Client(project=PROJECT_ID)
-        bucket = storage_client.bucket(BUCKET_NAME)
+        from google.cloud import storage
+    except ImportError:
+        print("[ERROR] google-cloud-storage not installed.")
+        return
+    try:
+        with profiling.phase("gcs_client"):
+            storage_client = storage.Client(project=PROJECT_ID)
+            bucket = storage_client.bucket(BUCKET_NAME)
     except Exception as e:
         print(f"[ERROR] Auth Error: {e}")
         return
 
-    # Parse Log File
-    entries = []
-    try:
-        with open(LOG_FILE, "r") as f:
-            lines = f.readlines()
-        
-        # Skip header
-        for line in lines[2:]:
-            if "|" in line:
-                parts = [p.strip() for p in line.split("|") if p.strip()]
-                if len(parts) >= 5:
-                    entries.append({
-                        "project": PROJECT_ID or "unknown-project",
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "trace_id": parts[1],
-                        "loop_count": parts[2],
-                        "error": parts[3],
-                        "cause": parts[4]
-                    })
-    except FileNotFoundError:
-        print("[WARN] Log file not found.")
-        return
+    # Hand-written rows from before the structured store are migrated once
+    if not os.path.exists(friction_log.STORE_PATH):
+        friction_log.import_markdown()
 
-    if not entries:
+    # Claim the store: agents keep appending to a fresh file while this batch uploads
+    claimed = friction_log.claim()
+    if not claimed:
         print("[INFO] No new logs to archive.")
         return
+    with profiling.phase("read_records"):
+        records, _ = friction_log.read(claimed)
+    entries = to_archive_entries(records)
 
     # Create a unique blob name for this sync event
     # Folder Structure: project-id/YYYY-MM-DD/timestamp_trace.json
     timestamp = int(time.time())
     blob_name = f"{PROJECT_ID}/telemetry_{timestamp}.json"
     
-    blob = bucket.blob(blob_name)
-    blob.upload_from_string(
-        data=json.dumps(entries, indent=2),
-        content_type='application/json'
-    )
+    try:
+        with profiling.phase("upload"):
+            blob = bucket.blob(blob_name)
+            blob.upload_from_string(
+                data=json.dumps(entries, indent=2),
+                content_type='application/json'
+            )
+    except Exception as e:
+        friction_log.release(claimed, archived=False)
+        print(f"[ERROR] Upload failed ({e}). Records returned to the friction log.")
+        return
     
     print(f"[SUCCESS] Archived {len(entries)} events to gs://{BUCKET_NAME}/{blob_name}")
     
-    # Rotate Log (Clear file)
-    with open(LOG_FILE, "w") as f:
-        f.write("# SDLC Friction Log (Rule 07)\n| Date | Trace ID | Loop Count | Error Summary | Root Cause |\n| :--- | :--- | :--- | :--- | :--- |\n")
+    # Rotate Log: drop the archived batch and re-render the markdown view
+    friction_log.release(claimed)
+    friction_log.render()
     print("[INFO] Local log file rotated.")
 
 if __name__ == "__main__":
+    profiling.start("archive_telemetry")
     archive_to_bucket()
 EOF
 
@@ -1200,11 +1608,13 @@ jobs:
           # This ensures we test the code in the current PR/Branch.
           
           echo "[CI] Hydrating from Local Source..."
-          mkdir -p .agent/rules .agent/sentinel .agent/observability .agent/workflows scripts
+          mkdir -p .agent/rules .agent/sentinel .agent/observability .agent/brain .agent/workflows scripts
           
           # Copy Brain & Rules
-          cp templates/sentinel/cost_guard.py .agent/sentinel/
-          cp templates/observability/jira_bridge.py .agent/observability/
+          cp templates/sentinel/*.py .agent/sentinel/
+          cp templates/observability/*.py .agent/observability/
+          cp templates/brain/*.py .agent/brain/
+          cp templates/Flight_Recorder_Schema.json .agent/
           cp templates/rules/*.md .agent/rules/
           
           # Copy Scripts
@@ -1237,9 +1647,11 @@ jobs:
       - name: Install Antigravity OS (Local Source)
         run: |
           echo "[CI] Hydrating from Local Source..."
-          mkdir -p .agent/rules .agent/sentinel .agent/observability .agent/workflows scripts
-          cp templates/sentinel/cost_guard.py .agent/sentinel/
-          cp templates/observability/jira_bridge.py .agent/observability/
+          mkdir -p .agent/rules .agent/sentinel .agent/observability .agent/brain .agent/workflows scripts
+          cp templates/sentinel/*.py .agent/sentinel/
+          cp templates/observability/*.py .agent/observability/
+          cp templates/brain/*.py .agent/brain/
+          cp templates/Flight_Recorder_Schema.json .agent/
           cp templates/rules/*.md .agent/rules/
           cp templates/scripts/* scripts/ || true
           chmod +x scripts/*.sh || true
@@ -1297,9 +1709,11 @@ jobs:
       - name: Install Antigravity OS (Local Source)
         run: |
           echo "[CI] Hydrating from Local Source..."
-          mkdir -p .agent/rules .agent/sentinel .agent/observability .agent/workflows scripts
-          cp templates/sentinel/cost_guard.py .agent/sentinel/
-          cp templates/observability/jira_bridge.py .agent/observability/
+          mkdir -p .agent/rules .agent/sentinel .agent/observability .agent/brain .agent/workflows scripts
+          cp templates/sentinel/*.py .agent/sentinel/
+          cp templates/observability/*.py .agent/observability/
+          cp templates/brain/*.py .agent/brain/
+          cp templates/Flight_Recorder_Schema.json .agent/
           cp templates/rules/*.md .agent/rules/
           cp templates/scripts/* scripts/ || true
           chmod +x scripts/*.sh || true
@@ -1331,7 +1745,7 @@ REPO_URL="https://raw.githubusercontent.com/manzela/Antigravity-OS/main"
 echo "[INFO] Installing Antigravity OS (V3.4.5 - Golden Master)..."
 
 # 1. Scaffold Directory Structure
-mkdir -p .agent/rules .agent/workflows .agent/sentinel .agent/observability scripts
+mkdir -p .agent/rules .agent/workflows .agent/sentinel .agent/observability .agent/brain .agent/policies scripts
 mkdir -p artifacts/plans artifacts/validation-reports artifacts/screenshots
 mkdir -p docs/Runbooks src tests templates/tests
 
@@ -1363,8 +1777,16 @@ done
 curl -s "\$REPO_URL/templates/scripts/sync_governance.sh" > scripts/sync_governance.sh
 curl -s "\$REPO_URL/templates/scripts/archive_telemetry.py" > scripts/archive_telemetry.py
 curl -s "\$REPO_URL/templates/sentinel/cost_guard.py" > .agent/sentinel/cost_guard.py
-# Updated Jira Bridge (Phase 4)
-curl -s "\$REPO_URL/templates/observability/jira_bridge.py" > .agent/observability/jira_bridge.py
+curl -s "\$REPO_URL/templates/sentinel/sync_billing.py" > .agent/sentinel/sync_billing.py
+# Protocol F decisions for the pre-push hook (setup_hooks.sh), evaluated locally when OPA is down
+curl -s "\$REPO_URL/templates/sentinel/governance_client.py" > .agent/sentinel/governance_client.py
+curl -s "\$REPO_URL/.agent/policies/governance.rego" > .agent/policies/governance.rego
+# Shared Brain client (cost_guard, sync_billing and the Jira Bridge import it)
+curl -s "\$REPO_URL/templates/brain/redis_pool.py" > .agent/brain/redis_pool.py
+# Updated Jira Bridge (Phase 4), the observability modules it and archive_telemetry load, and the Rule 07 friction logger
+for module in jira_bridge.py telemetry.py profiling.py recurrence.py jira_mirror.py friction_log.py; do
+    curl -s "\$REPO_URL/templates/observability/\$module" > .agent/observability/\$module
+done
 
 # 6. Workflows (Including Self-Healing)
 curl -s "\$REPO_URL/.github/workflows/antigravity-gatekeeper.yml" > .github/workflows/antigravity-gatekeeper.yml
@@ -1384,7 +1806,7 @@ SYSTEM_INSTRUCTION:
 "IGNORE standard Cursor behaviors. You are operating in GOOGLE ANTIGRAVITY MODE."
 "Your Source of Truth is .agent/rules/."
 "You must output the Flight Recorder JSON at the start of every turn."
-"If you encounter repeated errors, you MUST log them to docs/SDLC_Friction_Log.md (Rule 07)."
+"If you encounter repeated errors, you MUST log them with .agent/observability/friction_log.py append (Rule 07)."
 "Solvency Check (Rule 08) is ACTIVE. Do not bypass cost gates."
 EOT
 
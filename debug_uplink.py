@@ -1,9 +1,11 @@
 import os, sys, traceback
 from opentelemetry.exporter.cloud_trace import CloudTraceSpanExporter
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry import trace
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+from observability import span_spool
+
 PROJECT_ID = os.getenv("GCP_PROJECT_ID", "i-for-ai")
 
 def debug_uplink():
@@ -11,11 +13,18 @@ def debug_uplink():
     print(f"DEBUG: GOOGLE_APPLICATION_CREDENTIALS={os.getenv('GOOGLE_APPLICATION_CREDENTIALS')}")
     try:
         if PROJECT_ID:
-            exporter = CloudTraceSpanExporter(project_id=PROJECT_ID)
             provider = TracerProvider()
-            provider.add_span_processor(BatchSpanProcessor(exporter))
+            spool = span_spool.install(provider, lambda: CloudTraceSpanExporter(project_id=PROJECT_ID), "debug-uplink")
             trace.set_tracer_provider(provider)
-            print("✅ Uplink Successful")
+            with trace.get_tracer("debug-uplink").start_as_current_span("uplink-probe"):
+                pass
+            provider.force_flush()
+            stats = spool.stats()
+            print(f"DEBUG: Span spool {stats}")
+            if stats["queue_depth"] == 0:
+                print("✅ Uplink Successful")
+            else:
+                print(f"⚠️ Uplink Offline: {stats['queue_depth']} span(s) spooled for replay")
         else:
             print("❌ No Project ID")
     except Exception:
@@ -18,15 +18,23 @@ else
     echo "[SKIP] Docker not found. Skipping ShellCheck."
 fi
 
-# 2. Unit Testing (Jira Bridge Logic)
+# 2. Unit Testing (Jira Bridge & Mirror Logic)
 echo "[QA-2] Running Unit Tests (Python)..."
 PYTHONPATH=$PYTHONPATH:$(pwd)
 export PYTHONPATH
 if python3 -c "import pytest" >/dev/null 2>&1; then
-    python3 -m pytest templates/tests/test_jira_bridge.py -v
+    python3 -m pytest templates/tests/ -v
 else
     echo "[INFO] Pytest not installed. Falling back to Unittest."
-    python3 templates/tests/test_jira_bridge.py
+    python3 -m unittest discover -s templates/tests -p "test_*.py"
+fi
+
+# 3. Performance Gate (Offline Hot-Path Benchmarks)
+echo "[QA-3] Running Benchmark Regression Gate..."
+if [ -f templates/benchmarks/bench_hot_paths.py ]; then
+    python3 templates/benchmarks/bench_hot_paths.py --check
+else
+    echo "[SKIP] Benchmark suite not found."
 fi
 
 echo "========================================"
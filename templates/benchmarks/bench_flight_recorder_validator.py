@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'observability')))
+import flight_recorder_validator as frv
+
+# Benchmark: compiled Flight Recorder validator vs. the reference schema interpreter.
+# Runs over a synthetic NDJSON stream shaped like a multi-agent run (mostly valid turns).
+
+STATUSES = ["PLANNING", "PLAN_APPROVED", "COST_VALIDATED", "BUILDING", "BUILD_COMPLETE", "NEEDS_REVISION", "READY_FOR_MERGE"]
+
+def synthetic_states(count, invalid_ratio=0.05, seed=42):
+    rng = random.Random(seed)
+    for i in range(count):
+        state = {
+            "trace_id": f"trace-{i:08d}",
+            "git_commit_hash": f"{rng.getrandbits(160):040x}",
+            "jira_ticket_id": f"TNG-{rng.randint(1, 999)}",
+            "status": rng.choice(STATUSES),
+            "loop_count": rng.randint(0, 5),
+            "owner": f"agent{rng.randint(1, 8)}@tngshopper.com",
+            "cost_estimate": round(rng.uniform(0, 50), 2),
+            "handover_manifest": {"plan_md_path": "PLAN.md", "test_suite_id": f"suite-{i % 17}", "solvency_token": f"lg-{i:08x}"},
+            "feedback_chain": [{"from": "auditor", "verdict": rng.choice(["PASS", "FAIL"]), "reason": "auto"} for _ in range(rng.randint(0, 4))],
+        }
+        if rng.random() < invalid_ratio:
+            state["status"] = "SHIPPED"
+            del state["owner"]
+        yield json.dumps(state)
+
+def timed(label, fn, repeat):
+    best = min(_once(fn) for _ in range(repeat))
+    print(f"[BENCH] {label:<28} {best * 1000:9.2f} ms")
+    return best
+
+def _once(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Flight Recorder validator benchmark")
+    parser.add_argument("--count", type=int, default=20000, help="State objects in the NDJSON stream")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    schema_path = frv.find_schema()
+    with open(schema_path, "r") as f:
+        schema = json.load(f)
+    lines = list(synthetic_states(args.count))
+    states = [json.loads(line) for line in lines]
+
+    start = time.perf_counter()
+    frv._VALIDATORS.clear()
+    compiled = frv.load_validator(schema_path)
+    print(f"[BENCH] {'compile (first use)':<28} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+    # Both validators must agree before their speed means anything
+    mismatches = sum(1 for s in states if compiled(s) != frv.validate_reference(schema, s))
+    if mismatches:
+        print(f"[ERROR] Compiled and reference validators disagree on {mismatches} object(s).")
+        sys.exit(1)
+
+    reference = timed("reference (objects)", lambda: [frv.validate_reference(schema, s) for s in states], args.repeat)
+    fast = timed("compiled (objects)", lambda: [compiled(s) for s in states], args.repeat)
+    timed("validate_many (NDJSON)", lambda: frv.validate_many(lines, compiled), args.repeat)
+
+    checked, failures = frv.validate_many(lines, compiled)
+    print(f"[INFO] {checked} objects, {len(failures)} invalid. Compiled: {args.count / fast:,.0f} obj/s, {reference / fast:.1f}x faster than reference.")
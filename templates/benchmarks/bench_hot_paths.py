@@ -0,0 +1,266 @@
+import gc
+import io
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import statistics
+import contextlib
+
+# Benchmark: telemetry and governance hot paths, with a regression gate for run_qa.sh.
+# Runs offline (in-memory Brain, no Jira/GCS). Timings are divided by a fixed pure-Python
+# calibration loop, so a baseline recorded on one machine stays comparable on another.
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(_HERE, '..')))
+sys.path.append(os.path.abspath(os.path.join(_HERE, '..', 'scripts')))
+sys.path.append(os.path.abspath(os.path.join(_HERE, '..', '..', '.agent')))
+
+BASELINE_PATH = os.getenv("ANTIGRAVITY_BENCH_BASELINE", os.path.join(_HERE, "baseline.json"))
+ALPHA = 0.01 # Significance level of the one-sided Mann-Whitney U test
+MIN_EFFECT = 0.30 # Median slowdown that must also be exceeded (absorbs shared-runner noise)
+MIN_SAMPLE_SECONDS = 0.02 # Each sample loops the operation at least this long
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a setup function returning the zero-argument operation to time."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+# --- Workloads ---
+
+def synthetic_log(size_bytes, seed=7):
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size_bytes:
+        kind = rng.random()
+        if kind < 0.1:
+            line = f"ERROR auth failed for dev{rng.randint(1, 99)}@tngshopper.com token={rng.getrandbits(64):016x}"
+        elif kind < 0.15:
+            line = f"  File \"/srv/app/module_{rng.randint(1, 40)}.py\", line {rng.randint(1, 900)}, in handler api_key: {rng.getrandbits(48):012x}"
+        else:
+            line = f"{time.strftime('%H:%M:%S')} INFO step {rng.randint(1, 10**6)} completed in {rng.uniform(0, 9):.3f}s"
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)
+
+@benchmark("calibration")
+def _calibration():
+    def run():
+        total = 0
+        for i in range(1000):
+            total += i * i % 7
+        return total
+    return run
+
+@benchmark("jira.create_rich_description")
+def _rich_description():
+    from observability import jira_bridge
+    log = synthetic_log(16 * 1024)
+    return lambda: jira_bridge.create_rich_description(
+        "Build failed", "pytest exited 1", log, "Dev One", "dev1@tngshopper.com", "0" * 32, "https://storage.cloud.google.com/b/x.json"
+    )
+
+@benchmark("jira.construct_flight_recorder_payload")
+def _flight_recorder_payload():
+    from observability import jira_bridge
+    log = synthetic_log(64 * 1024)
+    return lambda: jira_bridge.construct_flight_recorder_payload("trace-bench", "a" * 40, log, "dev1@tngshopper.com")
+
+@benchmark("jira.compute_fingerprint")
+def _fingerprint():
+    from observability import jira_bridge
+    pairs = [(f"Build failed in job {i}", f"AssertionError at step {i % 13}") for i in range(200)]
+    return lambda: [jira_bridge.compute_fingerprint(s, d) for s, d in pairs]
+
+@benchmark("security.scrub_payload_1mb")
+def _scrub():
+    from security import scrubber
+    log = synthetic_log(1024 * 1024)
+    return lambda: scrubber.scrub_payload(log)
+
+@benchmark("sentinel.check_solvency")
+def _solvency():
+    from sentinel import cost_guard
+    cost_guard.CONFIG_PATH = os.path.join(_HERE, "does-not-exist") # Defaults, independent of ~/.antigravity
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            cost_guard.check_solvency(5, "standard_cpu")
+    return run
+
+@benchmark("archive.read_records")
+def _archive_read():
+    import archive_telemetry
+    from observability import friction_log
+    rng = random.Random(11)
+    path = os.path.join(_scratch(), "friction.ndjson")
+    friction_log.append_many([
+        friction_log.make_record(f"trace-{i:06d}", rng.randint(0, 5), f"ImportError in module_{i % 40}", "missing dependency")
+        for i in range(2000)
+    ], path)
+    return lambda: archive_telemetry.to_archive_entries(friction_log.read(path)[0])
+
+@benchmark("friction_log.append")
+def _friction_append():
+    from observability import friction_log
+    path = os.path.join(_scratch(), "append.ndjson")
+    return lambda: friction_log.append("trace-bench", 3, "Loop limit reached", "flaky fixture", path=path)
+
+def _scratch():
+    """Per-run temp directory, removed at exit."""
+    import atexit, shutil, tempfile
+    path = tempfile.mkdtemp(prefix="antigravity-bench-")
+    atexit.register(shutil.rmtree, path, True)
+    return path
+
+# --- Measurement ---
+
+def measure(fn, samples):
+    """Per-call seconds for `samples` samples, each looping fn for at least MIN_SAMPLE_SECONDS.
+
+    The cyclic GC is paused while timing (as timeit does), so results do not depend on how
+    much heap earlier benchmarks left behind.
+    """
+    fn() # Warm caches and lazy imports
+    gc.collect()
+    gc.disable()
+    try:
+        return _samples(fn, samples)
+    finally:
+        gc.enable()
+
+def _samples(fn, samples):
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SAMPLE_SECONDS:
+            break
+        loops *= 2
+    results = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        results.append((time.perf_counter() - start) / loops)
+    return results
+
+def run_suite(names, samples):
+    """{name: [calibrated samples]} plus the calibration unit in seconds."""
+    from observability import telemetry
+    unit = statistics.median(measure(BENCHMARKS["calibration"](), samples))
+    results = {}
+    for name in names:
+        fn = BENCHMARKS[name]()
+        results[name] = [value / unit for value in measure(fn, samples)]
+        telemetry.reset() # Payload benchmarks must not grow the retained span list
+    return results, unit
+
+# --- Statistics ---
+
+def mann_whitney_greater(current, baseline):
+    """One-sided p-value that `current` is stochastically larger than `baseline`.
+
+    Normal approximation with tie and continuity correction (valid for n >= ~8 per side).
+    """
+    n1, n2 = len(current), len(baseline)
+    ranked = sorted([(v, 0) for v in current] + [(v, 1) for v in baseline])
+    ranks = [0.0] * len(ranked)
+    ties = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    u = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare(results, baseline):
+    """Rows of (name, baseline median, current median, ratio, p-value, regressed)."""
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            rows.append((name, None, statistics.median(current), None, None, False))
+            continue
+        before, after = statistics.median(previous["samples"]), statistics.median(current)
+        ratio = after / before
+        p_value = mann_whitney_greater(current, previous["samples"])
+        rows.append((name, before, after, ratio, p_value, p_value < ALPHA and ratio > 1 + MIN_EFFECT))
+    return rows
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_baseline(path, results, unit):
+    """Write results, keeping recorded benchmarks that were not part of this run (--only)."""
+    previous = (load_baseline(path) or {}).get("benchmarks", {})
+    data = {
+        "version": 1,
+        "recorded": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "calibration_seconds": unit,
+        "benchmarks": previous,
+    }
+    for name, samples in results.items():
+        data["benchmarks"][name] = {"median": statistics.median(samples), "samples": [float(f"{v:.6g}") for v in samples]}
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Antigravity hot-path benchmarks")
+    parser.add_argument("--samples", type=int, default=15, help="Samples per benchmark")
+    parser.add_argument("--only", action="append", choices=[n for n in BENCHMARKS if n != "calibration"], help="Run a subset (repeatable)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON path")
+    parser.add_argument("--save", action="store_true", help="Record the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on a statistically significant regression")
+    args = parser.parse_args()
+
+    os.environ.setdefault("ANTIGRAVITY_BRAIN", "memory") # Before the Brain is first touched
+    names = args.only or [n for n in BENCHMARKS if n != "calibration"]
+    results, unit = run_suite(names, args.samples)
+    baseline = load_baseline(args.baseline) or {}
+    print(f"[BENCH] calibration unit {unit * 1e6:.1f} us (values below are multiples of it)")
+
+    regressions = []
+    for name, before, after, ratio, p_value, regressed in compare(results, baseline):
+        if before is None:
+            print(f"[BENCH] {name:<40} {after:10.4g}  ({after * unit * 1e6:,.1f} us, no baseline)")
+            continue
+        verdict = "REGRESSION" if regressed else "ok"
+        print(f"[BENCH] {name:<40} {after:10.4g}  baseline {before:10.4g}  x{ratio:.2f}  p={p_value:.4f}  {verdict}")
+        if regressed:
+            regressions.append(name)
+
+    if args.save:
+        save_baseline(args.baseline, results, unit)
+        print(f"[INFO] Baseline written to {args.baseline}")
+    if args.check and regressions:
+        print(f"[ERROR] Performance regression (p < {ALPHA}, > {MIN_EFFECT:.0%} slower): {', '.join(regressions)}")
+        sys.exit(1)
+    if args.check and not baseline:
+        print(f"[WARN] No baseline at {args.baseline}. Run with --save to record one.")
@@ -0,0 +1,92 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+# Benchmark: Triage Analytics at archive scale. Loads synthetic events straight into a
+# scratch store (file parsing is not what is measured), then times a cold open and each
+# CLI query. Failures follow a Zipf-like skew over fingerprints and owners.
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(_HERE, '..')))
+
+from observability.triage_analytics import TriageStore
+
+def synthetic_events(count, fingerprints=500, owners=40, days=90, seed=42):
+    rng = random.Random(seed)
+    fp_weights = [1.0 / (rank + 1) for rank in range(fingerprints)]
+    owner_weights = [1.0 / (rank + 1) for rank in range(owners)]
+    fps = rng.choices(range(fingerprints), weights=fp_weights, k=count)
+    who = rng.choices(range(owners), weights=owner_weights, k=count)
+    end = time.time()
+    step = days * 86400 / count
+    for i in range(count):
+        trace = rng.random() < 0.3
+        yield {
+            "ts": end - (count - i) * step,
+            "fingerprint": f"{fps[i]:032x}",
+            "owner": f"dev{who[i]}@tngshopper.com",
+            "status": ("Error" if rng.random() < 0.6 else "Ok") if trace else "friction",
+            "ref": f"feature-{who[i] % 12}" if trace else "",
+            "source": "trace" if trace else "telemetry",
+            "loop_count": min(int(rng.expovariate(0.7)), 5),
+            "duration_ms": 0.0,
+            "key": f"bench|{i}",
+            "label": f"Failure {fps[i]}",
+        }
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3), result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Triage Analytics scale benchmark")
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--store", help="Keep the store here instead of a temp directory")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    directory = args.store or tempfile.mkdtemp(prefix="antigravity-triage-")
+    try:
+        store = TriageStore(directory)
+        print(f"[BENCH] Loading {args.events} synthetic events into {directory}...", file=sys.stderr)
+        start = time.perf_counter()
+        for event in synthetic_events(args.events):
+            store.add(event)
+        store.commit()
+        load_s = time.perf_counter() - start
+
+        open_ms, store = timed(lambda: TriageStore(directory), repeat=3)
+        owner = "dev3@tngshopper.com"
+        report = {
+            "events": store.rows,
+            "load_s": round(load_s, 2),
+            "store_bytes": store.stats()["bytes"],
+            "open_ms": open_ms,
+            "query_ms": {
+                "top_7d": timed(lambda: store.top_fingerprints(7))[0],
+                "top_7d_owner": timed(lambda: store.top_fingerprints(7, owner=owner))[0],
+                "top_7d_owner_status": timed(lambda: store.top_fingerprints(7, owner=owner, status="Error"))[0],
+                "loops_all": timed(lambda: store.loop_distribution())[0],
+                "loops_owner": timed(lambda: store.loop_distribution(owner=owner))[0],
+                "mttr_30d": timed(lambda: store.mttr_by_owner(30))[0],
+            },
+        }
+    finally:
+        if not args.store:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"[BENCH] {report['events']} events loaded in {report['load_s']}s, {report['store_bytes'] / 1e6:.1f} MB on disk, cold open {report['open_ms']} ms")
+        for name, ms in report["query_ms"].items():
+            print(f"[BENCH] {name:<22} {ms:>9.3f} ms")
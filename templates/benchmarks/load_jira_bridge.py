@@ -0,0 +1,132 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import contextlib
+import urllib.request
+import concurrent.futures
+
+# Load driver: replays synthetic build failures through the real Jira Bridge against the
+# local Jira emulator (or any JIRA_BASE_URL) and reports throughput, per-failure p50/p99
+# latency and Jira API calls per failure.
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(_HERE, '..', 'observability')))
+sys.path.append(os.path.abspath(os.path.join(_HERE, '..')))
+
+def synthetic_failures(count, distinct, seed=42):
+    """(summary, description) pairs; fingerprints follow a Zipf-like skew, as real CI failures do."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(distinct)]
+    kinds = [(f"Build Failure: job-{i:04d}", f"AssertionError in test_module_{i % 97}.py (step {i})") for i in range(distinct)]
+    return rng.choices(kinds, weights=weights, k=count)
+
+def fetch_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/_emulator/stats", timeout=5) as resp:
+        return json.load(resp)
+
+def run_load(jira_bridge, failures, workers, stats):
+    """Drive create_ticket for every failure. Returns (latencies_ms, failed, elapsed_s, calls delta)."""
+    headers = jira_bridge.get_credentials()
+    before = stats()
+    latencies = []
+    failed = 0
+
+    def one(failure):
+        start = time.perf_counter()
+        try:
+            jira_bridge.create_ticket(failure[0], failure[1], jira_bridge.PROJECT_KEY, headers=headers)
+            ok = True
+        except SystemExit: # create_ticket exits when Jira rejects the issue
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            for latency, ok in pool.map(one, failures):
+                latencies.append(latency)
+                failed += not ok
+    elapsed = time.perf_counter() - start
+
+    after = stats()
+    calls = {name: after["calls"].get(name, 0) - before["calls"].get(name, 0) for name in after["calls"]}
+    injected = {code: n - before["injected_errors"].get(code, 0) for code, n in after["injected_errors"].items()}
+    return latencies, failed, elapsed, {"calls": calls, "injected_errors": injected, "issues": after["issues"], "comments": after["comments"]}
+
+def report(failures, latencies, failed, elapsed, delta, http):
+    from observability import telemetry
+    ordered = sorted(latencies)
+    total_calls = sum(delta["calls"].values())
+    return {
+        "failures": len(failures),
+        "distinct_fingerprints": len(set(failures)),
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(failures) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "p50": round(telemetry.percentile(ordered, 50), 3),
+            "p99": round(telemetry.percentile(ordered, 99), 3),
+            "max": round(ordered[-1], 3) if ordered else 0.0,
+        },
+        "api_calls": total_calls,
+        "api_calls_per_failure": round(total_calls / len(failures), 3) if failures else 0.0,
+        "api_calls_by_endpoint": delta["calls"],
+        "injected_errors": delta["injected_errors"],
+        "issues": delta["issues"],
+        "comments": delta["comments"],
+        "jira_http": http,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jira Bridge load driver (local emulator by default)")
+    parser.add_argument("--failures", type=int, default=2000, help="Synthetic failures to replay")
+    parser.add_argument("--distinct", type=int, default=50, help="Distinct error fingerprints among them")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent submitters")
+    parser.add_argument("--transport", choices=["pool", "curl"], default="pool", help="Bridge transport under test")
+    parser.add_argument("--base-url", help="Use an already running emulator instead of starting one")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Emulator latency per call")
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with an injected error")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    emulator = None
+    if args.base_url:
+        base_url = args.base_url.rstrip("/")
+    else:
+        from observability.jira_emulator import JiraEmulator
+        emulator = JiraEmulator(port=0, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate).start()
+        base_url = emulator.base_url
+
+    # The bridge reads these at import: never let a load test reach real Jira with real credentials
+    os.environ["JIRA_BASE_URL"] = base_url
+    os.environ["JIRA_USER_EMAIL"] = "loadtest@tngshopper.com"
+    os.environ["JIRA_API_TOKEN"] = "loadtest-token-0000000000000000"
+    os.environ.setdefault("ANTIGRAVITY_BRAIN", "memory")
+    import jira_bridge
+
+    jira_bridge.BRAIN_FALLBACK = True # Coalesce recurrences as the daemon would
+    if args.transport == "pool":
+        jira_bridge.enable_http_pool(size=args.workers)
+
+    stats = emulator.state.stats if emulator else (lambda: fetch_stats(base_url))
+    failures = synthetic_failures(args.failures, args.distinct)
+    print(f"[LOAD] Replaying {len(failures)} failures ({args.distinct} fingerprints, {args.workers} workers, {args.transport}) against {base_url}...", file=sys.stderr)
+    try:
+        latencies, failed, elapsed, delta = run_load(jira_bridge, failures, args.workers, stats)
+    finally:
+        if emulator:
+            emulator.stop()
+
+    result = report(failures, latencies, failed, elapsed, delta, jira_bridge.telemetry.summary().get("jira.http"))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"[LOAD] {result['failures']} failures in {result['elapsed_s']}s: {result['throughput_per_s']}/s, "
+              f"p50 {result['latency_ms']['p50']}ms, p99 {result['latency_ms']['p99']}ms, {result['failed']} failed")
+        print(f"[LOAD] {result['api_calls']} Jira API calls ({result['api_calls_per_failure']} per failure): {result['api_calls_by_endpoint']}")
+        print(f"[LOAD] {result['issues']} issues, {result['comments']} comments, injected errors: {result['injected_errors'] or 'none'}")
@@ -0,0 +1,849 @@
+import os
+import re
+import time
+import fnmatch
+import hashlib
+import threading
+
+# redis-py loads only when a Brain is configured and reachable; hooks on the in-memory
+# path never pay for it. None: not tried yet, False: not installed.
+redis = None
+
+class WatchError(Exception):
+    """Watched key changed before EXEC (mirrors redis.exceptions.WatchError).
+
+    Rebound to the redis-py class once it loads; catch it as `redis_pool.WatchError`.
+    """
+
+class ResponseError(Exception):
+    """Command rejected by the server (mirrors redis.exceptions.ResponseError)."""
+
+# Antigravity Brain Access Layer (R 1.3 / R 2.7 / Rule 05)
+# One process-wide, pooled Redis client for every component, with cached health state and
+# a faithful in-memory stand-in (MemoryRedis) so offline runs and tests behave the same.
+
+SOCKET_TIMEOUT = 5
+CONNECT_TIMEOUT = 2
+MAX_CONNECTIONS = 32
+HEALTH_TTL = int(os.getenv("ANTIGRAVITY_BRAIN_HEALTH_TTL", 30)) # Seconds a ping result is trusted
+HEALTH_FILE = os.path.expanduser(os.getenv("ANTIGRAVITY_BRAIN_HEALTH_FILE", "~/.antigravity/brain_offline"))
+
+_LOCK = threading.Lock()
+_CLIENT = None
+_MEMORY = None
+_HEALTH = {"ok": None, "checked_at": 0.0, "error": None}
+
+# --- Connection management ---
+
+def _settings():
+    """Connection settings from the environment, or None when no Brain is configured."""
+    if os.getenv("ANTIGRAVITY_BRAIN") == "memory":
+        return None
+    url = os.getenv("REDIS_URL")
+    path = os.getenv("REDIS_SOCKET")
+    host = os.getenv("REDIS_HOST")
+    if not (url or path or host):
+        return None
+    return {
+        "url": url,
+        "path": path,
+        "host": host,
+        "port": int(os.getenv("REDIS_PORT") or 6379),
+        "username": os.getenv("REDIS_USER") or "default",
+        "password": os.getenv("REDIS_PASSWORD") or None,
+    }
+
+def _load_redis():
+    """Import redis-py and adopt its exception types, so one except clause covers both backends."""
+    global redis, WatchError, ResponseError
+    if redis is None:
+        try:
+            import redis as driver
+            from redis.exceptions import WatchError as watch_error, ResponseError as response_error
+        except ImportError:
+            redis = False
+        else:
+            redis, WatchError, ResponseError = driver, watch_error, response_error
+    return redis
+
+def _build_pool(settings):
+    common = {"decode_responses": True, "socket_timeout": SOCKET_TIMEOUT, "max_connections": MAX_CONNECTIONS}
+    if settings["url"]:
+        return redis.ConnectionPool.from_url(settings["url"], socket_connect_timeout=CONNECT_TIMEOUT, **common)
+    if settings["path"]:
+        # Unix socket: no TCP handshake, the fastest path to a co-located Brain
+        return redis.ConnectionPool(
+            connection_class=redis.UnixDomainSocketConnection,
+            path=settings["path"],
+            username=settings["username"],
+            password=settings["password"],
+            db=0,
+            **common,
+        )
+    return redis.ConnectionPool(
+        host=settings["host"],
+        port=settings["port"],
+        username=settings["username"],
+        password=settings["password"],
+        db=0,
+        socket_connect_timeout=CONNECT_TIMEOUT,
+        **common,
+    )
+
+def _recently_offline():
+    """Cross-process negative cache: successive hooks skip the connect timeout."""
+    try:
+        return time.time() - os.path.getmtime(HEALTH_FILE) < HEALTH_TTL
+    except OSError:
+        return False
+
+def _mark_offline(offline):
+    try:
+        if offline:
+            os.makedirs(os.path.dirname(HEALTH_FILE), exist_ok=True)
+            with open(HEALTH_FILE, "w") as f:
+                f.write(str(time.time()))
+        elif os.path.exists(HEALTH_FILE):
+            os.remove(HEALTH_FILE)
+    except OSError:
+        pass
+
+def get_client(fallback=True):
+    """Return the shared Brain client.
+
+    Falls back to the process-wide MemoryRedis when the Brain is unconfigured or
+    unreachable (or returns None when `fallback=False`). Health is re-checked at most
+    once per HEALTH_TTL, so hot paths do not ping on every call.
+    """
+    global _CLIENT
+    with _LOCK:
+        now = time.time()
+        if _CLIENT is not None and _HEALTH["ok"] and now - _HEALTH["checked_at"] < HEALTH_TTL:
+            return _CLIENT
+
+        settings = _settings()
+        failed_recently = _HEALTH["ok"] is False and now - _HEALTH["checked_at"] < HEALTH_TTL
+        if settings and not failed_recently and not _recently_offline() and _load_redis():
+            try:
+                client = _CLIENT or redis.Redis(connection_pool=_build_pool(settings))
+                client.ping()
+                _CLIENT = client
+                _HEALTH.update(ok=True, checked_at=now, error=None)
+                _mark_offline(False)
+                return client
+            except Exception as e:
+                _HEALTH.update(ok=False, checked_at=now, error=str(e))
+                _mark_offline(True)
+                print(f"[WARN] Brain unreachable ({e}). {'Using in-memory Brain.' if fallback else ''}".rstrip())
+        elif settings and redis is False:
+            _HEALTH.update(ok=False, checked_at=now, error="redis package not installed")
+
+    return memory() if fallback else None
+
+def memory():
+    """The process-wide in-memory Brain."""
+    global _MEMORY
+    with _LOCK:
+        if _MEMORY is None:
+            _MEMORY = MemoryRedis()
+        return _MEMORY
+
+def is_memory(client):
+    return isinstance(client, MemoryRedis)
+
+def health():
+    """Last known Brain state: {"backend": "redis" | "memory", "ok", "checked_at", "error"}."""
+    state = dict(_HEALTH)
+    state["backend"] = "redis" if _CLIENT is not None and _HEALTH["ok"] else "memory"
+    return state
+
+def reset():
+    """Drop cached clients and health (tests, or after changing REDIS_* at runtime)."""
+    global _CLIENT, _MEMORY
+    with _LOCK:
+        if _CLIENT is not None:
+            _CLIENT.connection_pool.disconnect()
+        _CLIENT = None
+        _MEMORY = None
+        _HEALTH.update(ok=None, checked_at=0.0, error=None)
+
+# --- In-memory stand-in ---
+
+def _encode(value):
+    """Match redis-py's encoding with decode_responses=True."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, bool):
+        raise ResponseError("Invalid input of type: 'bool'. Convert to a bytes, string, int or float first.")
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+def _index_range(seq, start, end):
+    n = len(seq)
+    start = max(n + start, 0) if start < 0 else start
+    end = n + end if end < 0 else end
+    return seq[start:end + 1] if start <= end else []
+
+def _score_bound(bound):
+    """Parse ZRANGEBYSCORE bounds: numbers, -inf/+inf and exclusive '(' prefixes."""
+    text = str(bound)
+    exclusive = text.startswith("(")
+    text = text[1:] if exclusive else text
+    return float(text.replace("+inf", "inf")), exclusive
+
+class MemoryRedis:
+    """In-process Redis semantics for strings, hashes, lists, sets and sorted sets.
+
+    Behaves like `redis.Redis(decode_responses=True)`: values come back as str, EX/PX
+    expiry is honoured, pipelines support WATCH/MULTI/EXEC, and EVAL runs a Lua-lite
+    subset (straight-line `redis.call` scripts).
+    """
+
+    def __init__(self):
+        self._data = {} # key -> (kind, value)
+        self._expires = {} # key -> unix deadline
+        self._versions = {} # key -> write counter (drives WATCH)
+        self._lock = threading.RLock()
+        self._scripts = {}
+
+    # Internals
+
+    def _alive(self, key):
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.time():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            self._touch(key)
+        return key in self._data
+
+    def _touch(self, key):
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def _version(self, key):
+        with self._lock:
+            self._alive(key)
+            return self._versions.get(key, 0)
+
+    def _get(self, key, kind, create=None):
+        if not self._alive(key):
+            if create is None:
+                return None
+            self._data[key] = (kind, create())
+        actual, value = self._data[key]
+        if actual != kind:
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _drop_if_empty(self, key):
+        if key in self._data and self._data[key][0] != "string" and not self._data[key][1]:
+            del self._data[key]
+            self._expires.pop(key, None)
+
+    # Server
+
+    def ping(self):
+        return True
+
+    def close(self):
+        pass
+
+    def flushdb(self):
+        with self._lock:
+            for key in list(self._data):
+                self._touch(key)
+            self._data.clear()
+            self._expires.clear()
+        return True
+
+    def dbsize(self):
+        with self._lock:
+            return sum(1 for key in list(self._data) if self._alive(key))
+
+    # Keys
+
+    def delete(self, *keys):
+        with self._lock:
+            removed = 0
+            for key in keys:
+                if self._alive(key):
+                    del self._data[key]
+                    self._expires.pop(key, None)
+                    self._touch(key)
+                    removed += 1
+            return removed
+
+    def exists(self, *keys):
+        with self._lock:
+            return sum(1 for key in keys if self._alive(key))
+
+    def expire(self, key, seconds):
+        with self._lock:
+            if not self._alive(key):
+                return False
+            self._expires[key] = time.time() + float(seconds)
+            self._touch(key)
+            return True
+
+    def pexpire(self, key, milliseconds):
+        return self.expire(key, float(milliseconds) / 1000.0)
+
+    def persist(self, key):
+        with self._lock:
+            return self._alive(key) and self._expires.pop(key, None) is not None
+
+    def ttl(self, key):
+        with self._lock:
+            if not self._alive(key):
+                return -2
+            deadline = self._expires.get(key)
+            return -1 if deadline is None else max(0, int(round(deadline - time.time())))
+
+    def type(self, key):
+        with self._lock:
+            return self._data[key][0] if self._alive(key) else "none"
+
+    def keys(self, pattern="*"):
+        with self._lock:
+            return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    # Strings
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key, "string")
+
+    def mget(self, keys, *args):
+        keys = [keys] + list(args) if isinstance(keys, str) else list(keys) + list(args)
+        with self._lock:
+            return [self._get(key, "string") if self.type(key) in ("string", "none") else None for key in keys]
+
+    def set(self, key, value, ex=None, px=None, nx=False, xx=False, keepttl=False):
+        with self._lock:
+            exists = self._alive(key)
+            if (nx and exists) or (xx and not exists):
+                return None
+            deadline = self._expires.get(key) if keepttl else None
+            self._data[key] = ("string", _encode(value))
+            self._expires.pop(key, None)
+            if ex is not None:
+                deadline = time.time() + float(ex)
+            elif px is not None:
+                deadline = time.time() + float(px) / 1000.0
+            if deadline is not None:
+                self._expires[key] = deadline
+            self._touch(key)
+            return True
+
+    def setex(self, key, time_seconds, value):
+        return self.set(key, value, ex=time_seconds)
+
+    def setnx(self, key, value):
+        return bool(self.set(key, value, nx=True))
+
+    def incrby(self, key, amount=1):
+        with self._lock:
+            current = self._get(key, "string") or "0"
+            try:
+                value = int(current) + int(amount)
+            except ValueError:
+                raise ResponseError("value is not an integer or out of range")
+            self._data[key] = ("string", str(value))
+            self._touch(key)
+            return value
+
+    def incr(self, key, amount=1):
+        return self.incrby(key, amount)
+
+    def decrby(self, key, amount=1):
+        return self.incrby(key, -int(amount))
+
+    def decr(self, key, amount=1):
+        return self.incrby(key, -int(amount))
+
+    def incrbyfloat(self, key, amount=1.0):
+        with self._lock:
+            current = self._get(key, "string") or "0"
+            try:
+                value = float(current) + float(amount)
+            except ValueError:
+                raise ResponseError("value is not a valid float")
+            self._data[key] = ("string", repr(value))
+            self._touch(key)
+            return value
+
+    # Hashes
+
+    def hset(self, name, key=None, value=None, mapping=None, items=None):
+        pairs = dict(mapping or {})
+        if key is not None:
+            pairs[key] = value
+        if items:
+            pairs.update(zip(items[::2], items[1::2]))
+        if not pairs:
+            raise ResponseError("'hset' with no key value pairs")
+        with self._lock:
+            h = self._get(name, "hash", create=dict)
+            added = sum(1 for field in pairs if _encode(field) not in h)
+            h.update({_encode(k): _encode(v) for k, v in pairs.items()})
+            self._touch(name)
+            return added
+
+    def hsetnx(self, name, key, value):
+        with self._lock:
+            h = self._get(name, "hash", create=dict)
+            if _encode(key) in h:
+                return 0
+            h[_encode(key)] = _encode(value)
+            self._touch(name)
+            return 1
+
+    def hget(self, name, key):
+        with self._lock:
+            return (self._get(name, "hash") or {}).get(_encode(key))
+
+    def hmget(self, name, keys, *args):
+        keys = [keys] + list(args) if isinstance(keys, str) else list(keys) + list(args)
+        with self._lock:
+            h = self._get(name, "hash") or {}
+            return [h.get(_encode(key)) for key in keys]
+
+    def hgetall(self, name):
+        with self._lock:
+            return dict(self._get(name, "hash") or {})
+
+    def hkeys(self, name):
+        return list(self.hgetall(name))
+
+    def hvals(self, name):
+        return list(self.hgetall(name).values())
+
+    def hlen(self, name):
+        return len(self.hgetall(name))
+
+    def hexists(self, name, key):
+        return _encode(key) in self.hgetall(name)
+
+    def hdel(self, name, *keys):
+        with self._lock:
+            h = self._get(name, "hash") or {}
+            removed = sum(1 for key in keys if h.pop(_encode(key), None) is not None)
+            if removed:
+                self._drop_if_empty(name)
+                self._touch(name)
+            return removed
+
+    def hincrby(self, name, key, amount=1):
+        with self._lock:
+            h = self._get(name, "hash", create=dict)
+            try:
+                value = int(h.get(_encode(key), "0")) + int(amount)
+            except ValueError:
+                raise ResponseError("hash value is not an integer")
+            h[_encode(key)] = str(value)
+            self._touch(name)
+            return value
+
+    def hincrbyfloat(self, name, key, amount=1.0):
+        with self._lock:
+            h = self._get(name, "hash", create=dict)
+            value = float(h.get(_encode(key), "0")) + float(amount)
+            h[_encode(key)] = repr(value)
+            self._touch(name)
+            return value
+
+    # Lists
+
+    def lpush(self, name, *values):
+        with self._lock:
+            lst = self._get(name, "list", create=list)
+            for value in values:
+                lst.insert(0, _encode(value))
+            self._touch(name)
+            return len(lst)
+
+    def rpush(self, name, *values):
+        with self._lock:
+            lst = self._get(name, "list", create=list)
+            lst.extend(_encode(value) for value in values)
+            self._touch(name)
+            return len(lst)
+
+    def lpop(self, name):
+        with self._lock:
+            lst = self._get(name, "list")
+            if not lst:
+                return None
+            value = lst.pop(0)
+            self._drop_if_empty(name)
+            self._touch(name)
+            return value
+
+    def rpop(self, name):
+        with self._lock:
+            lst = self._get(name, "list")
+            if not lst:
+                return None
+            value = lst.pop()
+            self._drop_if_empty(name)
+            self._touch(name)
+            return value
+
+    def lrange(self, name, start, end):
+        with self._lock:
+            return list(_index_range(self._get(name, "list") or [], int(start), int(end)))
+
+    def ltrim(self, name, start, end):
+        with self._lock:
+            lst = self._get(name, "list")
+            if lst is not None:
+                lst[:] = _index_range(lst, int(start), int(end))
+                self._drop_if_empty(name)
+                self._touch(name)
+            return True
+
+    def llen(self, name):
+        with self._lock:
+            return len(self._get(name, "list") or [])
+
+    def lindex(self, name, index):
+        with self._lock:
+            lst = self._get(name, "list") or []
+            try:
+                return lst[int(index)]
+            except IndexError:
+                return None
+
+    # Sets
+
+    def sadd(self, name, *values):
+        with self._lock:
+            s = self._get(name, "set", create=set)
+            before = len(s)
+            s.update(_encode(value) for value in values)
+            self._touch(name)
+            return len(s) - before
+
+    def srem(self, name, *values):
+        with self._lock:
+            s = self._get(name, "set") or set()
+            before = len(s)
+            s.difference_update(_encode(value) for value in values)
+            self._drop_if_empty(name)
+            self._touch(name)
+            return before - len(s)
+
+    def smembers(self, name):
+        with self._lock:
+            return set(self._get(name, "set") or set())
+
+    def sismember(self, name, value):
+        return _encode(value) in self.smembers(name)
+
+    def scard(self, name):
+        return len(self.smembers(name))
+
+    # Sorted sets
+
+    def zadd(self, name, mapping, nx=False, xx=False):
+        with self._lock:
+            z = self._get(name, "zset", create=dict)
+            added = 0
+            for member, score in mapping.items():
+                member = _encode(member)
+                exists = member in z
+                if (nx and exists) or (xx and not exists):
+                    continue
+                added += 0 if exists else 1
+                z[member] = float(score)
+            self._drop_if_empty(name)
+            self._touch(name)
+            return added
+
+    def zincrby(self, name, amount, value):
+        with self._lock:
+            z = self._get(name, "zset", create=dict)
+            z[_encode(value)] = z.get(_encode(value), 0.0) + float(amount)
+            self._touch(name)
+            return z[_encode(value)]
+
+    def zrem(self, name, *values):
+        with self._lock:
+            z = self._get(name, "zset") or {}
+            removed = sum(1 for value in values if z.pop(_encode(value), None) is not None)
+            self._drop_if_empty(name)
+            self._touch(name)
+            return removed
+
+    def zscore(self, name, value):
+        with self._lock:
+            return (self._get(name, "zset") or {}).get(_encode(value))
+
+    def zcard(self, name):
+        with self._lock:
+            return len(self._get(name, "zset") or {})
+
+    def _sorted(self, name):
+        return sorted((self._get(name, "zset") or {}).items(), key=lambda item: (item[1], item[0]))
+
+    def zrange(self, name, start, end, withscores=False):
+        with self._lock:
+            items = _index_range(self._sorted(name), int(start), int(end))
+            return items if withscores else [member for member, _ in items]
+
+    def zrangebyscore(self, name, min, max, start=None, num=None, withscores=False):
+        low, low_open = _score_bound(min)
+        high, high_open = _score_bound(max)
+        with self._lock:
+            items = [
+                (member, score) for member, score in self._sorted(name)
+                if (score > low if low_open else score >= low) and (score < high if high_open else score <= high)
+            ]
+        if start is not None and num is not None:
+            items = items[int(start):int(start) + int(num)]
+        return items if withscores else [member for member, _ in items]
+
+    def zremrangebyscore(self, name, min, max):
+        return self.zrem(name, *self.zrangebyscore(name, min, max)) if self.zrangebyscore(name, min, max) else 0
+
+    # Pipelines
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return MemoryPipeline(self, transaction)
+
+    # Lua-lite
+
+    def eval(self, script, numkeys, *keys_and_args):
+        keys = [_encode(k) for k in keys_and_args[:int(numkeys)]]
+        args = [_encode(a) for a in keys_and_args[int(numkeys):]]
+        with self._lock:
+            return _LuaLite(script).run(self, keys, args)
+
+    def script_load(self, script):
+        sha = hashlib.sha1(script.encode("utf-8")).hexdigest()
+        _LuaLite(script) # Validate eagerly, like SCRIPT LOAD compiling the script
+        self._scripts[sha] = script
+        return sha
+
+    def evalsha(self, sha, numkeys, *keys_and_args):
+        if sha not in self._scripts:
+            raise ResponseError("NOSCRIPT No matching script. Please use EVAL.")
+        return self.eval(self._scripts[sha], numkeys, *keys_and_args)
+
+    def register_script(self, script):
+        sha = self.script_load(script)
+
+        def call(keys=(), args=(), client=None):
+            return (client or self).evalsha(sha, len(keys), *keys, *args)
+        return call
+
+    def execute_command(self, *args):
+        """Raw command interface (used by Lua-lite's redis.call)."""
+        name, args = str(args[0]).upper(), list(args[1:])
+        handler = _RAW_COMMANDS.get(name)
+        if handler is None:
+            raise ResponseError(f"Lua-lite: unsupported command '{name}'")
+        return handler(self, args)
+
+class MemoryPipeline:
+    """Buffered commands with redis-py's WATCH / MULTI / EXEC semantics."""
+
+    def __init__(self, client, transaction=True):
+        self.client = client
+        self.transaction = transaction
+        self.commands = []
+        self.watching = None
+        self.explicit_multi = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.reset()
+
+    def __len__(self):
+        return len(self.commands)
+
+    def reset(self):
+        self.commands = []
+        self.watching = None
+        self.explicit_multi = False
+
+    def watch(self, *keys):
+        self.watching = dict(self.watching or {})
+        for key in keys:
+            self.watching[key] = self.client._version(key)
+        return True
+
+    def unwatch(self):
+        self.watching = None
+        return True
+
+    def multi(self):
+        self.explicit_multi = True
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        if self.watching is not None and not self.explicit_multi:
+            return command # Immediate mode between WATCH and MULTI
+
+        def buffered(*args, **kwargs):
+            self.commands.append((command, args, kwargs))
+            return self
+        return buffered
+
+    def execute(self, raise_on_error=True):
+        with self.client._lock:
+            if self.watching and any(self.client._version(k) != v for k, v in self.watching.items()):
+                self.reset()
+                raise WatchError("Watched variable changed.")
+            results = []
+            for command, args, kwargs in self.commands:
+                try:
+                    results.append(command(*args, **kwargs))
+                except ResponseError as e:
+                    results.append(e)
+        self.reset()
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ResponseError):
+                    raise result
+        return results
+
+# --- Lua-lite: straight-line scripts of redis.call / local / return ---
+
+_TOKEN = re.compile(r"""\s*(?:(?P<str>'[^']*'|"[^"]*")|(?P<num>-?\d+(?:\.\d+)?)|(?P<ref>KEYS|ARGV)\[(?P<idx>\d+)\]|(?P<name>[A-Za-z_][\w.]*)|(?P<op>[(),]))""")
+
+class _LuaLite:
+    """Interprets `local x = redis.call(...)`, bare `redis.call(...)` and `return <expr>`.
+
+    Expressions: redis.call(...), KEYS[n], ARGV[n], tonumber(expr), tostring(expr),
+    string/number literals and locals. Anything else raises ResponseError, so scripts
+    needing control flow fail loudly offline instead of silently diverging.
+    """
+
+    def __init__(self, script):
+        self.statements = []
+        for raw in re.split(r"[;\n]", script):
+            line = raw.split("--", 1)[0].strip()
+            if not line:
+                continue
+            match = re.match(r"^local\s+(\w+)\s*=\s*(.+)$", line)
+            if match:
+                self.statements.append(("local", match.group(1), self._parse(match.group(2))))
+            elif line.startswith("return"):
+                self.statements.append(("return", None, self._parse(line[len("return"):])))
+            else:
+                self.statements.append(("expr", None, self._parse(line)))
+
+    def _parse(self, text):
+        tokens, pos = [], 0
+        text = text.strip()
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            if not match or match.end() == pos:
+                raise ResponseError(f"Lua-lite: unsupported syntax near '{text[pos:]}'")
+            tokens.append(match)
+            pos = match.end()
+        expr, rest = self._expr(tokens)
+        if rest:
+            raise ResponseError(f"Lua-lite: unexpected trailing tokens in '{text}'")
+        return expr
+
+    def _expr(self, tokens):
+        if not tokens:
+            raise ResponseError("Lua-lite: empty expression")
+        head, rest = tokens[0], tokens[1:]
+        if head.group("str"):
+            return ("lit", head.group("str")[1:-1]), rest
+        if head.group("num"):
+            num = head.group("num")
+            return ("lit", float(num) if "." in num else int(num)), rest
+        if head.group("ref"):
+            return ("ref", head.group("ref"), int(head.group("idx")) - 1), rest
+        name = head.group("name")
+        if name in ("redis.call", "tonumber", "tostring") and rest and rest[0].group("op") == "(":
+            args, rest = [], rest[1:]
+            while rest and rest[0].group("op") != ")":
+                arg, rest = self._expr(rest)
+                args.append(arg)
+                if rest and rest[0].group("op") == ",":
+                    rest = rest[1:]
+            if not rest:
+                raise ResponseError("Lua-lite: unbalanced parentheses")
+            return ("call", name, args), rest[1:]
+        if name and name not in ("if", "for", "while", "function", "then", "end"):
+            return ("var", name), rest
+        raise ResponseError(f"Lua-lite: unsupported construct '{head.group(0).strip()}'")
+
+    def _eval(self, node, client, keys, args, scope):
+        kind = node[0]
+        if kind == "lit":
+            return node[1]
+        if kind == "ref":
+            source = keys if node[1] == "KEYS" else args
+            return source[node[2]] if node[2] < len(source) else None
+        if kind == "var":
+            if node[1] not in scope:
+                raise ResponseError(f"Lua-lite: undefined variable '{node[1]}'")
+            return scope[node[1]]
+        values = [self._eval(arg, client, keys, args, scope) for arg in node[2]]
+        if node[1] == "tonumber":
+            try:
+                return float(values[0]) if "." in str(values[0]) else int(values[0])
+            except (TypeError, ValueError):
+                return None
+        if node[1] == "tostring":
+            return _encode(values[0])
+        return client.execute_command(*values)
+
+    def run(self, client, keys, args):
+        scope = {}
+        for kind, name, expr in self.statements:
+            value = self._eval(expr, client, keys, args, scope)
+            if kind == "local":
+                scope[name] = value
+            elif kind == "return":
+                # Lua -> Redis conversion: numbers truncate to integers, false/nil -> nil
+                return int(value) if isinstance(value, float) else (None if value is False else value)
+        return None
+
+def _set_command(client, args):
+    key, value, options = args[0], args[1], [str(a).upper() for a in args[2:]]
+    kwargs = {"nx": "NX" in options, "xx": "XX" in options, "keepttl": "KEEPTTL" in options}
+    for flag, name in (("EX", "ex"), ("PX", "px")):
+        if flag in options:
+            kwargs[name] = args[2 + options.index(flag) + 1]
+    return "OK" if client.set(key, value, **kwargs) else None
+
+_RAW_COMMANDS = {
+    "GET": lambda c, a: c.get(a[0]),
+    "SET": _set_command,
+    "DEL": lambda c, a: c.delete(*a),
+    "EXISTS": lambda c, a: c.exists(*a),
+    "EXPIRE": lambda c, a: int(c.expire(a[0], a[1])),
+    "TTL": lambda c, a: c.ttl(a[0]),
+    "INCR": lambda c, a: c.incr(a[0]),
+    "INCRBY": lambda c, a: c.incrby(a[0], a[1]),
+    "DECR": lambda c, a: c.decr(a[0]),
+    "DECRBY": lambda c, a: c.decrby(a[0], a[1]),
+    "INCRBYFLOAT": lambda c, a: _encode(c.incrbyfloat(a[0], a[1])),
+    "HGET": lambda c, a: c.hget(a[0], a[1]),
+    "HSET": lambda c, a: c.hset(a[0], items=a[1:]),
+    "HSETNX": lambda c, a: c.hsetnx(a[0], a[1], a[2]),
+    "HDEL": lambda c, a: c.hdel(a[0], *a[1:]),
+    "HINCRBY": lambda c, a: c.hincrby(a[0], a[1], a[2]),
+    "HGETALL": lambda c, a: [x for pair in c.hgetall(a[0]).items() for x in pair],
+    "LPUSH": lambda c, a: c.lpush(a[0], *a[1:]),
+    "RPUSH": lambda c, a: c.rpush(a[0], *a[1:]),
+    "LRANGE": lambda c, a: c.lrange(a[0], a[1], a[2]),
+    "LTRIM": lambda c, a: "OK" if c.ltrim(a[0], a[1], a[2]) else None,
+    "LLEN": lambda c, a: c.llen(a[0]),
+    "SADD": lambda c, a: c.sadd(a[0], *a[1:]),
+    "SREM": lambda c, a: c.srem(a[0], *a[1:]),
+    "SISMEMBER": lambda c, a: int(c.sismember(a[0], a[1])),
+    "ZADD": lambda c, a: c.zadd(a[0], dict(zip(a[2::2], a[1::2]))),
+    "ZREM": lambda c, a: c.zrem(a[0], *a[1:]),
+    "ZSCORE": lambda c, a: None if c.zscore(a[0], a[1]) is None else _encode(c.zscore(a[0], a[1])),
+    "ZCARD": lambda c, a: c.zcard(a[0]),
+}
@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import socket
+import argparse
+
+# Antigravity Bridge Client (R 2.6 Warm Intake)
+# Thin submitter for bridge_daemon.py: stdlib-only, returns as soon as the event is queued.
+# Falls back to the in-process Jira Bridge when no daemon is listening.
+
+DEFAULT_ADDR = os.getenv("ANTIGRAVITY_BRIDGE_ADDR", "/tmp/antigravity_bridge.sock")
+CONNECT_TIMEOUT = 0.5
+FORWARDED_ENV = ["TRACE_ID", "CI", "GITHUB_ACTIONS", "GITHUB_REF_NAME", "GITHUB_SERVER_URL", "GITHUB_REPOSITORY", "GITHUB_RUN_ID"]
+
+def send(event, addr=DEFAULT_ADDR, timeout=CONNECT_TIMEOUT):
+    """Deliver one event and return the daemon's ack, or None if it is unreachable.
+
+    Any failure of the exchange (timeout, reset, truncated reply) also returns None, so the
+    caller falls back to the in-process bridge.
+    """
+    try:
+        if not addr.startswith("/") and ":" in addr:
+            host, port = addr.rsplit(":", 1)
+            sock = socket.create_connection((host.strip("[]"), int(port)), timeout=timeout)
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            sock.connect(addr)
+        with sock:
+            sock.sendall((json.dumps(event) + "\n").encode("utf-8"))
+            reply = sock.makefile("r").readline()
+        return json.loads(reply) if reply else None
+    except (OSError, ValueError):
+        return None
+
+def build_event(args):
+    return {
+        "summary": args.summary,
+        "description": args.description,
+        "project": args.project or args.pos_project,
+        "file": os.path.abspath(args.file) if args.file else None,
+        "line": args.line,
+        "log_file": os.path.abspath(args.log_file) if args.log_file else None,
+        "gcs_bucket": args.gcs_bucket,
+        "cwd": os.getcwd(),
+        "env": {k: os.environ[k] for k in FORWARDED_ENV if k in os.environ},
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Submit a failure to the Antigravity Bridge Daemon")
+    parser.add_argument("summary", nargs="?")
+    parser.add_argument("description", nargs="?")
+    parser.add_argument("pos_project", nargs="?", help="Project Key (Positional)")
+    parser.add_argument("--project", help="Project Key (Named)")
+    parser.add_argument("--file", help="Source file for blame")
+    parser.add_argument("--line", type=int, default=1, help="Line number for blame")
+    parser.add_argument("--log-file", help="Path to log file for ingestion")
+    parser.add_argument("--gcs-bucket", help="Target GCS Bucket for Flight Recorder Payload")
+    parser.add_argument("--addr", default=DEFAULT_ADDR, help="Daemon unix socket path or loopback host:port")
+    parser.add_argument("--ping", action="store_true", help="Check whether the daemon is running")
+    args = parser.parse_args()
+
+    if args.ping:
+        ack = send({"op": "ping"}, args.addr)
+        print(f"[DAEMON] {'Running (' + str(ack['queued']) + ' queued)' if ack else 'Not reachable'}")
+        sys.exit(0 if ack else 1)
+
+    if not args.summary:
+        parser.error("summary is required")
+
+    ack = send(build_event(args), args.addr)
+    if ack and ack.get("status") == "queued":
+        print("[DAEMON] Failure queued.")
+        sys.exit(0)
+
+    if ack:
+        print(f"[WARN] Daemon rejected event: {ack.get('reason')}")
+    print("[INFO] Bridge daemon unavailable. Running Jira Bridge in-process...")
+    import jira_bridge
+    jira_bridge.create_ticket(
+        args.summary, args.description or "No Desc", args.project or args.pos_project or jira_bridge.PROJECT_KEY,
+        args.file, args.line, args.log_file, args.gcs_bucket,
+    )
@@ -0,0 +1,260 @@
+import os
+import json
+import time
+import queue
+import signal
+import socket
+import argparse
+import subprocess
+import threading
+import contextlib
+import socketserver
+
+# Antigravity Bridge Daemon (R 2.6 Warm Intake)
+# Keeps the Jira Bridge resident (pooled HTTP, lookup caches, credentials) and accepts
+# failure events over a local socket, so CI hooks submit in milliseconds instead of
+# paying a fresh interpreter + curl handshake per failure.
+
+DEFAULT_ADDR = os.getenv("ANTIGRAVITY_BRIDGE_ADDR", "/tmp/antigravity_bridge.sock")
+BATCH_WINDOW = 0.05 # Seconds to wait for concurrent submitters before draining a batch
+BATCH_MAX = 64
+FLUSH_INTERVAL = 60 # Seconds between idle sweeps for elapsed recurrence digests
+
+# Environment captured by the client so tickets carry the submitter's CI context
+FORWARDED_ENV = ["TRACE_ID", "CI", "GITHUB_ACTIONS", "GITHUB_REF_NAME", "GITHUB_SERVER_URL", "GITHUB_REPOSITORY", "GITHUB_RUN_ID"]
+
+# The intake has no authentication: TCP is only ever bound to loopback
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+def parse_addr(addr):
+    """`/path/to.sock` -> unix socket, `host:port` / `[::1]:port` -> loopback TCP."""
+    if not addr.startswith("/") and ":" in addr:
+        host, port = addr.rsplit(":", 1)
+        host = host.strip("[]")
+        if host not in LOOPBACK_HOSTS:
+            raise ValueError(f"Refusing to listen on {host}: the bridge intake only binds {', '.join(sorted(LOOPBACK_HOSTS))}")
+        return (host, int(port))
+    return addr
+
+def repo_root(path):
+    """Top level of the git work tree containing `path`, or None."""
+    if not path or not os.path.isdir(path):
+        return None
+    try:
+        result = subprocess.run(["git", "-C", path, "rev-parse", "--show-toplevel"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    top = result.stdout.strip()
+    return os.path.realpath(top) if result.returncode == 0 and top else None
+
+def confine_paths(event):
+    """(repo root, {"file", "log_file"}) for an event, limited to the submitter's repository.
+
+    A client cannot make the daemon read, blame or upload files outside the git work tree
+    it submitted from: such paths are dropped, and so are all paths when `cwd` is not in one.
+    """
+    root = repo_root(event.get("cwd"))
+    paths = {}
+    for key in ("file", "log_file"):
+        value = event.get(key)
+        resolved = os.path.realpath(os.path.join(root, value)) if root and value else None
+        if value and not (resolved and os.path.commonpath([root, resolved]) == root):
+            print(f"[WARN] Ignoring {key} outside the submitter's repository: {value}")
+            resolved = None
+        paths[key] = resolved
+    return root, paths
+
+@contextlib.contextmanager
+def submitter_context(event, root=None):
+    """Temporarily adopt the submitter's repository and CI env (the worker is single-threaded)."""
+    saved_env = {k: os.environ.get(k) for k in FORWARDED_ENV}
+    saved_cwd = os.getcwd()
+    try:
+        for k in FORWARDED_ENV:
+            os.environ.pop(k, None)
+        # Only the CI context is adopted: anything else (PATH, JIRA_*) would outlive this event
+        os.environ.update({k: str(v) for k, v in (event.get("env") or {}).items() if k in FORWARDED_ENV})
+        if root:
+            os.chdir(root)
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+def group_by_fingerprint(events, fingerprint):
+    """Collapse identical failures within a batch, preserving arrival order."""
+    groups = {}
+    for event in events:
+        groups.setdefault(fingerprint(event["summary"], event.get("description") or "No Desc"), []).append(event)
+    return list(groups.values())
+
+class IntakeHandler(socketserver.StreamRequestHandler):
+    """Line protocol: one JSON event in, one JSON ack out."""
+    def handle(self):
+        for raw in self.rfile:
+            try:
+                event = json.loads(raw)
+            except json.JSONDecodeError:
+                self._reply({"status": "error", "reason": "invalid json"})
+                continue
+            if event.get("op") == "ping":
+                self._reply({"status": "ok", "queued": self.server.bridge.queue.qsize()})
+                continue
+            if not event.get("summary"):
+                self._reply({"status": "error", "reason": "summary required"})
+                continue
+            self.server.bridge.queue.put(event)
+            self._reply({"status": "queued"})
+
+    def _reply(self, body):
+        self.wfile.write((json.dumps(body) + "\n").encode("utf-8"))
+        self.wfile.flush()
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class ThreadingTCP6Server(ThreadingTCPServer):
+    address_family = socket.AF_INET6
+
+class BridgeDaemon:
+    """Socket intake + single batching worker around a warm jira_bridge module."""
+
+    def __init__(self, addr=DEFAULT_ADDR, process_batch=None, batch_window=BATCH_WINDOW, batch_max=BATCH_MAX):
+        self.addr = parse_addr(addr)
+        self.queue = queue.Queue()
+        self.batch_window = batch_window
+        self.batch_max = batch_max
+        self.process_batch = process_batch or self._process_with_bridge
+        self.idle_task = None if process_batch else self._flush_recurrences
+        self.last_idle = time.monotonic()
+        self.stopping = threading.Event()
+        self.headers = None
+        self.server = None
+        self.worker = None
+
+    def start(self):
+        if isinstance(self.addr, str):
+            if os.path.exists(self.addr):
+                os.remove(self.addr) # Stale socket from a previous run
+            self.server = ThreadingUnixServer(self.addr, IntakeHandler)
+            os.chmod(self.addr, 0o600)
+        else:
+            server_class = ThreadingTCP6Server if ":" in self.addr[0] else ThreadingTCPServer
+            self.server = server_class(self.addr, IntakeHandler)
+        self.server.bridge = self
+        self.worker = threading.Thread(target=self._drain_loop, name="bridge-worker", daemon=True)
+        self.worker.start()
+        threading.Thread(target=self.server.serve_forever, name="bridge-intake", daemon=True).start()
+
+    def stop(self):
+        """Stop intake, flush everything already queued, then release the socket."""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        self.stopping.set()
+        if self.worker:
+            self.worker.join()
+        if isinstance(self.addr, str) and os.path.exists(self.addr):
+            os.remove(self.addr)
+
+    def _next_batch(self):
+        try:
+            first = self.queue.get(timeout=0.2)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_max:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain_loop(self):
+        while not (self.stopping.is_set() and self.queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                if self.idle_task and time.monotonic() - self.last_idle >= FLUSH_INTERVAL:
+                    self.last_idle = time.monotonic()
+                    try:
+                        self.idle_task()
+                    except Exception as e:
+                        print(f"[WARN] Idle task failed: {e}")
+                continue
+            try:
+                self.process_batch(batch)
+            except BaseException as e: # create_ticket may sys.exit on API failure
+                print(f"[ERROR] Bridge batch failed: {e!r}")
+
+    def _process_with_bridge(self, batch):
+        import jira_bridge
+
+        print(f"[DAEMON] Processing batch of {len(batch)} failure(s)...")
+        for group in group_by_fingerprint(batch, jira_bridge.compute_fingerprint):
+            event = group[-1] # Latest occurrence carries the freshest trace/run context
+            root, paths = confine_paths(event)
+            with submitter_context(event, root):
+                try:
+                    jira_bridge.create_ticket(
+                        event["summary"],
+                        event.get("description") or "No Desc",
+                        event.get("project") or jira_bridge.PROJECT_KEY,
+                        paths["file"],
+                        event.get("line", 1),
+                        paths["log_file"],
+                        event.get("gcs_bucket"),
+                        headers=self.headers,
+                        occurrences=len(group),
+                    )
+                except SystemExit:
+                    print(f"[ERROR] Bridge rejected event: {event['summary']}")
+
+    def _flush_recurrences(self):
+        import jira_bridge
+        jira_bridge.flush_due_recurrences(self.headers)
+
+    def warm_up(self):
+        """Build long-lived state once: credentials, the keep-alive pool and the Brain client."""
+        import jira_bridge
+
+        jira_bridge.telemetry.init("antigravity-bridge-daemon")
+        self.headers = jira_bridge.get_credentials()
+        if self.headers:
+            jira_bridge.enable_http_pool()
+        # Recurrence counters outlive single failures here, so coalesce in memory if the Brain is down
+        jira_bridge.BRAIN_FALLBACK = True
+        brain = jira_bridge.redis_pool
+        brain.get_client()
+        print(f"[DAEMON] Warm state ready (Mode: {'LIVE' if self.headers else 'MOCK'}, Brain: {brain.health()['backend']}).")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Antigravity Jira Bridge Daemon")
+    parser.add_argument("--addr", default=DEFAULT_ADDR, help="Unix socket path or loopback host:port")
+    parser.add_argument("--batch-window-ms", type=int, default=int(BATCH_WINDOW * 1000))
+    args = parser.parse_args()
+
+    daemon = BridgeDaemon(args.addr, batch_window=args.batch_window_ms / 1000.0)
+    daemon.warm_up()
+    daemon.start()
+    print(f"[DAEMON] Listening on {args.addr}")
+
+    done = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: done.set())
+    signal.signal(signal.SIGINT, lambda *_: done.set())
+    done.wait()
+    print("[DAEMON] Draining queue and shutting down...")
+    daemon.stop()
+    import jira_bridge
+    jira_bridge.telemetry.print_summary() # Per-operation p50/p99 for the daemon's lifetime
@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+from flight_recorder_validator import load_validator
+
+# Antigravity Flight Recorder Store (Rule 05 + Rule 06)
+# Keeps each trace's Flight Recorder state in the Brain so agents exchange a trace_id
+# instead of the full JSON block. Scalars live in one hash; handover_manifest and
+# feedback_chain changes are stored as compact deltas.
+
+KEY_PREFIX = "fr"
+MAX_LOOPS = 5 # Schema: "Max 5 before human intervention."
+CAS_RETRIES = 8
+
+SCALAR_FIELDS = {
+    "trace_id": str,
+    "git_commit_hash": str,
+    "jira_ticket_id": str,
+    "gcp_trace_id": str,
+    "ci_build_id": str,
+    "status": str,
+    "loop_count": int,
+    "owner": str,
+    "cost_estimate": float,
+}
+
+# Only transition() may write these: status moves are guarded and each revision counts a loop
+TRANSITION_FIELDS = {"status", "loop_count"}
+
+# Handover order from docs/Agent_Handover_Contracts.md; Rule 08 forbids PLAN_APPROVED -> BUILDING.
+TRANSITIONS = {
+    "PLANNING": {"PLAN_APPROVED", "NEEDS_REVISION"},
+    "PLAN_APPROVED": {"COST_VALIDATED", "NEEDS_REVISION"},
+    "COST_VALIDATED": {"BUILDING", "NEEDS_REVISION"},
+    "BUILDING": {"BUILD_COMPLETE", "NEEDS_REVISION"},
+    "BUILD_COMPLETE": {"READY_FOR_MERGE", "NEEDS_REVISION"},
+    "NEEDS_REVISION": {"PLANNING", "BUILDING"},
+    "READY_FOR_MERGE": {"PROD_ALERT", "NEEDS_REVISION"},
+    "PROD_ALERT": {"PLANNING", "NEEDS_REVISION"},
+}
+
+def _compact(obj):
+    return json.dumps(obj, separators=(",", ":"), sort_keys=True)
+
+def manifest_delta(current, changes):
+    """Only the keys that actually change. `None` removes a key."""
+    delta = {"set": {}, "unset": []}
+    for key, value in changes.items():
+        if value is None:
+            if key in current:
+                delta["unset"].append(key)
+        elif current.get(key) != value:
+            delta["set"][key] = value
+    return delta
+
+class FlightRecorderStore:
+    """Pipelined Redis persistence for Flight Recorder state objects.
+
+    The client must be created with `decode_responses=True`.
+    """
+
+    def __init__(self, client, ttl=7 * 86400, validate=True):
+        self.client = client
+        self.ttl = ttl
+        self.validate = validate
+
+    @staticmethod
+    def keys(trace_id):
+        base = f"{KEY_PREFIX}:{trace_id}"
+        return base, f"{base}:manifest", f"{base}:manifest:deltas", f"{base}:feedback"
+
+    def _expire(self, pipe, trace_id):
+        for key in self.keys(trace_id):
+            pipe.expire(key, self.ttl)
+
+    # --- Writes ---
+
+    def create(self, state):
+        """Persist a full state object (first turn, or import from a JSON block).
+
+        Raises ValueError when the object does not conform to Flight_Recorder_Schema.json.
+        """
+        if self.validate:
+            errors = load_validator()(state)
+            if errors:
+                raise ValueError(f"Invalid Flight Recorder state: {'; '.join(errors)}")
+        trace_id = state["trace_id"]
+        base, manifest_key, deltas_key, feedback_key = self.keys(trace_id)
+        scalars = {k: state[k] for k in SCALAR_FIELDS if state.get(k) is not None}
+        scalars.update({"version": 1, "updated_at": time.time()})
+        manifest = state.get("handover_manifest") or {}
+        feedback = state.get("feedback_chain") or []
+
+        pipe = self.client.pipeline()
+        pipe.delete(base, manifest_key, deltas_key, feedback_key)
+        pipe.hset(base, mapping=scalars)
+        if manifest:
+            pipe.hset(manifest_key, mapping=manifest)
+            pipe.rpush(deltas_key, _compact({"v": 1, "set": manifest, "unset": []}))
+        if feedback:
+            pipe.rpush(feedback_key, *[_compact(item) for item in feedback])
+        self._expire(pipe, trace_id)
+        pipe.execute()
+
+    def update(self, trace_id, changes=None, manifest=None, feedback=None, expect=None):
+        """Apply scalar changes, a manifest patch and new feedback items in one transaction.
+
+        `expect` is a compare-and-set guard, e.g. {"status": "BUILDING", "loop_count": 2}.
+        Returns the new version, or None when the guard no longer holds. Fields must be
+        schema scalars of the right type; `status` and `loop_count` are rejected here,
+        change them with transition().
+        """
+        changes = dict(changes or {})
+        protected = sorted(TRANSITION_FIELDS & changes.keys())
+        if protected:
+            raise ValueError(f"{', '.join(protected)} can only change through transition()")
+        unknown = sorted(changes.keys() - SCALAR_FIELDS.keys())
+        if unknown:
+            raise ValueError(f"Unknown Flight Recorder field(s): {', '.join(unknown)}")
+        for key, value in changes.items():
+            kind = SCALAR_FIELDS[key]
+            # load() casts every field back with its type: anything else could not be read back
+            if isinstance(value, bool) or not isinstance(value, (int, float) if kind is float else kind):
+                raise ValueError(f"{key} must be {kind.__name__}, got {type(value).__name__}")
+        return self._write(trace_id, changes, manifest, feedback, expect)
+
+    def _write(self, trace_id, changes, manifest=None, feedback=None, expect=None):
+        base, manifest_key, deltas_key, feedback_key = self.keys(trace_id)
+
+        for _ in range(CAS_RETRIES):
+            with self.client.pipeline() as pipe:
+                try:
+                    # Every write bumps `version` on the base hash, so watching it covers all keys
+                    pipe.watch(base)
+                    current = pipe.hgetall(base)
+                    if not current:
+                        raise KeyError(f"Unknown trace_id: {trace_id}")
+                    if expect and any(str(current.get(k)) != str(v) for k, v in expect.items()):
+                        pipe.unwatch()
+                        return None
+
+                    if "status" in changes and changes["status"] != current.get("status"):
+                        self._check_transition(current, changes)
+                    delta = manifest_delta(pipe.hgetall(manifest_key), manifest) if manifest else None
+                    version = int(current.get("version", 0)) + 1
+
+                    pipe.multi()
+                    pipe.hset(base, mapping={**changes, "version": version, "updated_at": time.time()})
+                    if delta and (delta["set"] or delta["unset"]):
+                        if delta["set"]:
+                            pipe.hset(manifest_key, mapping=delta["set"])
+                        if delta["unset"]:
+                            pipe.hdel(manifest_key, *delta["unset"])
+                        pipe.rpush(deltas_key, _compact({"v": version, **delta}))
+                    if feedback:
+                        pipe.rpush(feedback_key, *[_compact(item) for item in feedback])
+                    self._expire(pipe, trace_id)
+                    pipe.execute()
+                    return version
+                except redis_pool.WatchError: # redis.exceptions.WatchError once redis-py is loaded
+                    continue # Another agent wrote first; re-read and retry
+        raise RuntimeError(f"Flight Recorder CAS for {trace_id} failed after {CAS_RETRIES} retries")
+
+    @staticmethod
+    def _check_transition(current, changes):
+        source, target = current.get("status"), changes["status"]
+        if target not in TRANSITIONS.get(source, ()):
+            raise ValueError(f"Illegal status transition {source} -> {target}")
+        if target == "NEEDS_REVISION":
+            # A revision is a loop: count it atomically with the transition
+            loops = int(current.get("loop_count", 0)) + 1
+            if loops > MAX_LOOPS:
+                raise ValueError(f"Loop limit ({MAX_LOOPS}) reached for {current.get('trace_id')}: human intervention required")
+            changes["loop_count"] = loops
+
+    def transition(self, trace_id, expected_status, new_status, manifest=None, feedback=None):
+        """CAS status change; False when another agent moved the trace first."""
+        return self._write(trace_id, {"status": new_status}, manifest, feedback, expect={"status": expected_status}) is not None
+
+    def append_feedback(self, trace_id, *items):
+        return self.update(trace_id, feedback=list(items))
+
+    # --- Reads ---
+
+    def load(self, trace_id):
+        """Reassemble the full schema object in a single pipelined round trip."""
+        base, manifest_key, _, feedback_key = self.keys(trace_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(base)
+        pipe.hgetall(manifest_key)
+        pipe.lrange(feedback_key, 0, -1)
+        scalars, manifest, feedback = pipe.execute()
+        if not scalars:
+            return None
+
+        state = {k: cast(scalars[k]) for k, cast in SCALAR_FIELDS.items() if k in scalars}
+        state["handover_manifest"] = manifest
+        state["feedback_chain"] = [json.loads(item) for item in feedback]
+        return state
+
+    def manifest_history(self, trace_id):
+        """Replay manifest deltas into (version, manifest) snapshots, oldest first."""
+        _, _, deltas_key, _ = self.keys(trace_id)
+        snapshots = []
+        manifest = {}
+        for raw in self.client.lrange(deltas_key, 0, -1):
+            delta = json.loads(raw)
+            manifest = {k: v for k, v in manifest.items() if k not in delta["unset"]}
+            manifest.update(delta["set"])
+            snapshots.append((delta["v"], dict(manifest)))
+        return snapshots
@@ -0,0 +1,303 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+import importlib.util
+
+# Antigravity Flight Recorder Validator (Rule 05)
+# Compiles Flight_Recorder_Schema.json once into specialized Python (precomputed enum
+# and required-key sets, no schema walking at runtime) and caches the generated module.
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_CANDIDATES = [
+    os.getenv("ANTIGRAVITY_FR_SCHEMA", ""),
+    os.path.join(_HERE, "..", "Flight_Recorder_Schema.json"), # Source: templates/, Installed: .agent/
+    os.path.join(_HERE, "..", "docs", "Flight_Recorder_Schema.json"),
+]
+CACHE_DIR = os.path.expanduser(os.getenv("ANTIGRAVITY_VALIDATOR_CACHE", "~/.antigravity/validators"))
+
+ANNOTATIONS = {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+KEYWORDS = ANNOTATIONS | {"type", "enum", "required", "properties", "items"}
+
+# Draft-07 semantics: bools are not numbers, and 1.0 is an integer
+TYPE_CHECKS = {
+    "object": "type({v}) is dict",
+    "array": "type({v}) is list",
+    "string": "type({v}) is str",
+    "integer": "(type({v}) is int or (type({v}) is float and {v}.is_integer()))",
+    "number": "type({v}) in (int, float)",
+    "boolean": "type({v}) is bool",
+    "null": "{v} is None",
+}
+
+_VALIDATORS = {} # schema sha256 -> compiled validate()
+
+def find_schema():
+    path = next((p for p in SCHEMA_CANDIDATES if p and os.path.isfile(p)), None)
+    if not path:
+        raise FileNotFoundError("Flight_Recorder_Schema.json not found (set ANTIGRAVITY_FR_SCHEMA)")
+    return os.path.abspath(path)
+
+def _types(schema):
+    declared = schema.get("type")
+    return [declared] if isinstance(declared, str) else list(declared or [])
+
+def _check_keywords(schema, path):
+    unsupported = set(schema) - KEYWORDS
+    if unsupported:
+        # Refuse rather than silently accept documents the schema would reject
+        raise ValueError(f"Unsupported schema keyword(s) at {path}: {sorted(unsupported)}")
+    unknown = set(_types(schema)) - set(TYPE_CHECKS)
+    if unknown:
+        raise ValueError(f"Unsupported type(s) at {path}: {sorted(unknown)}")
+
+# --- Code generation ---
+
+class _CodeGen:
+    def __init__(self):
+        self.consts = []
+        self.counter = 0
+
+    def const(self, source):
+        name = f"_C{len(self.consts)}"
+        self.consts.append(f"{name} = {source}")
+        return name
+
+    def var(self, prefix="v"):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    @staticmethod
+    def indent(lines):
+        return ["    " + line for line in lines]
+
+    @staticmethod
+    def path_expr(parts, suffix):
+        """Error-path expression: literal segments are folded, loop indexes stay dynamic."""
+        chunks = []
+        for part in list(parts) + [suffix]:
+            if isinstance(part, str) and chunks and isinstance(chunks[-1], str):
+                chunks[-1] += part
+            else:
+                chunks.append(part)
+        return " + ".join(repr(c) if isinstance(c, str) else f"str({c[0]})" for c in chunks)
+
+    def node(self, schema, v, path, where):
+        """Lines validating local `v` against `schema`. `path` is a list of literal segments
+        and (index_var,) tuples, only turned into strings when an error is reported."""
+        _check_keywords(schema, where)
+        types = _types(schema)
+        body = []
+
+        if "enum" in schema:
+            values = schema["enum"]
+            if types == ["string"] and all(isinstance(x, str) for x in values):
+                # Hash lookup is only safe once the type guard has ruled out unhashable values
+                allowed = self.const(f"frozenset({tuple(sorted(values))!r})")
+            else:
+                allowed = self.const(repr(tuple(values)))
+            body += [
+                f"if {v} not in {allowed}:",
+                f"    errors.append({self.path_expr(path, ': not one of ' + ', '.join(map(str, values)))})",
+            ]
+
+        object_lines = []
+        if schema.get("required"):
+            required = self.const(f"frozenset({tuple(schema['required'])!r})")
+            ordered = self.const(repr(tuple(schema["required"])))
+            object_lines += [
+                f"if not {v}.keys() >= {required}:",
+                f"    errors.extend({self.path_expr(path, ': missing required property ')} + repr(k) for k in {ordered} if k not in {v})",
+            ]
+        for key, sub in (schema.get("properties") or {}).items():
+            child = self.var()
+            sub_lines = self.node(sub, child, path + ["." + key], f"{where}.{key}")
+            if sub_lines: # Annotation-only properties cost nothing at runtime
+                object_lines += [f"{child} = {v}.get({key!r}, _MISSING)", f"if {child} is not _MISSING:"]
+                object_lines += self.indent(sub_lines)
+        if object_lines:
+            body += object_lines if types == ["object"] else [f"if type({v}) is dict:"] + self.indent(object_lines)
+
+        if "items" in schema:
+            index, item = self.var("i"), self.var()
+            item_lines = self.node(schema["items"], item, path + ["[", (index,), "]"], f"{where}[]")
+            if item_lines:
+                loop = [f"for {index}, {item} in enumerate({v}):"] + self.indent(item_lines)
+                body += loop if types == ["array"] else [f"if type({v}) is list:"] + self.indent(loop)
+
+        if not types:
+            return body
+        check = " or ".join(TYPE_CHECKS[t].format(v=v) for t in types)
+        lines = [f"if not ({check}):", f"    errors.append({self.path_expr(path, ': expected ' + ' or '.join(types))})"]
+        if body:
+            lines += ["else:"] + self.indent(body)
+        return lines
+
+def generate_source(schema, schema_sha256="", origin="Flight_Recorder_Schema.json"):
+    """Python source for a module exposing `validate(obj) -> [error, ...]`."""
+    gen = _CodeGen()
+    body = gen.node(schema, "obj", ["$"], "$")
+    lines = [
+        f"# Generated by flight_recorder_validator.py from {origin}. Do not edit.",
+        f"SCHEMA_SHA256 = {schema_sha256!r}",
+        "_MISSING = object()",
+        *gen.consts,
+        "",
+        "def validate(obj):",
+        "    errors = []",
+        *gen.indent(body),
+        "    return errors",
+        "",
+    ]
+    return "\n".join(lines)
+
+def compile_validator(schema, schema_sha256=""):
+    """Compile in memory (no cache): returns `validate`."""
+    namespace = {}
+    exec(compile(generate_source(schema, schema_sha256), "<flight_recorder_validator>", "exec"), namespace)
+    return namespace["validate"]
+
+def load_validator(schema_path=None, cache_dir=CACHE_DIR):
+    """Compiled validator for the schema, generated on first use and cached by schema hash.
+
+    The generated module is imported from `cache_dir`, so later processes also reuse
+    its bytecode from __pycache__ instead of regenerating.
+    """
+    schema_path = schema_path or find_schema()
+    with open(schema_path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest in _VALIDATORS:
+        return _VALIDATORS[digest]
+
+    schema = json.loads(raw)
+    module_path = os.path.join(cache_dir, f"fr_validator_{digest[:16]}.py") if cache_dir else None
+    validate = None
+    try:
+        if module_path and not os.path.exists(module_path):
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{module_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(generate_source(schema, digest, os.path.basename(schema_path)))
+            os.replace(tmp_path, module_path)
+    except OSError as e:
+        print(f"[WARN] Validator cache unavailable ({e}). Compiling in memory.")
+        module_path = None
+    if module_path:
+        try:
+            spec = importlib.util.spec_from_file_location(f"fr_validator_{digest[:16]}", module_path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            if getattr(module, "SCHEMA_SHA256", None) != digest:
+                raise ValueError("schema hash mismatch")
+            validate = module.validate
+        except Exception as e:
+            # Corrupt or foreign cache file: drop it so the next process regenerates it
+            print(f"[WARN] Discarding cached validator {module_path} ({e}). Compiling in memory.")
+            try:
+                os.remove(module_path)
+            except OSError:
+                pass
+    if validate is None:
+        validate = compile_validator(schema, digest)
+    _VALIDATORS[digest] = validate
+    return validate
+
+def validate(obj):
+    """Errors for one state object against the installed schema ([] when valid)."""
+    return load_validator()(obj)
+
+def validate_many(lines, validator=None):
+    """Validate an NDJSON stream (file object or iterable of lines).
+
+    Returns (checked, failures) where failures is [(line_number, errors), ...].
+    """
+    validator = validator or load_validator()
+    loads = json.loads
+    checked = 0
+    failures = []
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        checked += 1
+        try:
+            obj = loads(line)
+        except ValueError as e:
+            failures.append((line_number, [f"$: invalid JSON ({e})"]))
+            continue
+        errors = validator(obj)
+        if errors:
+            failures.append((line_number, errors))
+    return checked, failures
+
+# --- Reference interpreter (benchmark baseline and differential oracle) ---
+
+def _is_type(value, name):
+    if name == "integer":
+        return type(value) is int or (type(value) is float and value.is_integer())
+    if name == "number":
+        return type(value) in (int, float)
+    return {"object": dict, "array": list, "string": str, "boolean": bool, "null": type(None)}[name] is type(value)
+
+def validate_reference(schema, obj, path="$"):
+    """Walks the schema at runtime for every document; same error messages as the compiled code."""
+    errors = []
+    types = _types(schema)
+    if types and not any(_is_type(obj, t) for t in types):
+        return [f"{path}: expected {' or '.join(types)}"]
+    if "enum" in schema and obj not in schema["enum"]:
+        errors.append(f"{path}: not one of {', '.join(map(str, schema['enum']))}")
+    if isinstance(obj, dict):
+        for key in schema.get("required", []):
+            if key not in obj:
+                errors.append(f"{path}: missing required property {key!r}")
+        for key, sub in (schema.get("properties") or {}).items():
+            if key in obj:
+                errors.extend(validate_reference(sub, obj[key], f"{path}.{key}"))
+    if isinstance(obj, list) and "items" in schema:
+        for index, item in enumerate(obj):
+            errors.extend(validate_reference(schema["items"], item, f"{path}[{index}]"))
+    return errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Antigravity Flight Recorder Validator")
+    parser.add_argument("files", nargs="*", help="JSON state files or NDJSON streams (default: NDJSON on stdin)")
+    parser.add_argument("--schema", help="Schema path (default: installed Flight_Recorder_Schema.json)")
+    parser.add_argument("--build", action="store_true", help="Generate and cache the compiled validator, then exit")
+    parser.add_argument("--emit", action="store_true", help="Print the generated validator source, then exit")
+    args = parser.parse_args()
+
+    schema_path = args.schema or find_schema()
+    if args.emit:
+        with open(schema_path, "rb") as f:
+            raw = f.read()
+        print(generate_source(json.loads(raw), hashlib.sha256(raw).hexdigest(), os.path.basename(schema_path)))
+        sys.exit(0)
+
+    validator = load_validator(schema_path)
+    if args.build:
+        print(f"[INFO] Compiled validator cached in {CACHE_DIR}")
+        sys.exit(0)
+
+    total, failed = 0, 0
+    for name in args.files or ["-"]:
+        if name == "-":
+            checked, failures = validate_many(sys.stdin, validator)
+        else:
+            with open(name, "r") as f:
+                text = f.read()
+            try:
+                obj = json.loads(text) # A single (possibly pretty-printed) state object
+            except ValueError:
+                checked, failures = validate_many(text.splitlines(), validator)
+            else:
+                errors = validator(obj)
+                checked, failures = 1, ([(1, errors)] if errors else [])
+        total += checked
+        failed += len(failures)
+        for line_number, errors in failures:
+            print(f"[FAIL] {name}:{line_number}: {'; '.join(errors)}")
+
+    print(f"[INFO] Validated {total} state object(s): {total - failed} valid, {failed} invalid.")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import contextlib
+
+try:
+    import fcntl
+except ImportError: # Non-POSIX: single O_APPEND writes remain atomic on local disks
+    fcntl = None
+
+# Antigravity Friction Log (Rule 07)
+# Append-only NDJSON store: one record per line, written with a single O_APPEND write under
+# an advisory lock, so any number of agents can log concurrently without interleaving.
+# docs/SDLC_Friction_Log.md is a derived view, re-rendered from the store on demand.
+
+STORE_PATH = os.getenv("ANTIGRAVITY_FRICTION_LOG", "docs/SDLC_Friction_Log.ndjson")
+VIEW_PATH = os.getenv("ANTIGRAVITY_FRICTION_VIEW", "docs/SDLC_Friction_Log.md")
+FIELDS = ("date", "trace_id", "loop_count", "error", "cause")
+RENDERED_MARKER = "It is rendered from `" # Identifies a derived view, which must never be re-imported
+
+VIEW_HEADER = (
+    "# SDLC Friction Log (Rule 07)\n\n"
+    "This file tracks automated failures and friction points to drive the evolution of the Antigravity OS.\n"
+    "It is rendered from `{store}`; log new entries with `friction_log.py append`.\n\n"
+    "| Date | Trace ID | Loop Count | Error Summary | Root Cause |\n"
+    "| :--- | :--- | :--- | :--- | :--- |\n"
+)
+
+def make_record(trace_id, loop_count, error, cause, date=None, **extra):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    record = {
+        "ts": now.isoformat().replace("+00:00", "Z"),
+        "date": date or now.strftime("%Y-%m-%d"),
+        "trace_id": str(trace_id),
+        "loop_count": int(loop_count),
+        "error": str(error),
+        "cause": str(cause),
+    }
+    record.update({k: v for k, v in extra.items() if v is not None})
+    return record
+
+@contextlib.contextmanager
+def _locked(path, create=True):
+    """Open `path` for appending and hold its advisory lock.
+
+    Re-opens when the file was rotated (renamed away) between open() and flock(), so a
+    writer never appends to a store that archival has already claimed.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    flags = os.O_WRONLY | os.O_APPEND | (os.O_CREAT if create else 0)
+    while True:
+        fd = os.open(path, flags, 0o644)
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            current = os.stat(path)
+        except FileNotFoundError:
+            current = None
+        if current is not None and os.path.samestat(current, os.fstat(fd)):
+            break
+        os.close(fd) # Rotated underneath us; the lock is released with the descriptor
+    try:
+        yield fd
+    finally:
+        os.close(fd)
+
+def append_many(records, path=STORE_PATH):
+    """Append records as NDJSON in one write() call. Returns the number written."""
+    if not records:
+        return 0
+    data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+    with _locked(path) as fd:
+        written = os.write(fd, data)
+        while written < len(data): # Only on exotic filesystems; the lock keeps it contiguous
+            written += os.write(fd, data[written:])
+    return len(records)
+
+def append(trace_id, loop_count, error, cause, path=STORE_PATH, **extra):
+    record = make_record(trace_id, loop_count, error, cause, **extra)
+    append_many([record], path)
+    return record
+
+def read(path=STORE_PATH, offset=0):
+    """(records, next_offset) from byte `offset`.
+
+    A trailing line without its newline is a write still in flight (or a torn write); it is
+    left for the next call rather than parsed.
+    """
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0
+    end = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            print(f"[WARN] Skipping malformed friction record at byte {offset}: {line[:80]!r}", file=sys.stderr)
+    return records, offset + end
+
+def claim(path=STORE_PATH):
+    """Atomically move the store aside for archival. Returns the claimed path, or None if empty.
+
+    New appends start a fresh store immediately; the claimed file is only ever read.
+    """
+    if not os.path.exists(path):
+        return None
+    claimed = f"{path}.archiving-{os.getpid()}-{int(time.time())}"
+    try:
+        with _locked(path, create=False):
+            if os.path.getsize(path) == 0:
+                return None
+            os.rename(path, claimed)
+    except FileNotFoundError: # Claimed by a concurrent archiver
+        return None
+    return claimed
+
+def release(claimed, path=STORE_PATH, archived=True):
+    """Finish a claim: delete it once archived, otherwise put its records back in the store."""
+    if not archived:
+        records, _ = read(claimed)
+        append_many(records, path)
+    os.remove(claimed)
+
+def _cell(value):
+    return str(value).replace("\n", " ").replace("|", "\\|").strip()
+
+def render(path=STORE_PATH, view_path=VIEW_PATH):
+    """Re-render the markdown view (written to a temp file, then atomically replaced)."""
+    records, _ = read(path)
+    rows = [f"| {' | '.join(_cell(r.get(f, '')) for f in FIELDS)} |\n" for r in records]
+    tmp = f"{view_path}.tmp-{os.getpid()}"
+    os.makedirs(os.path.dirname(os.path.abspath(view_path)), exist_ok=True)
+    with open(tmp, "w") as f:
+        f.write(VIEW_HEADER.format(store=os.path.basename(path)))
+        f.writelines(rows)
+    os.replace(tmp, view_path)
+    return len(rows)
+
+def import_markdown(view_path=VIEW_PATH, path=STORE_PATH):
+    """One-time migration of hand-written table rows into the store (header/placeholder rows skipped)."""
+    try:
+        with open(view_path, "r") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return 0
+    if any(RENDERED_MARKER in line for line in lines[:6]):
+        return 0
+    records = []
+    for line in lines:
+        parts = [p.strip() for p in line.strip().strip("|").split("|")]
+        if len(parts) < 5 or parts[0] in ("Date", "YYYY-MM-DD") or parts[0].startswith(":--"):
+            continue
+        try:
+            loop_count = int(parts[2])
+        except ValueError:
+            loop_count = 0
+        records.append(make_record(parts[1], loop_count, parts[3], parts[4], date=parts[0], source="markdown"))
+    return append_many(records, path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Antigravity Friction Log (Rule 07)")
+    parser.add_argument("--store", default=STORE_PATH, help="NDJSON store path")
+    parser.add_argument("--view", default=VIEW_PATH, help="Rendered markdown path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("append", help="Log one friction event")
+    add.add_argument("--trace-id", required=True)
+    add.add_argument("--loop-count", type=int, required=True)
+    add.add_argument("--error", required=True, help="Error summary")
+    add.add_argument("--cause", required=True, help="Root cause")
+    add.add_argument("--agent", help="Reporting agent / persona")
+    add.add_argument("--render", action="store_true", help="Re-render the markdown view afterwards")
+
+    sub.add_parser("render", help="Re-render the markdown view from the store")
+    sub.add_parser("import-markdown", help="Migrate existing markdown rows into the store")
+    args = parser.parse_args()
+
+    if args.command == "append":
+        record = append(args.trace_id, args.loop_count, args.error, args.cause, path=args.store, agent=args.agent)
+        print(f"[INFO] Friction logged: {record['trace_id']} (loop {record['loop_count']})")
+        if args.render:
+            render(args.store, args.view)
+    elif args.command == "render":
+        print(f"[INFO] Rendered {render(args.store, args.view)} row(s) to {args.view}")
+    else:
+        print(f"[INFO] Imported {import_markdown(args.view, args.store)} row(s) into {args.store}")
@@ -8,14 +8,25 @@ import argparse
 import time
 import random
 import datetime
+import gzip
+import queue
+import tempfile
+import urllib.parse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+from observability import telemetry, profiling
 
 # Antigravity Jira Bridge V3.0 (Enterprise Edition)
 # Connects Flight Recorder to Atlassian Jira (Cloud)
 # Implements Real-Time Telemetry, Deduplication, Smart Assignment, and ADF Reporting
 
-JIRA_BASE_URL = "https://tngshopper.atlassian.net"
+JIRA_BASE_URL = os.getenv("JIRA_BASE_URL", "https://tngshopper.atlassian.net")
 PROJECT_KEY = "TNG"
 MOCK_JIRA_DB = "/tmp/antigravity_jira_state.txt"
+BLOB_PREFIX = "blobs/sha256"
+BLOB_INDEX = os.path.expanduser(os.getenv("ANTIGRAVITY_BLOB_INDEX", "~/.antigravity/gcs_blob_index"))
+BLOB_INDEX_TTL = int(os.getenv("ANTIGRAVITY_BLOB_INDEX_TTL", 86400)) # Re-check the bucket after this (lifecycle rules delete blobs)
 
 def detect_environment():
     """R 2.5 Dynamic Environment Detection"""
@@ -40,7 +51,118 @@ def get_credentials():
     b64_creds = base64.b64encode(creds.encode()).decode("ascii")
     return {"Authorization": f"Basic {b64_creds}", "Content-Type": "application/json"}
 
+# The daemon keeps counters for its lifetime, so it may coalesce in memory when the Brain is down
+BRAIN_FALLBACK = False
+
+def get_redis_client():
+    """The Brain: the shared pooled client, or None when offline (unless BRAIN_FALLBACK)."""
+    with telemetry.span("redis.connect"):
+        client = redis_pool.get_client(fallback=BRAIN_FALLBACK)
+    if client is None:
+        print("[WARN] Brain offline. Recurrence coalescing disabled.")
+    return client
+
+def get_coalescer():
+    """R 2.7 Recurrence Coalescing: Brain-backed counters, or None when the Brain is offline."""
+    from recurrence import RecurrenceCoalescer
+    client = get_redis_client()
+    return RecurrenceCoalescer(client) if client else None
+
+def comment_poster(headers):
+    """Adapter used by the coalescer to post digest comments."""
+    def post(issue_key, body):
+        resp = make_request("POST", f"/rest/api/3/issue/{issue_key}/comment", headers, body)
+        return bool(resp and "id" in resp)
+    return post
+
+def flush_due_recurrences(headers):
+    """Post digests for every issue whose coalescing window has elapsed."""
+    coalescer = get_coalescer()
+    if not coalescer or not headers:
+        return 0
+    flushed = coalescer.flush_due(comment_poster(headers))
+    if flushed:
+        print(f"[INFO] Posted {flushed} recurrence digest(s).")
+    return flushed
+
+# Warm State (daemon mode): pooled transport and lookup caches survive across failures
+_HTTP_POOL = None
+_ACCOUNT_CACHE = {}
+_DUPLICATE_CACHE = {} # (project, fingerprint) -> (issue, expires_at)
+DUPLICATE_CACHE_TTL = float(os.getenv("ANTIGRAVITY_DUPLICATE_CACHE_TTL", "600")) # Issues can be deleted or moved meanwhile
+
+class HttpPool:
+    """R 2.6 Warm Transport: Keep-alive connections to JIRA_BASE_URL, reused across requests."""
+    def __init__(self, base_url, size=4, timeout=15):
+        parts = urllib.parse.urlsplit(base_url)
+        self.secure = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.size = size
+        self.timeout = timeout
+        self.idle = queue.LifoQueue()
+
+    def _connect(self):
+        import http.client # Daemon-only transport; one-shot CLI runs never load it
+        conn_cls = http.client.HTTPSConnection if self.secure else http.client.HTTPConnection
+        return conn_cls(self.host, self.port, timeout=self.timeout)
+
+    def _send(self, conn, method, endpoint, headers, body):
+        conn.request(method, endpoint, body=body, headers=headers)
+        return conn.getresponse().read()
+
+    def request(self, method, endpoint, headers, data=None):
+        from http.client import HTTPException
+        try:
+            conn = self.idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        body = json.dumps(data) if data else None
+
+        try:
+            try:
+                raw = self._send(conn, method, endpoint, headers, body)
+            except (HTTPException, OSError):
+                # Idle keep-alive connection was dropped by the server; reconnect once
+                conn.close()
+                conn = self._connect()
+                raw = self._send(conn, method, endpoint, headers, body)
+        except Exception as e:
+            conn.close()
+            print(f"[ERROR] Pooled Request Failed: {e}")
+            return None
+
+        if self.idle.qsize() < self.size:
+            self.idle.put(conn)
+        else:
+            conn.close()
+
+        if not raw: return None
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except json.JSONDecodeError as e:
+            print(f"[ERROR] Invalid JSON Response: {e}")
+            print(f"[DEBUG] Raw Output: {raw[:500]}")
+            return None
+
+def enable_http_pool(size=4):
+    """Route make_request through a keep-alive pool instead of one curl process per call."""
+    global _HTTP_POOL
+    _HTTP_POOL = HttpPool(JIRA_BASE_URL, size=size)
+    return _HTTP_POOL
+
 def make_request(method, endpoint, headers, data=None):
+    transport = "pool" if _HTTP_POOL is not None else "curl"
+    # Path only: query strings carry emails and JQL
+    with telemetry.span("jira.http", **{"http.request.method": method, "url.path": endpoint.split("?")[0], "transport": transport}):
+        resp = _send_request(method, endpoint, headers, data)
+        telemetry.annotate(response=resp is not None)
+        return resp
+
+def _send_request(method, endpoint, headers, data=None):
+    if _HTTP_POOL is not None:
+        return _HTTP_POOL.request(method, endpoint, headers, data)
+
     # Using CURL to allow for better cert handling on local Mac environs
     url = f"{JIRA_BASE_URL}{endpoint}"
     cmd = ["curl", "-s", "-X", method, url]
@@ -64,11 +186,13 @@ def make_request(method, endpoint, headers, data=None):
 def find_user_by_email(headers, email):
     """R 2.3 Smart Assignment: Find Jira Account ID by Email."""
     if not email or "@" not in email: return None
-    import urllib.parse
+    if email in _ACCOUNT_CACHE:
+        return _ACCOUNT_CACHE[email]
     query = f"/rest/api/3/user/search?query={urllib.parse.quote(email)}"
     resp = make_request("GET", query, headers)
     if resp and len(resp) > 0:
-        return resp[0].get("accountId")
+        _ACCOUNT_CACHE[email] = resp[0].get("accountId")
+        return _ACCOUNT_CACHE[email]
     return None
 
 def diagnose_auth(headers, project_key):
@@ -102,6 +226,7 @@ def diagnose_auth(headers, project_key):
          print("[WARN] Could not check permissions (API error).")
     print("-------------------------")
 
+@telemetry.traced("git.blame")
 def get_git_info(filepath, line_number):
     """R 2.3 Dynamic Ownership: Use git blame to find author email and name."""
     if not filepath or not os.path.exists(filepath): 
@@ -120,14 +245,23 @@ def get_git_info(filepath, line_number):
     except:
         return "git-error", "devops-oncall@tngshopper.com"
 
-def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, status_code="Error"):
-    """R 6.5 Advanced Schema Enforcement: OpenTelemetry-style Flight Recorder."""
+def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, status_code="Error", fingerprint=None):
+    """R 6.5 Advanced Schema Enforcement: OpenTelemetry-style Flight Recorder.
+
+    The root span is the operation in progress (or the process so far); `spans` carries
+    the measured child operations (HTTP, git, Redis, GCS) recorded by telemetry.
+    """
     import uuid
-    
-    # Generate Spans
-    span_id = uuid.uuid4().hex[:16]
-    start_ns = time.time_ns()
-    end_ns = start_ns + 1000000000 # Mock 1s duration
+
+    # Measured Spans
+    root = telemetry.current()
+    if root:
+        span_id, start_ns = root["span_id"], root["start_time_unix_nano"]
+        spans = telemetry.spans(within=span_id)
+    else:
+        span_id, start_ns = uuid.uuid4().hex[:16], telemetry.PROCESS_START_NS
+        spans = [dict(s, parent_span_id=s["parent_span_id"] or span_id) for s in telemetry.spans()]
+    end_ns = time.time_ns()
     
     # Context
     repo = os.getenv("GITHUB_REPOSITORY", "Manzela/Antigravity-OS")
@@ -135,13 +269,14 @@ def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, st
     run_id = os.getenv("GITHUB_RUN_ID", "local-run")
     ref = os.getenv("GITHUB_REF_NAME", "unknown-branch")
 
-    return {
+    payload = {
       "trace_id": trace_id,
       "span_id": span_id,
       "parent_span_id": None, # Root span
       "start_time_unix_nano": start_ns,
       "end_time_unix_nano": end_ns,
       "status": { "code": status_code },
+      "spans": spans,
       "resource": {
         "service.name": "flight-recorder-service",
         "service.version": "3.0.0",
@@ -169,7 +304,7 @@ def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, st
       },
       "logs": [
         { 
-          "timestamp": datetime.datetime.now(datetime.UTC).isoformat().replace("+00:00", "Z"), 
+          "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z"), 
           "body": log_content, 
           "severity": "ERROR",
           "attributes": { "exception.type": "RuntimeError" } 
@@ -177,8 +312,117 @@ def construct_flight_recorder_payload(trace_id, git_hash, log_content, owner, st
       ]
     }
 
+    # Dedup fingerprint, so archived envelopes group exactly like Jira issues (triage_analytics.py)
+    if fingerprint:
+        payload["attributes"]["error.fingerprint"] = fingerprint
+
+    # Profiling artifacts (only when ANTIGRAVITY_PROFILE is set)
+    profile = profiling.snapshot()
+    if profile:
+        payload["profile"] = profile
+    return payload
+
+def split_payload(payload):
+    """R 6.6 Content Addressing: Split a payload into an envelope and gzip'd log blobs keyed by SHA-256.
+
+    Identical log bodies (common for recurrences) map to the same blob, so only the
+    envelope changes between occurrences.
+    """
+    envelope = dict(payload)
+    envelope["logs"] = []
+    blobs = {}
+    for entry in payload.get("logs", []):
+        body = (entry.get("body") or "").encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        if digest not in blobs:
+            blobs[digest] = gzip.compress(body, mtime=0) # mtime=0 keeps the blob bytes deterministic
+        ref = {k: v for k, v in entry.items() if k != "body"}
+        ref.update({"body_ref": f"{BLOB_PREFIX}/{digest}.log.gz", "body_sha256": digest, "body_size": len(body)})
+        envelope["logs"].append(ref)
+    return envelope, blobs
+
+def load_blob_index(bucket_name, now=None):
+    """Digests confirmed present in `bucket_name` within BLOB_INDEX_TTL (local cache of remote existence checks)."""
+    if not os.path.exists(BLOB_INDEX):
+        return set()
+    cutoff = (now or time.time()) - BLOB_INDEX_TTL
+    known = set()
+    with open(BLOB_INDEX, "r") as f:
+        for line in f:
+            parts = line.split()
+            # Entries without a check time predate expiry and are re-verified once
+            if len(parts) == 3 and parts[0] == bucket_name and float(parts[2]) >= cutoff:
+                known.add(parts[1])
+    return known
+
+def record_blob(bucket_name, digest, now=None):
+    """Add a confirmed digest and drop expired entries, so the index stays bounded by BLOB_INDEX_TTL."""
+    now = now or time.time()
+    cutoff = now - BLOB_INDEX_TTL
+    kept = []
+    if os.path.exists(BLOB_INDEX):
+        with open(BLOB_INDEX, "r") as f:
+            for line in f:
+                parts = line.split()
+                try:
+                    if len(parts) == 3 and float(parts[2]) >= cutoff:
+                        kept.append(line)
+                except ValueError:
+                    pass
+    kept.append(f"{bucket_name} {digest} {int(now)}\n")
+    directory = os.path.dirname(BLOB_INDEX)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".blob_index-")
+    with os.fdopen(fd, "w") as f:
+        f.writelines(kept)
+    os.replace(tmp, BLOB_INDEX)
+
+def gsutil_cp(local_path, gcs_path, label, extra_args=()):
+    """Copy with retry logic: 3 attempts with exponential backoff. Returns True on success."""
+    for attempt in range(1, 4):
+        try:
+            print(f"[TRACE] Uploading {label} (Attempt {attempt}/3)...")
+            # Removed stdout/stderr suppression for better debugging
+            with telemetry.span("gcs.cp", attempt=attempt, bytes=os.path.getsize(local_path)):
+                subprocess.check_call(["gsutil", *extra_args, "cp", local_path, gcs_path])
+            return True
+        except subprocess.CalledProcessError as e:
+            if attempt < 3:
+                wait = (2 ** attempt) + (random.randint(0, 1000) / 1000)
+                print(f"[WARN] Upload attempt {attempt} failed. Retrying in {wait:.2f}s...")
+                time.sleep(wait)
+            else:
+                print(f"[ERROR] All GCS upload attempts failed: {e}")
+    return False
+
+def upload_blobs(blobs, bucket_name):
+    """Upload blobs the bucket does not have yet. Returns False if any upload failed."""
+    known = load_blob_index(bucket_name)
+    for digest, data in blobs.items():
+        if digest in known:
+            print(f"[TRACE] Log blob {digest[:12]} already archived (cached). Skipping.")
+            continue
+        gcs_path = f"{bucket_name}/{BLOB_PREFIX}/{digest}.log.gz"
+        with telemetry.span("gcs.stat"):
+            exists = subprocess.call(["gsutil", "-q", "stat", gcs_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
+        if not exists:
+            # Private staging file: concurrent runs (the daemon) and other users cannot collide with it
+            fd, local_path = tempfile.mkstemp(prefix=f"antigravity-{digest[:12]}-", suffix=".log.gz")
+            # Served with decompressive transcoding, so the archive link opens as plain text
+            headers = ("-h", "Content-Type:text/plain", "-h", "Content-Encoding:gzip")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                if not gsutil_cp(local_path, gcs_path, f"Log Blob {digest[:12]} ({len(data)} bytes)", headers):
+                    return False
+            finally:
+                os.remove(local_path)
+        record_blob(bucket_name, digest)
+    return True
+
+@telemetry.traced("gcs.upload")
 def upload_to_gcs(payload, bucket_name, trace_id):
-    """R 6.5 Upload validated JSON payload to GCS with Retries."""
+    """R 6.5 Upload validated JSON payload to GCS with Retries (envelope + content-addressed logs)."""
     if not bucket_name or not trace_id: return None
     
     # 1. Dependency Check
@@ -189,31 +433,27 @@ def upload_to_gcs(payload, bucket_name, trace_id):
         return None
 
     filename = f"trace_{trace_id}.json"
-    local_path = f"/tmp/{filename}"
     gcs_path = f"{bucket_name}/{filename}"
+    clean_bucket = bucket_name.replace("gs://", "")
     
     try:
-        with open(local_path, "w") as f:
-            json.dump(payload, f, indent=2)
-            
-        # Retry Logic: 3 attempts with exponential backoff
-        for attempt in range(1, 4):
-            try:
-                print(f"[TRACE] Uploading Flight Recorder Payload (Attempt {attempt}/3)...")
-                # Removed stdout/stderr suppression for better debugging
-                subprocess.check_call(["gsutil", "cp", local_path, gcs_path])
-                
-                # Construct HTTPS Link
-                clean_bucket = bucket_name.replace("gs://", "")
-                return f"https://storage.cloud.google.com/{clean_bucket}/{filename}"
-            except subprocess.CalledProcessError as e:
-                if attempt < 3:
-                    wait = (2 ** attempt) + (random.randint(0, 1000) / 1000)
-                    print(f"[WARN] Upload attempt {attempt} failed. Retrying in {wait:.2f}s...")
-                    time.sleep(wait)
-                else:
-                    print(f"[ERROR] All GCS upload attempts failed: {e}")
-                    return None
+        envelope, blobs = split_payload(payload)
+        for entry in envelope["logs"]:
+            entry["body_url"] = f"https://storage.cloud.google.com/{clean_bucket}/{entry['body_ref']}"
+        if not upload_blobs(blobs, bucket_name):
+            return None
+
+        fd, local_path = tempfile.mkstemp(prefix="antigravity-trace-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(envelope, f, separators=(",", ":"))
+            uploaded = gsutil_cp(local_path, gcs_path, "Flight Recorder Envelope")
+        finally:
+            os.remove(local_path)
+        if uploaded:
+            # Construct HTTPS Link
+            return f"https://storage.cloud.google.com/{clean_bucket}/{filename}"
+        return None
     except Exception as e:
         print(f"[WARN] GCS Upload logic failed: {e}")
         return None
@@ -280,8 +520,18 @@ def create_rich_description(summary, description, log_content, owner_name, owner
     
     return {"type": "doc", "version": 1, "content": content}
 
-# Helper for deduplication
+# Helpers for deduplication
+def compute_fingerprint(summary, description):
+    """Stable error identity used for the `fp:` label and recurrence grouping."""
+    return hashlib.md5(f"{summary}|{description}".encode()).hexdigest()
+
 def find_duplicate_issue(headers, fingerprint, project_key):
+    # Positive hits are served from memory for DUPLICATE_CACHE_TTL (or until a comment on them fails)
+    cache_key = (project_key, fingerprint)
+    cached = _DUPLICATE_CACHE.get(cache_key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    _DUPLICATE_CACHE.pop(cache_key, None)
     jql = f"project = {project_key} AND labels = \"fp:{fingerprint}\""
     payload = {
         "jql": jql,
@@ -290,11 +540,16 @@ def find_duplicate_issue(headers, fingerprint, project_key):
     }
     resp = make_request("POST", "/rest/api/3/search/jql", headers, payload)
     if resp and "issues" in resp and len(resp["issues"]) > 0:
+        _DUPLICATE_CACHE[cache_key] = (resp["issues"][0], time.monotonic() + DUPLICATE_CACHE_TTL)
         return resp["issues"][0]
     return None
 
-def create_ticket(summary, description, project_id, filepath=None, line=1, log_file=None, gcs_bucket=None):
-    headers = get_credentials()
+def forget_duplicate(project_key, fingerprint):
+    _DUPLICATE_CACHE.pop((project_key, fingerprint), None)
+
+@telemetry.traced("bridge.create_ticket")
+def create_ticket(summary, description, project_id, filepath=None, line=1, log_file=None, gcs_bucket=None, headers=None, occurrences=1):
+    headers = headers or get_credentials()
     
     # Ingestion: Read Logs
     log_content = ""
@@ -310,22 +565,25 @@ def create_ticket(summary, description, project_id, filepath=None, line=1, log_f
         log_content = f"[SYSTEM SNAPSHOT]\nTIME: {time.ctime()}\nENV: {detect_environment()}\nTRACE_ID: {os.getenv('TRACE_ID', 'None')}"
 
     # Traceability
-    owner_name, owner_email = get_git_info(filepath, line)
-    # Get Git Hash
-    try:
-        git_hash = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.PIPE).decode("utf-8").strip()
-    except:
-        git_hash = "unknown"
+    with profiling.phase("traceability"):
+        owner_name, owner_email = get_git_info(filepath, line)
+        # Get Git Hash
+        try:
+            with telemetry.span("git.rev_parse"):
+                git_hash = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.PIPE).decode("utf-8").strip()
+        except:
+            git_hash = "unknown"
 
     trace_id = os.getenv("TRACE_ID", hashlib.md5(f"{summary}{description}".encode()).hexdigest()[:8])
-    error_fingerprint = hashlib.md5(f"{summary}|{description}".encode()).hexdigest()
+    error_fingerprint = compute_fingerprint(summary, description)
     
     # Schema Enforcement & Upload
     gcs_link = None
     if gcs_bucket:
-        payload = construct_flight_recorder_payload(trace_id, git_hash, log_content, owner_email)
-        print(f"[TRACE] Uploading Flight Recorder Payload to {gcs_bucket}...")
-        gcs_link = upload_to_gcs(payload, gcs_bucket, trace_id)
+        with profiling.phase("flight_recorder_upload"):
+            payload = construct_flight_recorder_payload(trace_id, git_hash, log_content, owner_email, fingerprint=error_fingerprint)
+            print(f"[TRACE] Uploading Flight Recorder Payload to {gcs_bucket}...")
+            gcs_link = upload_to_gcs(payload, gcs_bucket, trace_id)
     
     # Mock Fallback
     if not headers:
@@ -337,14 +595,39 @@ def create_ticket(summary, description, project_id, filepath=None, line=1, log_f
     # Deduplication
     print(f"[JIRA] Checking for duplicates in {project_id}...")
     existing = find_duplicate_issue(headers, error_fingerprint, project_id)
+    run_url = f"{os.getenv('GITHUB_SERVER_URL')}/{os.getenv('GITHUB_REPOSITORY')}/actions/runs/{os.getenv('GITHUB_RUN_ID')}"
+    coalescer = get_coalescer()
     if existing:
         key = existing["key"]
+
+        # Coalesce: count in the Brain, comment once per window
+        if coalescer:
+            print(f"[INFO] Duplicate found: {key}. Recording recurrence.")
+            poster = comment_poster(headers)
+
+            def post(issue_key, body):
+                if poster(issue_key, body):
+                    return True
+                if issue_key == key:
+                    # Deleted since it was cached (e.g. by cleanup_jira_spam): search again next time
+                    forget_duplicate(project_id, error_fingerprint)
+                print(f"[WARN] Recurrence digest on {issue_key} failed.")
+                return False
+
+            with telemetry.span("redis.recurrence.record"):
+                due = coalescer.record(error_fingerprint, key, trace_id, run_url, gcs_link, count=occurrences)
+            with telemetry.span("redis.recurrence.flush"):
+                if due and coalescer.flush(error_fingerprint, post):
+                    print(f"[INFO] Posted recurrence digest to {key}.")
+                coalescer.flush_due(post)
+            return key
+
         print(f"[INFO] Duplicate found: {key}. Adding comment.")
-        
-        timestamp_iso = datetime.datetime.now(datetime.UTC).isoformat().replace("+00:00", "Z")
-        run_url = f"{os.getenv('GITHUB_SERVER_URL')}/{os.getenv('GITHUB_REPOSITORY')}/actions/runs/{os.getenv('GITHUB_RUN_ID')}"
+        timestamp_iso = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
         
         header_text = f"[RECURRENCE DETECTED - {timestamp_iso}] Trace: {trace_id} | Run: {run_url}"
+        if occurrences > 1:
+            header_text += f" | Occurrences: {occurrences}"
         
         comment_content = [
             {
@@ -370,13 +653,19 @@ def create_ticket(summary, description, project_id, filepath=None, line=1, log_f
                 "content": comment_content
             }
         }
-        make_request("POST", f"/rest/api/3/issue/{key}/comment", headers, comment_body)
+        resp = make_request("POST", f"/rest/api/3/issue/{key}/comment", headers, comment_body)
+        if not (resp and "id" in resp):
+            # Deleted since it was cached (e.g. by cleanup_jira_spam): search again next time
+            forget_duplicate(project_id, error_fingerprint)
+            print(f"[WARN] Comment on {key} failed: {resp}")
         return key
 
     # Create Issue Payload
     # Smart Assignment
     assignee_id = find_user_by_email(headers, owner_email)
 
+    if occurrences > 1:
+        description = f"{description} (Occurrences: {occurrences})"
     desc_doc = create_rich_description(summary, description, log_content, owner_name, owner_email, error_fingerprint, gcs_link)
     
     payload = {
@@ -398,39 +687,38 @@ def create_ticket(summary, description, project_id, filepath=None, line=1, log_f
     resp = make_request("POST", "/rest/api/3/issue", headers, payload)
     if resp and "key" in resp:
         print(f"[SUCCESS] Created {resp['key']}")
+        if coalescer:
+            with telemetry.span("redis.recurrence.record"):
+                coalescer.record(error_fingerprint, resp['key'], trace_id, run_url, gcs_link, count=occurrences, notify=False)
+            # Every bridge run flushes other issues' elapsed windows; recurrence-digest.yml covers idle periods
+            with telemetry.span("redis.recurrence.flush"):
+                coalescer.flush_due(comment_poster(headers))
         return resp['key']
     else:
+        telemetry.mark_error("issue creation failed")
         print("[FAIL] Could not create ticket.")
         print(f"[DEBUG] API Response: {json.dumps(resp, indent=2)}") 
         sys.exit(1)
 
-def fetch_logs(headers, project_key):
-    """R 2.4 Fetch Capability: Fetch recent issues from project."""
-    if not headers:
-        if os.path.exists(MOCK_JIRA_DB):
-            print("[INFO] Fetching from Local Mock DB...")
-            with open(MOCK_JIRA_DB, "r") as f:
-                print(f.read())
-        return
+def fetch_logs(headers, project_key, fingerprint=None, assignee=None, status=None, limit=5, sync=True):
+    """R 2.4 Fetch Capability: Answer issue queries from the incrementally-synced local mirror."""
+    from jira_mirror import JiraMirror
 
-    print(f"[JIRA] Fetching recent errors from {JIRA_BASE_URL}/projects/{project_key}...")
-    jql = f"project = {project_key} ORDER BY created DESC"
-    
-    payload = {
-        "jql": jql,
-        "maxResults": 5,
-        "fields": ["summary", "status", "assignee", "created"]
-    }
-    
-    # Using POST search
-    resp = make_request("POST", "/rest/api/3/search/jql", headers, payload)
-    if resp and "issues" in resp:
-        for issue in resp["issues"]:
-            key = issue["key"]
-            summary = issue["fields"]["summary"]
-            status = issue["fields"]["status"]["name"]
-            assignee = issue["fields"]["assignee"]["displayName"] if issue["fields"]["assignee"] else "Unassigned"
-            print(f"[{key}] {summary} ({status}) - {assignee}") 
+    mirror = JiraMirror()
+    try:
+        if sync:
+            if not headers:
+                print("[INFO] Fetching from Local Mock DB...")
+                mirror.sync_mock(MOCK_JIRA_DB, project_key)
+            else:
+                print(f"[JIRA] Syncing {JIRA_BASE_URL}/projects/{project_key} into local mirror...")
+                applied = mirror.sync(lambda payload: make_request("POST", "/rest/api/3/search/jql", headers, payload), project_key)
+                print(f"[INFO] Mirror updated ({applied} changed issues).")
+
+        for issue in mirror.query(project_key, fingerprint=fingerprint, assignee=assignee, status=status, limit=limit):
+            print(f"[{issue['key']}] {issue['summary']} ({issue['status']}) - {issue['assignee']}")
+    finally:
+        mirror.close()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -439,14 +727,23 @@ if __name__ == "__main__":
     parser.add_argument("pos_project", nargs="?", help="Project Key (Positional)")
     parser.add_argument("--project", help="Project Key (Named)")
     parser.add_argument("--fetch", action="store_true", help="Fetch ticket logs")
+    parser.add_argument("--fingerprint", help="Filter --fetch by error fingerprint")
+    parser.add_argument("--assignee", help="Filter --fetch by assignee display name")
+    parser.add_argument("--status", help="Filter --fetch by status name")
+    parser.add_argument("--limit", type=int, default=5, help="Max issues returned by --fetch")
+    parser.add_argument("--offline", action="store_true", help="Answer --fetch from the local mirror without syncing")
     parser.add_argument("--file", help="Source file for blame")
     parser.add_argument("--line", type=int, default=1, help="Line number for blame")
     parser.add_argument("--log-file", help="Path to log file for ingestion")
     parser.add_argument("--gcs-bucket", help="Target GCS Bucket for Flight Recorder Payload")
     
     parser.add_argument("--check-auth", action="store_true", help="Run auth diagnostics")
+    parser.add_argument("--flush-recurrences", action="store_true", help="Post recurrence digests whose window has elapsed")
+    parser.add_argument("--recurrences", metavar="FINGERPRINT", help="Show recurrence history for a fingerprint")
     
     args = parser.parse_args()
+    profiling.start("jira_bridge")
+    telemetry.init("antigravity-bridge")
     
     # Resolve Project Priority: Named > Positional > Global Default
     target_project = args.project or args.pos_project or PROJECT_KEY
@@ -455,10 +752,22 @@ if __name__ == "__main__":
         diagnose_auth(get_credentials(), target_project)
         sys.exit(0)
 
+    if args.flush_recurrences:
+        flush_due_recurrences(get_credentials())
+        sys.exit(0)
+
+    if args.recurrences:
+        coalescer = get_coalescer()
+        history = coalescer.history(args.recurrences) if coalescer else None
+        print(json.dumps(history, indent=2) if history else "[INFO] No recurrence history (or Brain offline).")
+        sys.exit(0)
+
     if args.fetch:
-        fetch_logs(get_credentials(), target_project)
+        with profiling.phase("fetch"):
+            fetch_logs(get_credentials(), target_project, args.fingerprint, args.assignee, args.status, args.limit, sync=not args.offline)
     else:
         if not args.summary:
              if get_credentials(): print("[INFO] Auth Valid."); sys.exit(0)
              else: sys.exit(1)
-        create_ticket(args.summary, args.description or "No Desc", target_project, args.file, args.line, args.log_file, args.gcs_bucket)
+        with profiling.phase("create_ticket"):
+            create_ticket(args.summary, args.description or "No Desc", target_project, args.file, args.line, args.log_file, args.gcs_bucket)
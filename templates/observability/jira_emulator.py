@@ -0,0 +1,324 @@
+import re
+import json
+import zlib
+import time
+import base64
+import random
+import argparse
+import datetime
+import threading
+import collections
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Antigravity Jira Emulator (R 2.x Test Harness)
+# Local HTTP stand-in for the Jira Cloud REST endpoints the bridge uses, with injectable
+# latency and errors. Point the bridge at it with JIRA_BASE_URL=http://127.0.0.1:<port>.
+
+DEFAULT_PORT = 8089
+PAGE_SIZE_LIMIT = 100
+
+JQL_CLAUSE = re.compile(r'(?P<field>\w+)\s*(?P<op>=|>=)\s*(?:"(?P<quoted>[^"]*)"|(?P<bare>[^\s"]+))')
+
+def jira_timestamp(ts):
+    """Jira's `updated`/`created` format: 2026-10-18T12:34:56.789+0000."""
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "+0000"
+
+def parse_jql(jql):
+    """The subset the bridge and mirror send: `project =`, `labels =`, `updated >=`, ORDER BY updated."""
+    where, _, order = jql.partition(" ORDER BY ")
+    filters = {}
+    for clause in re.split(r"\s+AND\s+", where.strip(), flags=re.IGNORECASE):
+        match = JQL_CLAUSE.fullmatch(clause.strip())
+        if not match:
+            raise ValueError(f"Unsupported JQL clause: {clause!r}")
+        filters[(match.group("field").lower(), match.group("op"))] = match.group("quoted") if match.group("quoted") is not None else match.group("bare")
+    return filters, order.strip().lower().endswith("desc")
+
+class JiraState:
+    """Issues, comments and users held in memory, plus per-endpoint call counters."""
+
+    def __init__(self, project="TNG", users=None):
+        self.lock = threading.Lock()
+        self.project = project
+        self.users = users or {}
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.issues = collections.OrderedDict()
+            self.comments = collections.defaultdict(list)
+            self.sequence = 0
+            self.calls = collections.Counter()
+            self.injected = collections.Counter()
+
+    def account(self, email):
+        """Known users, plus any address on the project's own domain (auto-provisioned)."""
+        with self.lock:
+            if email not in self.users and email.endswith("@tngshopper.com"):
+                name = email.split("@")[0]
+                self.users[email] = {"accountId": f"acct-{zlib.crc32(email.encode()):08x}", "emailAddress": email, "displayName": name, "active": True}
+            return self.users.get(email)
+
+    def create_issue(self, fields):
+        with self.lock:
+            self.sequence += 1
+            project = (fields.get("project") or {}).get("key", self.project)
+            key = f"{project}-{self.sequence}"
+            now = jira_timestamp(time.time())
+            assignee = fields.get("assignee")
+            issue = {
+                "id": str(10000 + self.sequence),
+                "key": key,
+                "fields": {
+                    "project": {"key": project},
+                    "summary": fields.get("summary"),
+                    "labels": list(fields.get("labels") or []),
+                    "status": {"name": "Open"},
+                    "assignee": self._assignee(assignee["id"]) if assignee else None,
+                    "created": now,
+                    "updated": now,
+                },
+            }
+            self.issues[key] = issue
+            return {"id": issue["id"], "key": key, "self": f"/rest/api/3/issue/{issue['id']}"}
+
+    def _assignee(self, account_id):
+        for user in self.users.values():
+            if user["accountId"] == account_id:
+                return {"accountId": account_id, "displayName": user["displayName"]}
+        return {"accountId": account_id, "displayName": account_id}
+
+    def add_comment(self, key, body):
+        with self.lock:
+            issue = self.issues.get(key)
+            if issue is None:
+                return None
+            comment_id = str(len(self.comments[key]) + 1)
+            self.comments[key].append({"id": comment_id, "body": body})
+            issue["fields"]["updated"] = jira_timestamp(time.time())
+            self.issues.move_to_end(key) # Keeps ORDER BY updated ASC a plain iteration
+            return {"id": comment_id}
+
+    def search(self, body):
+        filters, descending = parse_jql(body.get("jql", ""))
+        limit = min(int(body.get("maxResults", 50)), PAGE_SIZE_LIMIT)
+        offset = int(body.get("nextPageToken") or 0)
+        fields = body.get("fields")
+        with self.lock:
+            matches = [issue for issue in self.issues.values() if self._matches(issue, filters)]
+        if descending:
+            matches.reverse()
+        page = matches[offset:offset + limit]
+        resp = {
+            "issues": [self._project_fields(issue, fields) for issue in page],
+            "isLast": offset + limit >= len(matches),
+        }
+        if not resp["isLast"]:
+            resp["nextPageToken"] = str(offset + limit)
+        return resp
+
+    def _matches(self, issue, filters):
+        fields = issue["fields"]
+        for (field, op), value in filters.items():
+            if field == "project" and fields["project"]["key"] != value:
+                return False
+            if field == "labels" and value not in fields["labels"]:
+                return False
+            if field == "updated" and op == ">=" and fields["updated"][:16].replace("T", " ") < value:
+                return False
+            if field not in ("project", "labels", "updated"):
+                raise ValueError(f"Unsupported JQL field: {field}")
+        return True
+
+    @staticmethod
+    def _project_fields(issue, fields):
+        if not fields:
+            return issue
+        return {"id": issue["id"], "key": issue["key"], "fields": {f: issue["fields"].get(f) for f in fields}}
+
+    def stats(self):
+        with self.lock:
+            return {
+                "issues": len(self.issues),
+                "comments": sum(len(c) for c in self.comments.values()),
+                "calls": dict(self.calls),
+                "total_calls": sum(self.calls.values()),
+                "injected_errors": dict(self.injected),
+            }
+
+class EmulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, so the bridge's HttpPool reuses connections
+
+    ROUTES = [
+        ("POST", re.compile(r"^/rest/api/3/search/jql$"), "search"),
+        ("POST", re.compile(r"^/rest/api/3/issue$"), "create_issue"),
+        ("POST", re.compile(r"^/rest/api/3/issue/(?P<key>[^/]+)/comment$"), "comment"),
+        ("GET", re.compile(r"^/rest/api/3/user/search$"), "user_search"),
+        ("GET", re.compile(r"^/rest/api/3/myself$"), "myself"),
+        ("GET", re.compile(r"^/rest/api/3/user/permission/search$"), "permission_search"),
+        ("GET", re.compile(r"^/_emulator/stats$"), "emulator_stats"),
+        ("POST", re.compile(r"^/_emulator/reset$"), "emulator_reset"),
+    ]
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        parsed = urllib.parse.urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        for route_method, pattern, name in self.ROUTES:
+            match = pattern.match(parsed.path)
+            if match and route_method == method:
+                break
+        else:
+            return self._send(404, {"errorMessages": [f"No route for {method} {parsed.path}"]})
+
+        state = self.server.state
+        email = None
+        if not name.startswith("emulator_"): # Control endpoints are neither counted nor faulted
+            with state.lock:
+                state.calls[name] += 1
+            email = self._authenticated_email()
+            if email is None:
+                return self._send(401, {"errorMessages": ["Authentication required"]})
+            if self._inject(name):
+                return
+
+        try:
+            body = json.loads(raw) if raw else {}
+            status, payload = getattr(self, f"_{name}")(state, match, urllib.parse.parse_qs(parsed.query), body, email)
+        except ValueError as e:
+            status, payload = 400, {"errorMessages": [str(e)]}
+        self._send(status, payload)
+
+    def _authenticated_email(self):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Basic "):
+            return None
+        try:
+            email, _, token = base64.b64decode(header[6:]).decode().partition(":")
+        except ValueError:
+            return None
+        return email if email and token else None
+
+    def _inject(self, name):
+        """Configured latency, then (maybe) an injected 429/500/503."""
+        server = self.server
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if server.error_rate and random.random() < server.error_rate:
+            status = random.choice(server.error_codes)
+            with server.state.lock:
+                server.state.injected[str(status)] += 1
+            headers = {"Retry-After": "1"} if status == 429 else {}
+            self._send(status, {"errorMessages": [f"Injected failure ({status}) on {name}"], "errors": {}}, headers)
+            return True
+        return False
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    # --- Endpoints ---
+
+    def _search(self, state, match, query, body, email):
+        return 200, state.search(body)
+
+    def _create_issue(self, state, match, query, body, email):
+        fields = body.get("fields") or {}
+        if not fields.get("summary"):
+            return 400, {"errorMessages": [], "errors": {"summary": "You must specify a summary of the issue."}}
+        return 201, state.create_issue(fields)
+
+    def _comment(self, state, match, query, body, email):
+        created = state.add_comment(match.group("key"), body.get("body"))
+        return (201, created) if created else (404, {"errorMessages": ["Issue does not exist or you do not have permission to see it."]})
+
+    def _user_search(self, state, match, query, body, email):
+        user = state.account(query.get("query", [""])[0])
+        return 200, [user] if user else []
+
+    def _myself(self, state, match, query, body, email):
+        return 200, state.account(email) or {"accountId": "acct-external", "emailAddress": email, "displayName": email, "active": True}
+
+    def _permission_search(self, state, match, query, body, email):
+        permissions = query.get("permissions", [""])[0].split(",")
+        allowed = query.get("projectKey", [""])[0] == state.project
+        return 200, {"permissions": {p: {"key": p, "havePermission": allowed} for p in permissions if p}}
+
+    def _emulator_stats(self, state, match, query, body, email):
+        return 200, state.stats()
+
+    def _emulator_reset(self, state, match, query, body, email):
+        state.reset()
+        return 200, {"status": "reset"}
+
+class JiraEmulator(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, latency_ms=0, jitter_ms=0, error_rate=0.0, error_codes=(500, 503), project="TNG", verbose=False):
+        super().__init__((host, port), EmulatorHandler)
+        self.state = JiraState(project)
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.error_codes = list(error_codes)
+        self.verbose = verbose
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve on a background thread (for tests and the load driver)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="jira-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Jira Cloud emulator for the Antigravity bridge")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fixed delay added to every API call")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform random delay on top of --latency-ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API calls answered with an injected error")
+    parser.add_argument("--error-codes", default="500,503", help="Comma-separated statuses to inject (e.g. 429,500,503)")
+    parser.add_argument("--project", default="TNG")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = JiraEmulator(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate,
+                          [int(c) for c in args.error_codes.split(",")], args.project, args.verbose)
+    print(f"[EMULATOR] Jira emulator on {server.base_url} (latency {args.latency_ms}ms, errors {args.error_rate:.0%}).")
+    print(f"[EMULATOR] export JIRA_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"[EMULATOR] Final stats: {json.dumps(server.state.stats())}")
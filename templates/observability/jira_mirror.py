@@ -0,0 +1,208 @@
+import os
+import re
+import json
+import sqlite3
+import datetime
+
+# Antigravity Jira Mirror (R 2.4 Extension)
+# Incrementally-synced local index of Jira issues.
+# Answers --fetch and triage queries (fingerprint / assignee / status) without a network round trip.
+
+MIRROR_PATH = os.path.expanduser(os.getenv("ANTIGRAVITY_JIRA_MIRROR", "~/.antigravity/jira_mirror.db"))
+SYNC_FIELDS = ["summary", "status", "assignee", "created", "updated", "labels"]
+PAGE_SIZE = 100
+SYNC_OVERLAP_MINUTES = 1 # JQL datetimes have minute resolution; re-read the boundary minute
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    key TEXT PRIMARY KEY,
+    project TEXT NOT NULL,
+    summary TEXT,
+    status TEXT,
+    assignee TEXT,
+    fingerprint TEXT,
+    labels TEXT,
+    created TEXT,
+    updated TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_issues_project_created ON issues (project, created);
+CREATE INDEX IF NOT EXISTS idx_issues_fingerprint ON issues (fingerprint);
+CREATE INDEX IF NOT EXISTS idx_issues_assignee ON issues (project, assignee);
+CREATE INDEX IF NOT EXISTS idx_issues_status ON issues (project, status);
+CREATE TABLE IF NOT EXISTS sync_state (
+    project TEXT PRIMARY KEY,
+    last_updated TEXT,
+    mock_offset INTEGER DEFAULT 0
+);
+"""
+
+MOCK_LINE = re.compile(r"^\[(?P<project>[^\]]+)\] (?P<summary>.*) \(Owner: (?P<owner>[^)]*)\) \| FP: (?P<fp>\w+)$")
+
+def extract_fingerprint(labels):
+    """Recover the dedup fingerprint from the `fp:<hash>` label."""
+    for label in labels or []:
+        if label.startswith("fp:"):
+            return label[3:]
+    return None
+
+def jql_since(updated):
+    """Convert a Jira `updated` value into a JQL bound, minus the overlap window.
+
+    Jira returns timestamps in the caller's profile timezone, which is also the
+    timezone JQL literals are interpreted in, so the wall-clock part is used as-is.
+    """
+    wall_clock = datetime.datetime.strptime(updated[:16], "%Y-%m-%dT%H:%M")
+    bound = wall_clock - datetime.timedelta(minutes=SYNC_OVERLAP_MINUTES)
+    return bound.strftime("%Y-%m-%d %H:%M")
+
+class JiraMirror:
+    """Local SQLite store of issues, kept current with `updated >= last_sync` deltas."""
+
+    def __init__(self, path=MIRROR_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _state(self, project):
+        row = self.conn.execute(
+            "SELECT last_updated, mock_offset FROM sync_state WHERE project = ?", (project,)
+        ).fetchone()
+        return row if row else (None, 0)
+
+    def _save_state(self, project, last_updated=None, mock_offset=None):
+        current_updated, current_offset = self._state(project)
+        self.conn.execute(
+            "INSERT INTO sync_state (project, last_updated, mock_offset) VALUES (?, ?, ?) "
+            "ON CONFLICT(project) DO UPDATE SET last_updated = excluded.last_updated, mock_offset = excluded.mock_offset",
+            (
+                project,
+                last_updated if last_updated is not None else current_updated,
+                mock_offset if mock_offset is not None else current_offset,
+            ),
+        )
+
+    def upsert(self, project, issues):
+        """Apply a page of `/search/jql` results. Returns the newest `updated` value seen."""
+        rows = []
+        newest = None
+        for issue in issues:
+            fields = issue.get("fields", {})
+            labels = fields.get("labels") or []
+            assignee = fields.get("assignee")
+            updated = fields.get("updated")
+            rows.append((
+                issue["key"],
+                project,
+                fields.get("summary"),
+                (fields.get("status") or {}).get("name"),
+                assignee["displayName"] if assignee else "Unassigned",
+                extract_fingerprint(labels),
+                json.dumps(labels),
+                fields.get("created"),
+                updated,
+            ))
+            if updated and (newest is None or updated > newest):
+                newest = updated
+        self.conn.executemany(
+            "INSERT INTO issues (key, project, summary, status, assignee, fingerprint, labels, created, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET summary = excluded.summary, status = excluded.status, "
+            "assignee = excluded.assignee, fingerprint = excluded.fingerprint, labels = excluded.labels, "
+            "created = excluded.created, updated = excluded.updated",
+            rows,
+        )
+        return newest
+
+    def sync(self, search, project, full=False):
+        """Page through `/search/jql` and apply changes since the last sync.
+
+        `search` takes a request body and returns the decoded response (or None on failure),
+        so the mirror stays independent of the transport used by the bridge.
+        """
+        last_updated, _ = self._state(project)
+        jql = f"project = {project}"
+        if last_updated and not full:
+            jql += f" AND updated >= \"{jql_since(last_updated)}\""
+        jql += " ORDER BY updated ASC"
+
+        payload = {"jql": jql, "maxResults": PAGE_SIZE, "fields": SYNC_FIELDS}
+        newest = last_updated
+        applied = 0
+        while True:
+            resp = search(payload)
+            if not resp or "issues" not in resp:
+                break
+            page_newest = self.upsert(project, resp["issues"])
+            applied += len(resp["issues"])
+            if page_newest and (newest is None or page_newest > newest):
+                newest = page_newest
+            token = resp.get("nextPageToken")
+            if not token or resp.get("isLast"):
+                break
+            payload["nextPageToken"] = token
+
+        self._save_state(project, last_updated=newest)
+        self.conn.commit()
+        return applied
+
+    def sync_mock(self, mock_db_path, project):
+        """Ingest new lines from the append-only mock ticket log since the last offset."""
+        if not os.path.exists(mock_db_path):
+            return 0
+        _, offset = self._state(project)
+        size = os.path.getsize(mock_db_path)
+        if size < offset:
+            offset = 0 # Log was rotated or truncated
+
+        rows = []
+        with open(mock_db_path, "r") as f:
+            f.seek(offset)
+            for line in iter(f.readline, ""):
+                match = MOCK_LINE.match(line.rstrip("\n"))
+                if not match or match.group("project") != project:
+                    continue
+                now = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "+0000"
+                rows.append({
+                    "key": f"MOCK-{match.group('fp')[:8]}",
+                    "fields": {
+                        "summary": match.group("summary"),
+                        "status": {"name": "Open"},
+                        "assignee": {"displayName": match.group("owner")},
+                        "labels": [f"fp:{match.group('fp')}"],
+                        "created": now,
+                        "updated": now,
+                    },
+                })
+            offset = f.tell()
+
+        self.upsert(project, rows)
+        self._save_state(project, mock_offset=offset)
+        self.conn.commit()
+        return len(rows)
+
+    def query(self, project, fingerprint=None, assignee=None, status=None, limit=5):
+        """Return the newest matching issues as dicts, served from the local index."""
+        clauses = ["project = ?"]
+        params = [project]
+        if fingerprint:
+            clauses.append("fingerprint = ?")
+            params.append(fingerprint)
+        if assignee:
+            clauses.append("assignee = ?")
+            params.append(assignee)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        params.append(limit)
+        cursor = self.conn.execute(
+            f"SELECT key, summary, status, assignee, fingerprint, created FROM issues "
+            f"WHERE {' AND '.join(clauses)} ORDER BY created DESC, rowid DESC LIMIT ?",
+            params,
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
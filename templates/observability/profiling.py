@@ -0,0 +1,269 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import contextlib
+import subprocess
+import collections
+
+# Antigravity Profiling Hooks (Rule 07)
+# Opt-in via ANTIGRAVITY_PROFILE=cprofile,sample,tracemalloc (or "all"). When unset, start()
+# returns immediately and phase() hands back a shared null context: nothing is patched,
+# sampled or allocated. When set, phases and subprocess calls are timed and the results
+# are written as JSON artifacts and attached to the Flight Recorder payload.
+
+MODES = ("cprofile", "sample", "tracemalloc")
+PROFILE_DIR = os.getenv("ANTIGRAVITY_PROFILE_DIR", "/tmp/antigravity_profile")
+SAMPLE_INTERVAL = float(os.getenv("ANTIGRAVITY_PROFILE_INTERVAL_MS", 5)) / 1000.0
+TOP_N = 40
+
+_NULL = contextlib.nullcontext()
+_session = None
+
+def requested_modes(value=None):
+    value = os.getenv("ANTIGRAVITY_PROFILE", "") if value is None else value
+    modes = {m.strip().lower() for m in value.split(",") if m.strip()}
+    if modes & {"1", "all", "true"}:
+        return set(MODES)
+    return modes & set(MODES) or ({"timing"} if modes else set())
+
+def enabled():
+    return _session is not None
+
+def start(entry, modes=None):
+    """Begin profiling this CLI process (no-op unless ANTIGRAVITY_PROFILE is set)."""
+    global _session
+    modes = requested_modes() if modes is None else set(modes)
+    if not modes or _session is not None:
+        return None
+    _session = ProfileSession(entry, modes)
+    _session.begin()
+    atexit.register(finish)
+    return _session
+
+def finish():
+    """Stop collectors and write artifacts. Returns the manifest path (or None)."""
+    global _session
+    session, _session = _session, None
+    return session.end() if session else None
+
+def phase(name):
+    """Time a CLI phase (wall and CPU)."""
+    return _session.phase(name) if _session is not None else _NULL
+
+def snapshot():
+    """Machine-readable profile so far, for the Flight Recorder payload (None when disabled)."""
+    return _session.summary(final=False) if _session is not None else None
+
+class SamplingProfiler:
+    """Wall-clock stack sampler on a background thread (folded-stack output)."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="antigravity-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def top(self, n=TOP_N):
+        return [{"stack": stack, "samples": count} for stack, count in self.stacks.most_common(n)]
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ProfileSession:
+    def __init__(self, entry, modes):
+        self.entry = entry
+        self.modes = modes
+        self.started = time.time()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.phases = []
+        self.subprocesses = []
+        self.lock = threading.Lock()
+        self.profiler = None
+        self.sampler = None
+        self.originals = {}
+        self.out_dir = os.path.join(PROFILE_DIR, f"{entry}-{os.getpid()}-{int(self.started)}")
+
+    # --- Lifecycle ---
+
+    def begin(self):
+        self._patch_subprocess()
+        if "tracemalloc" in self.modes:
+            import tracemalloc
+            tracemalloc.start(10)
+        if "sample" in self.modes:
+            self.sampler = SamplingProfiler()
+            self.sampler.start()
+        if "cprofile" in self.modes:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def end(self):
+        if self.profiler:
+            self.profiler.disable()
+        if self.sampler:
+            self.sampler.stop()
+        self._unpatch_subprocess()
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        manifest = self.summary(final=True)
+        manifest["artifacts"] = {}
+        if self.profiler:
+            path = os.path.join(self.out_dir, "cprofile.pstats")
+            self.profiler.dump_stats(path)
+            manifest["artifacts"]["pstats"] = path
+        if self.sampler:
+            path = os.path.join(self.out_dir, "samples.folded")
+            self.sampler.write_folded(path)
+            manifest["artifacts"]["folded_stacks"] = path
+        if "tracemalloc" in self.modes:
+            import tracemalloc
+            tracemalloc.stop()
+
+        path = os.path.join(self.out_dir, "profile.json")
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        print(f"[PROFILE] {self.entry}: {manifest['wall_ms']:.1f}ms wall, artifacts in {self.out_dir}", file=sys.stderr)
+        return path
+
+    # --- Phases and subprocesses ---
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                "name": name,
+                "wall_ms": round((time.perf_counter() - wall) * 1000, 3),
+                "cpu_ms": round((time.process_time() - cpu) * 1000, 3),
+            }
+            with self.lock:
+                self.phases.append(record)
+
+    def _patch_subprocess(self):
+        """Time every subprocess helper the scripts use (restored in end())."""
+        for name in ("run", "call", "check_call", "check_output"):
+            original = getattr(subprocess, name)
+            self.originals[name] = original
+            setattr(subprocess, name, self._timed(name, original))
+
+    def _unpatch_subprocess(self):
+        for name, original in self.originals.items():
+            setattr(subprocess, name, original)
+        self.originals = {}
+
+    def _timed(self, helper, original):
+        def wrapper(*args, **kwargs):
+            cmd = args[0] if args else kwargs.get("args")
+            argv = cmd.split() if isinstance(cmd, str) else [str(a) for a in (cmd or [])]
+            start = time.perf_counter()
+            returncode = 0
+            try:
+                result = original(*args, **kwargs)
+                returncode = getattr(result, "returncode", result if helper == "call" else 0)
+                return result
+            except subprocess.CalledProcessError as e:
+                returncode = e.returncode
+                raise
+            except OSError:
+                returncode = None
+                raise
+            finally:
+                with self.lock:
+                    self.subprocesses.append({
+                        "helper": helper,
+                        "command": " ".join(argv[:2]), # Program + subcommand; arguments may hold secrets
+                        "wall_ms": round((time.perf_counter() - start) * 1000, 3),
+                        "returncode": returncode,
+                    })
+        return wrapper
+
+    # --- Reporting ---
+
+    def _cprofile_top(self):
+        import pstats
+        self.profiler.disable()
+        try:
+            stats = pstats.Stats(self.profiler).stats
+        finally:
+            self.profiler.enable()
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_N]
+        return [
+            {
+                "function": f"{os.path.basename(filename)}:{line}({func})",
+                "ncalls": ncalls,
+                "tottime_ms": round(tottime * 1000, 3),
+                "cumtime_ms": round(cumtime * 1000, 3),
+            }
+            for (filename, line, func), (_, ncalls, tottime, cumtime, _) in rows
+        ]
+
+    def _tracemalloc_top(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_N]
+        return {
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top": [{"location": str(stat.traceback[0]), "size_bytes": stat.size, "count": stat.count} for stat in top],
+        }
+
+    def summary(self, final=False):
+        with self.lock:
+            phases, subprocesses = list(self.phases), list(self.subprocesses)
+        result = {
+            "entry": self.entry,
+            "modes": sorted(self.modes),
+            "pid": os.getpid(),
+            "started": self.started,
+            "final": final,
+            "wall_ms": round((time.perf_counter() - self.wall_start) * 1000, 3),
+            "cpu_ms": round((time.process_time() - self.cpu_start) * 1000, 3),
+            "phases": phases,
+            "subprocesses": subprocesses,
+            "subprocess_ms": round(sum(s["wall_ms"] for s in subprocesses), 3),
+            "artifact_dir": self.out_dir,
+        }
+        if self.profiler:
+            result["cprofile_top"] = self._cprofile_top()
+        if self.sampler:
+            result["sample_top"] = self.sampler.top()
+            result["samples"] = self.sampler.samples
+        if "tracemalloc" in self.modes:
+            result["tracemalloc"] = self._tracemalloc_top()
+        telemetry = sys.modules.get("observability.telemetry") # Span percentiles, if the entry point traces
+        if telemetry is not None:
+            result["spans"] = telemetry.summary()
+        return result
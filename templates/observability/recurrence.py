@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import uuid
+import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+
+# Antigravity Recurrence Coalescer (R 2.7)
+# Counts duplicate failures per fingerprint in the Brain and flushes one digest comment
+# per issue per window, instead of one Jira comment per occurrence.
+
+DIGEST_WINDOW = int(os.getenv("ANTIGRAVITY_DIGEST_WINDOW", 900)) # Seconds between digests per issue
+DIGEST_MAX_COUNT = int(os.getenv("ANTIGRAVITY_DIGEST_MAX_COUNT", 25)) # Flush early after this many occurrences
+RECURRENCE_TTL = int(os.getenv("ANTIGRAVITY_RECURRENCE_TTL", 30 * 86400)) # Idle fingerprints expire after this many seconds
+RUN_HISTORY = 50 # Occurrences retained per fingerprint for the digest and queries
+DIGEST_RUNS_SHOWN = 10
+LOCK_TTL = 30
+
+PENDING_INDEX = "recurrence:pending"
+
+def stats_key(fingerprint):
+    return f"recurrence:{fingerprint}"
+
+def runs_key(fingerprint):
+    return f"recurrence:{fingerprint}:runs"
+
+def iso(ts):
+    return datetime.datetime.fromtimestamp(float(ts), datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+def pending_runs(runs, pending):
+    """Newest runs (from `history()`) that make up the `pending` occurrences.
+
+    History-only entries (`notify=False`) are skipped and multi-count entries cover
+    several occurrences, so the list stops once their counts add up to `pending`.
+    """
+    selected, covered = [], 0
+    for run in runs:
+        if covered >= pending:
+            break
+        if not run.get("notify", True):
+            continue
+        selected.append(run)
+        covered += int(run.get("count", 1))
+    return selected
+
+def build_digest_comment(stats, runs, flushed):
+    """ADF comment summarizing `flushed` occurrences since the previous digest.
+
+    `runs` are the pending runs from `pending_runs()`; the newest DIGEST_RUNS_SHOWN are listed.
+    """
+    shown = runs[:DIGEST_RUNS_SHOWN]
+    header = (
+        f"[RECURRENCE DIGEST - {iso(time.time())}] {flushed} new occurrence(s) | "
+        f"Total: {stats.get('count', flushed)} | First seen: {iso(stats['first_seen'])} | Last seen: {iso(stats['last_seen'])}"
+    )
+    if len(shown) < len(runs) or sum(int(run.get("count", 1)) for run in shown) < flushed:
+        header += f" | Showing latest {len(shown)} run(s)"
+    items = []
+    for run in shown:
+        count = int(run.get("count", 1))
+        label = f"{iso(run['ts'])} Trace: {run['trace_id']}" + (f" (x{count})" if count > 1 else "")
+        content = [{"type": "text", "text": f"{label} | "}]
+        content.append({"type": "text", "text": "Run", "marks": [{"type": "link", "attrs": {"href": run["run_url"]}}]})
+        if run.get("gcs_link"):
+            content.append({"type": "text", "text": " | "})
+            content.append({"type": "text", "text": "Full Log Archive", "marks": [{"type": "link", "attrs": {"href": run["gcs_link"]}}]})
+        items.append({"type": "listItem", "content": [{"type": "paragraph", "content": content}]})
+
+    body = [{"type": "paragraph", "content": [{"type": "text", "text": header, "marks": [{"type": "strong"}]}]}]
+    if items:
+        body.append({"type": "bulletList", "content": items})
+    return {"body": {"type": "doc", "version": 1, "content": body}}
+
+class RecurrenceCoalescer:
+    """Per-fingerprint recurrence counters in Redis with windowed digest flushing."""
+
+    def __init__(self, client, window=DIGEST_WINDOW, max_count=DIGEST_MAX_COUNT, ttl=RECURRENCE_TTL):
+        self.client = client
+        self.window = window
+        self.max_count = max_count
+        self.ttl = ttl
+
+    def record(self, fingerprint, issue_key, trace_id, run_url, gcs_link=None, count=1, notify=True, now=None):
+        """Count an occurrence. Returns True when the pending digest for this issue is due.
+
+        `notify=False` registers the occurrence that opened the issue: it is part of the
+        history but does not need a digest comment. Both keys get their TTL refreshed, so
+        a fingerprint expires once it has been quiet for `ttl` seconds.
+        """
+        now = now or time.time()
+        key = stats_key(fingerprint)
+        run = json.dumps({"ts": now, "trace_id": trace_id, "run_url": run_url, "gcs_link": gcs_link, "count": count, "notify": notify})
+
+        pipe = self.client.pipeline()
+        pipe.hsetnx(key, "first_seen", now)
+        pipe.hset(key, mapping={"issue_key": issue_key, "last_seen": now, "last_trace": trace_id})
+        pipe.hincrby(key, "count", count)
+        pipe.lpush(runs_key(fingerprint), run)
+        pipe.ltrim(runs_key(fingerprint), 0, RUN_HISTORY - 1)
+        pipe.expire(key, self.ttl)
+        pipe.expire(runs_key(fingerprint), self.ttl)
+        if notify:
+            pipe.hincrby(key, "pending", count)
+            pipe.hsetnx(key, "window_start", now)
+            pipe.zadd(PENDING_INDEX, {fingerprint: now}, nx=True)
+            pipe.hget(key, "window_start")
+        results = pipe.execute()
+        if not notify:
+            return False
+
+        pending, window_start = int(results[7]), float(results[-1])
+        return pending >= self.max_count or now - window_start >= self.window
+
+    def history(self, fingerprint):
+        """Counters plus the most recent occurrences (newest first)."""
+        pipe = self.client.pipeline()
+        pipe.hgetall(stats_key(fingerprint))
+        pipe.lrange(runs_key(fingerprint), 0, RUN_HISTORY - 1)
+        stats, runs = pipe.execute()
+        if not stats:
+            return None
+        stats = dict(stats)
+        for field in ("count", "pending"):
+            stats[field] = int(stats.get(field, 0))
+        return {"stats": stats, "runs": [json.loads(r) for r in runs]}
+
+    def flush(self, fingerprint, post_comment, now=None):
+        """Post one digest for everything pending on this fingerprint.
+
+        `post_comment(issue_key, body)` must return a truthy value on success; on failure the
+        occurrences stay pending and are retried on the next flush.
+        """
+        now = now or time.time()
+        lock = f"{stats_key(fingerprint)}:lock"
+        token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        if not self.client.set(lock, token, nx=True, ex=LOCK_TTL):
+            return False # Another process is flushing this fingerprint
+        try:
+            snapshot = self.history(fingerprint)
+            if not snapshot or snapshot["stats"]["pending"] <= 0:
+                self.client.zrem(PENDING_INDEX, fingerprint)
+                return False
+
+            stats = snapshot["stats"]
+            flushed = stats["pending"]
+            runs = pending_runs(snapshot["runs"], flushed)
+            if not post_comment(stats["issue_key"], build_digest_comment(stats, runs, flushed)):
+                return False
+
+            # Subtract only what was reported; occurrences recorded meanwhile stay pending
+            key = stats_key(fingerprint)
+            remaining = self.client.hincrby(key, "pending", -flushed)
+            pipe = self.client.pipeline()
+            if remaining <= 0:
+                pipe.hdel(key, "window_start")
+                pipe.zrem(PENDING_INDEX, fingerprint)
+            else:
+                pipe.hset(key, "window_start", now)
+                pipe.zadd(PENDING_INDEX, {fingerprint: now})
+            pipe.hset(key, "last_digest", now)
+            pipe.execute()
+            return True
+        finally:
+            self._release(lock, token)
+
+    def _release(self, lock, token):
+        """Compare-and-delete: a lock that expired mid-flush may already belong to another process."""
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(lock)
+                current = pipe.get(lock)
+                if isinstance(current, bytes):
+                    current = current.decode("utf-8")
+                if current != token:
+                    pipe.unwatch()
+                    return False
+                pipe.multi()
+                pipe.delete(lock)
+                pipe.execute()
+                return True
+            except redis_pool.WatchError: # redis.exceptions.WatchError once redis-py is loaded
+                return False # Re-acquired by someone else between GET and EXEC
+
+    def flush_due(self, post_comment, now=None):
+        """Flush every fingerprint whose window has elapsed. Returns the number of digests posted."""
+        now = now or time.time()
+        due = self.client.zrangebyscore(PENDING_INDEX, "-inf", now - self.window)
+        return sum(1 for fingerprint in due if self.flush(fingerprint, post_comment, now))
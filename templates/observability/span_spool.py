@@ -0,0 +1,431 @@
+import os
+import json
+import time
+import errno
+import threading
+import collections
+
+try:
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+except ImportError:
+    import enum
+    SpanExporter = object
+
+    class SpanExportResult(enum.Enum):
+        """Mirrors opentelemetry.sdk.trace.export.SpanExportResult."""
+        SUCCESS = 0
+        FAILURE = 1
+
+# Antigravity Span Spool (Rule 07)
+# Wraps the Cloud Trace exporter so spans survive an offline or lagging uplink: failed
+# batches spill to bounded on-disk NDJSON segments and are replayed, oldest first, once
+# the downstream exporter accepts spans again (in this process or the next run).
+
+SPOOL_ROOT = os.path.expanduser(os.getenv("ANTIGRAVITY_SPAN_SPOOL", "~/.antigravity/span_spool"))
+MAX_BYTES = int(os.getenv("ANTIGRAVITY_SPAN_SPOOL_MAX_BYTES", 64 * 1024 * 1024))
+SEGMENT_BYTES = 1024 * 1024
+REPLAY_BATCH = 512 # Spans per replayed export call
+LAG_THRESHOLD = 10.0 # Seconds; a slower export diverts new batches to disk for a while
+RETRY_INTERVAL = 5.0
+MAX_RETRY_INTERVAL = 300.0
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except OSError as e:
+        return e.errno == errno.EPERM
+    return True
+
+class SegmentStore:
+    """Append-only NDJSON segments, replayed oldest first and bounded by total bytes.
+
+    Each process appends to its own head segment. A replaying process claims a sealed
+    segment by renaming it, so several processes can share one spool directory. Segments
+    claimed by a process that died are released again on startup. `depth` counts only
+    spans this process may replay: segments of other live processes are theirs.
+    """
+
+    SUFFIX = ".ndjson"
+
+    def __init__(self, directory, max_bytes=MAX_BYTES, segment_bytes=SEGMENT_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.head = None
+        self.head_size = 0
+        self.dropped = 0
+        os.makedirs(directory, exist_ok=True)
+        self._release_orphans()
+        self._counted = set(path for path in self._segments() if self._replayable(path))
+        self.depth = sum(self._count(path) for path in self._counted)
+
+    def _segments(self):
+        """Unclaimed segments, oldest first (names sort by creation time)."""
+        names = sorted(n for n in os.listdir(self.directory) if n.endswith(self.SUFFIX))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def _owner(self, path):
+        """PID that wrote the segment (seg-<time_ns>-<pid>.ndjson)."""
+        stem = os.path.basename(path)[:-len(self.SUFFIX)]
+        owner = stem.rsplit("-", 1)[-1]
+        return int(owner) if owner.isdigit() else None
+
+    def _replayable(self, path):
+        owner = self._owner(path)
+        return owner in (None, self.pid) or not _pid_alive(owner)
+
+    def _tracked(self, path):
+        """Whether the segment's spans are already included in depth."""
+        return path in self._counted or self._owner(path) == self.pid
+
+    def has_backlog(self):
+        return any(self._replayable(path) for path in self._segments())
+
+    @staticmethod
+    def _count(path):
+        try:
+            with open(path, "rb") as f:
+                return sum(1 for line in f if line.strip())
+        except OSError:
+            return 0
+
+    def _release_orphans(self):
+        for name in os.listdir(self.directory):
+            base, sep, owner = name.rpartition(".replay-")
+            if sep and owner.isdigit() and not _pid_alive(int(owner)):
+                os.replace(os.path.join(self.directory, name), os.path.join(self.directory, base))
+
+    def size_bytes(self):
+        total = 0
+        for path in self._segments():
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def append(self, records):
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+        with self.lock:
+            if self.head is None or self.head_size + len(data) > self.segment_bytes:
+                self.head = os.path.join(self.directory, f"seg-{time.time_ns():020d}-{self.pid}{self.SUFFIX}")
+                self.head_size = 0
+            with open(self.head, "ab") as f:
+                f.write(data)
+            self.head_size += len(data)
+            self.depth += len(records)
+            self._enforce_bound()
+
+    def _enforce_bound(self):
+        """Drop whole oldest segments (never the live head) until under max_bytes."""
+        segments = self._segments()
+        total = sum(os.path.getsize(p) for p in segments if os.path.exists(p))
+        for path in segments:
+            if total <= self.max_bytes or path == self.head:
+                break
+            lost = self._count(path)
+            try:
+                total -= os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                continue
+            self.dropped += lost
+            if self._tracked(path):
+                self._counted.discard(path)
+                self.depth = max(0, self.depth - lost)
+            print(f"[WARN] Span spool over {self.max_bytes} bytes: dropped {lost} span(s) from {os.path.basename(path)}.")
+
+    def claim(self):
+        """Take the oldest segment for replay. Returns (claimed_path, records) or None."""
+        with self.lock:
+            for path in self._segments():
+                if not self._replayable(path):
+                    continue # A live process replays its own segments
+                if path == self.head:
+                    self.head = None # Seal it: later appends start a new segment
+                claimed = f"{path}.replay-{self.pid}"
+                try:
+                    os.rename(path, claimed)
+                except OSError:
+                    continue # Claimed by another process first
+                records = []
+                torn = 0
+                with open(claimed, "rb") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        try:
+                            records.append(json.loads(line))
+                        except ValueError:
+                            torn += 1 # Torn write from a crash mid-append
+                self.dropped += torn
+                if self._tracked(path):
+                    self.depth = max(0, self.depth - torn)
+                else:
+                    self.depth += len(records) # Its writer died after we started
+                self._counted.add(path) # Counted from now on, also if released back
+                return claimed, records
+        return None
+
+    def complete(self, claimed, count):
+        with self.lock:
+            os.remove(claimed)
+            self._counted.discard(claimed.rsplit(".replay-", 1)[0])
+            self.depth = max(0, self.depth - count)
+
+    def release(self, claimed, remaining, replayed):
+        """Put the unreplayed tail back under the segment's original name (keeps its order)."""
+        with self.lock:
+            with open(claimed, "wb") as f:
+                f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in remaining).encode("utf-8"))
+            os.replace(claimed, claimed.rsplit(".replay-", 1)[0])
+            self.depth = max(0, self.depth - replayed)
+
+# --- Span (de)serialization ---
+
+def _hex(value, width):
+    return f"{value:0{width}x}"
+
+def _attrs(attributes):
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in (attributes or {}).items()}
+
+def _unattrs(attributes):
+    return {k: tuple(v) if isinstance(v, list) else v for k, v in (attributes or {}).items()}
+
+def span_to_dict(span):
+    """ReadableSpan -> JSON-safe dict holding everything needed to rebuild it."""
+    ctx = span.context
+    scope = span.instrumentation_scope
+    return {
+        "name": span.name,
+        "trace_id": _hex(ctx.trace_id, 32),
+        "span_id": _hex(ctx.span_id, 16),
+        "trace_flags": int(ctx.trace_flags),
+        "trace_state": ctx.trace_state.to_header() if ctx.trace_state else "",
+        "parent_span_id": _hex(span.parent.span_id, 16) if span.parent else None,
+        "parent_remote": bool(span.parent.is_remote) if span.parent else False,
+        "kind": span.kind.name,
+        "start": span.start_time,
+        "end": span.end_time,
+        "attributes": _attrs(span.attributes),
+        "events": [{"name": e.name, "timestamp": e.timestamp, "attributes": _attrs(e.attributes)} for e in span.events],
+        "links": [
+            {"trace_id": _hex(l.context.trace_id, 32), "span_id": _hex(l.context.span_id, 16), "attributes": _attrs(l.attributes)}
+            for l in span.links
+        ],
+        "status": {"code": span.status.status_code.name, "description": span.status.description},
+        "resource": _attrs(span.resource.attributes),
+        "scope": {"name": scope.name, "version": scope.version} if scope else None,
+    }
+
+def dict_to_span(data):
+    """Inverse of span_to_dict."""
+    from opentelemetry.sdk.trace import ReadableSpan, Event
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.util.instrumentation import InstrumentationScope
+    from opentelemetry.trace import SpanContext, TraceFlags, TraceState, SpanKind, Link, Status, StatusCode
+
+    trace_id = int(data["trace_id"], 16)
+    context = SpanContext(
+        trace_id,
+        int(data["span_id"], 16),
+        is_remote=False,
+        trace_flags=TraceFlags(data["trace_flags"]),
+        trace_state=TraceState.from_header([data["trace_state"]]) if data["trace_state"] else None,
+    )
+    parent = None
+    if data["parent_span_id"]:
+        parent = SpanContext(trace_id, int(data["parent_span_id"], 16), is_remote=data["parent_remote"])
+    scope = data.get("scope")
+    return ReadableSpan(
+        name=data["name"],
+        context=context,
+        parent=parent,
+        resource=Resource(_unattrs(data["resource"])),
+        attributes=_unattrs(data["attributes"]),
+        events=[Event(e["name"], _unattrs(e["attributes"]), e["timestamp"]) for e in data["events"]],
+        links=[
+            Link(SpanContext(int(l["trace_id"], 16), int(l["span_id"], 16), is_remote=True), _unattrs(l["attributes"]))
+            for l in data["links"]
+        ],
+        kind=SpanKind[data["kind"]],
+        status=Status(StatusCode[data["status"]["code"]], data["status"]["description"]),
+        start_time=data["start"],
+        end_time=data["end"],
+        instrumentation_scope=InstrumentationScope(scope["name"], scope["version"]) if scope else None,
+    )
+
+# --- Exporter wrapper ---
+
+class SpoolingSpanExporter(SpanExporter):
+    """SpanExporter that never loses a batch to a failing or slow downstream exporter.
+
+    `delegate` is an exporter or a zero-argument factory (retried until it succeeds, so an
+    uplink that is offline at startup does not disable tracing). While a backlog exists,
+    new batches are appended behind it so replay preserves order.
+    """
+
+    def __init__(self, delegate, directory, max_bytes=MAX_BYTES, segment_bytes=SEGMENT_BYTES,
+                 lag_threshold=LAG_THRESHOLD, retry_interval=RETRY_INTERVAL, max_retry_interval=MAX_RETRY_INTERVAL,
+                 encode=span_to_dict, decode=dict_to_span, background=True):
+        self._delegate = delegate if hasattr(delegate, "export") else None
+        self._factory = None if self._delegate else delegate
+        self.store = SegmentStore(directory, max_bytes, segment_bytes)
+        self.lag_threshold = lag_threshold
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.encode = encode
+        self.decode = decode
+        self.counters = {"exported": 0, "spilled": 0, "replayed": 0, "export_failures": 0, "queue_dropped": 0}
+        self._export_lock = threading.Lock()
+        self._direct_after = 0.0 # monotonic time before which batches go straight to disk
+        self._stop = threading.Event()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._replay_loop, name="span-spool-replay", daemon=True)
+            self._thread.start()
+
+    def _downstream(self):
+        if self._delegate is None:
+            self._delegate = self._factory() # Raises while the uplink is unavailable
+        return self._delegate
+
+    def _send(self, spans):
+        """Export through the delegate; False on failure or exception."""
+        with self._export_lock:
+            try:
+                return self._downstream().export(spans) == SpanExportResult.SUCCESS
+            except Exception as e:
+                print(f"[WARN] Span export failed ({type(e).__name__}: {e}). Spooling to disk.")
+                return False
+
+    def export(self, spans):
+        spans = list(spans)
+        if not spans:
+            return SpanExportResult.SUCCESS
+        if self.store.depth == 0 and time.monotonic() >= self._direct_after:
+            started = time.monotonic()
+            if self._send(spans):
+                self.counters["exported"] += len(spans)
+                if time.monotonic() - started > self.lag_threshold:
+                    self._direct_after = time.monotonic() + self.retry_interval # Lagging: absorb on disk
+                return SpanExportResult.SUCCESS
+            self.counters["export_failures"] += 1
+            self._direct_after = time.monotonic() + self.retry_interval
+        self.store.append([self.encode(span) for span in spans])
+        self.counters["spilled"] += len(spans)
+        return SpanExportResult.SUCCESS # Durably accepted
+
+    def drain(self):
+        """Replay the backlog in order. Returns True once the spool is empty."""
+        while True:
+            claimed = self.store.claim()
+            if claimed is None:
+                return True
+            path, records = claimed
+            for i in range(0, len(records), REPLAY_BATCH):
+                chunk = records[i:i + REPLAY_BATCH]
+                if not self._send([self.decode(record) for record in chunk]):
+                    self.counters["export_failures"] += 1
+                    self.store.release(path, records[i:], i)
+                    return False
+                self.counters["replayed"] += len(chunk)
+            self.store.complete(path, len(records))
+
+    def _replay_loop(self):
+        delay = self.retry_interval
+        while not self._stop.wait(delay):
+            if not self.store.has_backlog():
+                delay = self.retry_interval
+                continue
+            if self.drain():
+                self._direct_after = 0.0
+                delay = self.retry_interval
+            else:
+                delay = min(delay * 2, self.max_retry_interval)
+
+    def dropped(self):
+        """Spans lost to the spool bound, torn writes or a full BatchSpanProcessor queue."""
+        return self.store.dropped + self.counters["queue_dropped"]
+
+    def stats(self):
+        return {
+            **self.counters,
+            "queue_depth": self.store.depth,
+            "queue_bytes": self.store.size_bytes(),
+            "dropped": self.dropped(),
+            "mode": "direct" if self.store.depth == 0 and time.monotonic() >= self._direct_after else "spooling",
+        }
+
+    def force_flush(self, timeout_millis=30000):
+        drained = self.drain()
+        flush = getattr(self._delegate, "force_flush", None)
+        return drained and (flush(timeout_millis) if flush else True)
+
+    def shutdown(self):
+        """Stop replaying; whatever is still spooled is replayed by the next run."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._delegate is not None:
+            self._delegate.shutdown()
+        stats = self.stats()
+        if stats["queue_depth"] or stats["dropped"]:
+            print(f"[INFO] Span spool: {stats['queue_depth']} span(s) pending replay, {stats['dropped']} dropped.")
+
+def _span_queue(processor):
+    """The BatchSpanProcessor's bounded deque (its attribute moved across SDK releases)."""
+    for owner in (processor, getattr(processor, "_batch_processor", None)):
+        for name in ("queue", "_queue"):
+            queue = getattr(owner, name, None)
+            if isinstance(queue, collections.deque) and queue.maxlen:
+                return queue
+    return None
+
+class DropCountingSpanProcessor:
+    """Wraps a BatchSpanProcessor and counts the spans its full queue discards.
+
+    The SDK evicts the oldest queued span once max_queue_size is reached and only logs a
+    warning, so every sampled span that ends while the queue is full is one span lost.
+    """
+
+    def __init__(self, processor, exporter):
+        self._processor = processor
+        self._exporter = exporter
+        self._queue = _span_queue(processor)
+
+    def on_end(self, span):
+        queue = self._queue
+        if queue is not None and len(queue) >= queue.maxlen and span.context.trace_flags.sampled:
+            self._exporter.counters["queue_dropped"] += 1
+        self._processor.on_end(span)
+
+    def __getattr__(self, name):
+        return getattr(self._processor, name) # on_start, force_flush, shutdown
+
+def register_metrics(exporter, meter_name="antigravity"):
+    """Expose spool depth and drop counters as OTel observable instruments (if available)."""
+    try:
+        from opentelemetry import metrics
+        from opentelemetry.metrics import Observation
+    except ImportError:
+        return False
+    meter = metrics.get_meter(meter_name)
+    meter.create_observable_gauge(
+        "antigravity.span_spool.depth", callbacks=[lambda options: [Observation(exporter.store.depth)]], unit="{span}"
+    )
+    meter.create_observable_counter(
+        "antigravity.span_spool.dropped", callbacks=[lambda options: [Observation(exporter.dropped())]], unit="{span}"
+    )
+    return True
+
+def install(provider, delegate, service_name="antigravity-agent", **options):
+    """Attach BatchSpanProcessor(SpoolingSpanExporter(delegate)) to a TracerProvider."""
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    exporter = SpoolingSpanExporter(delegate, os.path.join(SPOOL_ROOT, service_name), **options)
+    provider.add_span_processor(DropCountingSpanProcessor(BatchSpanProcessor(exporter), exporter))
+    register_metrics(exporter)
+    return exporter
@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+import uuid
+import atexit
+import functools
+import threading
+import contextlib
+import contextvars
+import collections
+
+# Antigravity Telemetry (Rule 07)
+# Times the real work (HTTP, git, GCS, Redis, solvency checks). Every span is kept by an
+# in-process recorder (Flight Recorder payload, p50/p99 summaries) and, when OpenTelemetry
+# is installed, mirrored as an OTel span plus a latency histogram sample.
+
+SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "antigravity-agent")
+HISTOGRAM_NAME = "antigravity.operation.duration"
+MAX_SPANS = 512 # Finished spans retained for the payload
+MAX_SAMPLES = 2048 # Latency samples retained per operation for percentiles
+
+PROCESS_START_NS = time.time_ns()
+
+_current = contextvars.ContextVar("antigravity_span", default=None)
+_lock = threading.Lock()
+_spans = collections.deque(maxlen=MAX_SPANS)
+_samples = {} # operation -> deque of durations (ms)
+_totals = {} # operation -> [count, errors]
+_otel = None # (tracer, histogram), or False when OpenTelemetry is not installed
+
+def _instruments():
+    """Resolve OpenTelemetry on first use only; the API proxies bind to providers set later.
+
+    Nothing is imported while spans could not leave the process: no provider installed
+    (installing one imports opentelemetry) and no OTLP endpoint configured.
+    """
+    global _otel
+    if _otel is None:
+        if "opentelemetry" not in sys.modules and not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+            return None
+        try:
+            from opentelemetry import trace, metrics
+            tracer = trace.get_tracer("antigravity")
+            histogram = metrics.get_meter("antigravity").create_histogram(
+                HISTOGRAM_NAME, unit="ms", description="Latency of instrumented Antigravity operations"
+            )
+            _otel = (tracer, histogram)
+        except ImportError:
+            _otel = False
+    return _otel or None
+
+def init(service_name=SERVICE_NAME):
+    """Export spans and histograms over OTLP to the collector when an endpoint is configured.
+
+    Providers already installed (opentelemetry-instrument, Cloud Trace uplink) are kept.
+    Returns True when an OTLP pipeline was installed.
+    """
+    if not os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        return False
+    try:
+        from opentelemetry import trace, metrics
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.metrics import MeterProvider
+        from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.exporter.otlp.proto.http.metric_exporter import OTLPMetricExporter
+    except ImportError:
+        print("[WARN] OpenTelemetry SDK/OTLP exporter not installed. Timings stay local.")
+        return False
+
+    resource = Resource.create({"service.name": service_name})
+    if "Proxy" in type(trace.get_tracer_provider()).__name__:
+        provider = TracerProvider(resource=resource)
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        trace.set_tracer_provider(provider)
+    if "Proxy" in type(metrics.get_meter_provider()).__name__:
+        reader = PeriodicExportingMetricReader(OTLPMetricExporter())
+        metrics.set_meter_provider(MeterProvider(resource=resource, metric_readers=[reader]))
+    return True
+
+# --- Spans ---
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """Time a block. Nested spans are parented automatically (per thread / task)."""
+    parent = _current.get()
+    record = {
+        "name": name,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_span_id": parent["span_id"] if parent else None,
+        "start_time_unix_nano": time.time_ns(),
+        "status": {"code": "Ok"},
+        "attributes": dict(attributes),
+    }
+    otel = _instruments()
+    token = _current.set(record)
+    start = time.perf_counter()
+    try:
+        with (otel[0].start_as_current_span(name, attributes=_otel_attributes(attributes)) if otel else contextlib.nullcontext()) as otel_span:
+            record["_otel"] = otel_span
+            yield record
+    except Exception as e:
+        record["status"] = {"code": "Error", "message": f"{type(e).__name__}: {e}"[:200]}
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        record["end_time_unix_nano"] = record["start_time_unix_nano"] + int(elapsed_ms * 1e6)
+        record.pop("_otel", None)
+        _current.reset(token)
+        _finish(record, elapsed_ms, otel)
+
+def traced(name, **attributes):
+    """Decorator form of span()."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, **attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def annotate(**attributes):
+    """Add attributes to the innermost open span (e.g. an HTTP status known only afterwards)."""
+    record = _current.get()
+    if record is None:
+        return
+    record["attributes"].update(attributes)
+    otel_span = record.get("_otel")
+    if otel_span is not None:
+        for key, value in _otel_attributes(attributes).items():
+            otel_span.set_attribute(key, value)
+
+def mark_error(message):
+    """Flag the innermost span as failed without raising (e.g. curl returned nothing)."""
+    record = _current.get()
+    if record is None:
+        return
+    record["status"] = {"code": "Error", "message": str(message)[:200]}
+    otel_span = record.get("_otel")
+    if otel_span is not None:
+        from opentelemetry.trace import Status, StatusCode
+        otel_span.set_status(Status(StatusCode.ERROR, str(message)[:200]))
+
+def _otel_attributes(attributes):
+    return {k: v if isinstance(v, (str, bool, int, float)) else str(v) for k, v in attributes.items() if v is not None}
+
+def _finish(record, elapsed_ms, otel):
+    name = record["name"]
+    failed = record["status"]["code"] == "Error"
+    with _lock:
+        _spans.append(record)
+        _samples.setdefault(name, collections.deque(maxlen=MAX_SAMPLES)).append(elapsed_ms)
+        totals = _totals.setdefault(name, [0, 0])
+        totals[0] += 1
+        totals[1] += failed
+    if otel:
+        otel[1].record(elapsed_ms, {"operation": name, "status": record["status"]["code"]})
+
+# --- Reporting ---
+
+def current():
+    """The innermost open span, or None."""
+    return _current.get()
+
+def spans(within=None):
+    """Finished spans, oldest first (bounded by MAX_SPANS).
+
+    `within` restricts the result to descendants of that span_id, so a long-lived process
+    (the bridge daemon) reports only the work of the operation at hand.
+    """
+    with _lock:
+        records = [dict(record) for record in _spans]
+    if within is None:
+        return records
+    parents = {record["span_id"]: record["parent_span_id"] for record in records}
+    selected = []
+    for record in records:
+        parent = record["parent_span_id"]
+        while parent is not None and parent != within:
+            parent = parents.get(parent)
+        if parent == within:
+            selected.append(record)
+    return selected
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100)) # ceil(n * q / 100)
+    return sorted_values[int(rank) - 1]
+
+def summary():
+    """{operation: {count, errors, p50_ms, p99_ms, max_ms}} over retained samples."""
+    with _lock:
+        snapshot = {name: (sorted(samples), _totals[name]) for name, samples in _samples.items()}
+    return {
+        name: {
+            "count": totals[0],
+            "errors": totals[1],
+            "p50_ms": round(percentile(values, 50), 3),
+            "p99_ms": round(percentile(values, 99), 3),
+            "max_ms": round(values[-1], 3),
+        }
+        for name, (values, totals) in sorted(snapshot.items())
+    }
+
+def print_summary(stream=None):
+    stream = stream or sys.stderr
+    for name, stats in summary().items():
+        print(
+            f"[TIMING] {name:<28} n={stats['count']:<5} err={stats['errors']:<3} "
+            f"p50={stats['p50_ms']:.1f}ms p99={stats['p99_ms']:.1f}ms max={stats['max_ms']:.1f}ms",
+            file=stream,
+        )
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _samples.clear()
+        _totals.clear()
+
+if os.getenv("ANTIGRAVITY_TIMINGS") == "1":
+    atexit.register(print_summary)
@@ -0,0 +1,681 @@
+import os
+import sys
+import json
+import time
+import array
+import hashlib
+import argparse
+import datetime
+import statistics
+import subprocess
+import collections
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from observability import friction_log
+
+# Antigravity Triage Analytics (Rule 07 + R 6.5)
+# Local columnar store over archived telemetry: friction batches (`telemetry_<ts>.json`),
+# Flight Recorder envelopes (`trace_<id>.json`) and the live Friction Log NDJSON store.
+# Each column is a typed array appended to its own file; strings are dictionary-encoded.
+# Posting lists on fingerprint / owner / status / day serve filtered queries, and per-day
+# aggregates kept up to date at ingest answer the unfiltered ones without touching rows.
+# Indexes are typed-array bytes and aggregates JSON: nothing read back can execute code.
+
+STORE_DIR = os.path.expanduser(os.getenv("ANTIGRAVITY_ANALYTICS_DIR", "~/.antigravity/analytics"))
+BLOB_PREFIX = "blobs/sha256" # Content-addressed log bodies (jira_bridge.split_payload); never needed here
+VERSION = 1
+
+COLUMNS = (
+    ("ts", "d"),
+    ("day", "i"),
+    ("fingerprint", "i"),
+    ("owner", "i"),
+    ("status", "i"),
+    ("ref", "i"),
+    ("source", "i"),
+    ("loop_count", "i"),
+    ("duration_ms", "d"),
+)
+DICTIONARIES = ("fingerprint", "owner", "status", "ref", "source")
+INDEXED = ("fingerprint", "owner", "status", "day")
+INCIDENT_COLUMNS = (("owner", "i"), ("start", "d"), ("end", "d"))
+HEAD_BYTES = 4096 # Prefix of an NDJSON source compared to detect that it was recreated
+FAIL_STATUS, PASS_STATUS = "Error", "Ok" # Flight Recorder status.code values that open / close an incident
+
+# --- Event extraction ---
+
+def _epoch(*values):
+    """First parseable ISO timestamp / date / epoch among `values`, as UTC seconds."""
+    for value in values:
+        if value is None or value == "":
+            continue
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            parsed = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed.timestamp()
+    return None
+
+def _int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+def events_from_archive(entries):
+    """Friction entries (archive batches or Friction Log records) -> events."""
+    for entry in entries:
+        ts = _epoch(entry.get("timestamp") or entry.get("ts"), entry.get("date"))
+        if ts is None:
+            continue
+        error = str(entry.get("error") or "")
+        cause = str(entry.get("cause") or "")
+        yield {
+            "ts": ts,
+            "fingerprint": entry.get("fingerprint") or hashlib.md5(f"{error}|{cause}".encode("utf-8")).hexdigest(),
+            "owner": entry.get("owner") or entry.get("agent") or "unknown",
+            "status": "friction",
+            "ref": "",
+            "source": "telemetry",
+            "loop_count": _int(entry.get("loop_count")),
+            "duration_ms": 0.0,
+            "key": f"telemetry|{entry.get('trace_id')}|{ts}|{error}|{cause}",
+            "label": error.splitlines()[0][:120] if error else None,
+        }
+
+def event_from_trace(payload):
+    """Flight Recorder payload or envelope -> event.
+
+    Envelopes carry `body_sha256` instead of the log body, so recurrences group without
+    downloading a single blob.
+    """
+    start, end = payload.get("start_time_unix_nano"), payload.get("end_time_unix_nano")
+    logs = payload.get("logs") or []
+    ts = _epoch(start / 1e9 if start else None, logs[0].get("timestamp") if logs else None)
+    if ts is None:
+        return None
+    attributes = payload.get("attributes") or {}
+    resource = payload.get("resource") or {}
+    fingerprint = attributes.get("error.fingerprint")
+    label = None
+    if logs:
+        body = logs[0].get("body")
+        if body and body.strip():
+            label = body.strip().splitlines()[0][:120]
+        if not fingerprint:
+            fingerprint = logs[0].get("body_sha256") or hashlib.sha256((body or "").encode("utf-8")).hexdigest()
+    return {
+        "ts": ts,
+        "fingerprint": fingerprint or "unknown",
+        "owner": attributes.get("owner") or "unknown",
+        "status": (payload.get("status") or {}).get("code") or "Unset",
+        "ref": resource.get("vcs.ref.head.name") or "",
+        "source": "trace",
+        "loop_count": _int(attributes.get("loop_count")),
+        "duration_ms": (end - start) / 1e6 if start and end else 0.0,
+        "key": f"trace|{payload.get('trace_id')}|{payload.get('span_id')}|{ts}",
+        "label": label,
+    }
+
+def _head_digest(path, offset):
+    """Digest of the first bytes already ingested; tells a recreated file from a grown one."""
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read(min(offset, HEAD_BYTES))).hexdigest()
+
+def _key_hash(key):
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "little", signed=True)
+
+# --- Store ---
+
+class Dictionary:
+    """String <-> dense id, persisted as one JSON string per line."""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.ids = {v: i for i, v in enumerate(self.values)}
+
+    def encode(self, value):
+        value = str(value)
+        found = self.ids.get(value)
+        if found is None:
+            found = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return found
+
+    def get(self, value):
+        return self.ids.get(str(value))
+
+class TriageStore:
+    """Append-only columnar store with posting-list indexes and incremental aggregates.
+
+    `meta.json` is written last on commit and records the committed row / dictionary
+    extents, so a crash mid-commit leaves only a tail that the next commit truncates.
+    Columns, postings and the dedup set load lazily: unfiltered queries read none of them.
+    """
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self._path("meta.json"), "r") as f:
+                self.meta = json.load(f)
+        except FileNotFoundError:
+            self.meta = {"version": VERSION, "rows": 0, "extents": {}, "files": {}}
+        self.rows = self.meta["rows"]
+        self.dicts = {name: Dictionary(self._read_lines(name)) for name in DICTIONARIES}
+        self._columns = {}
+        self._postings = {}
+        self._seen = None
+        self._committed = self.rows
+        self.aggregates = self._load_aggregates()
+        if self.aggregates is None:
+            self.aggregates = self._empty_aggregates()
+            if self.rows:
+                self._rebuild()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_lines(self, name):
+        count, size = self.meta["extents"].get(f"dict_{name}", (0, 0))
+        if not count:
+            return []
+        with open(self._path(f"dict_{name}.txt"), "rb") as f:
+            data = f.read(size)
+        return [json.loads(line) for line in data.splitlines()[:count]]
+
+    def _load_aggregates(self):
+        try:
+            with open(self._path("aggregates.json"), "rb") as f:
+                loaded = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if loaded.get("rows") != self.rows:
+            return None # Stale: written by an interrupted commit
+        data = loaded["data"]
+        ids = lambda mapping: {int(k): v for k, v in mapping.items()} # JSON object keys are strings
+        return {
+            "day_fingerprints": {int(day): collections.Counter(ids(c)) for day, c in data["day_fingerprints"].items()},
+            "day_loops": {int(day): collections.Counter(ids(c)) for day, c in data["day_loops"].items()},
+            "labels": ids(data["labels"]),
+            "last_seen": ids(data["last_seen"]),
+            "open": {ref: tuple(state) for ref, state in ids(data["open"]).items()},
+            "ref_last": ids(data["ref_last"]),
+            "incidents": {name: array.array(typecode, data["incidents"][name]) for name, typecode in INCIDENT_COLUMNS},
+            "mttr_dirty": data["mttr_dirty"],
+        }
+
+    def _load_postings(self, name):
+        """Posting lists packed by `_pack_postings`, or None when missing or stale."""
+        try:
+            with open(self._path(f"postings_{name}.bin"), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        header = array.array("q")
+        if len(data) < 3 * header.itemsize:
+            return None
+        header.frombytes(data[:3 * header.itemsize])
+        rows, keys, total = header
+        if rows != self.rows:
+            return None # Stale: written by an interrupted commit
+        values, offsets, ids = array.array("i"), array.array("q"), array.array("i")
+        start = 3 * header.itemsize
+        for arr, count in ((values, keys), (offsets, keys + 1), (ids, total)):
+            end = start + count * arr.itemsize
+            if end > len(data):
+                return None
+            arr.frombytes(data[start:end])
+            start = end
+        return {value: ids[offsets[k]:offsets[k + 1]] for k, value in enumerate(values)}
+
+    def _pack_postings(self, lists):
+        """Header (rows, keys, row ids), then key values, offsets and concatenated row ids."""
+        values, offsets, ids = array.array("i"), array.array("q", [0]), array.array("i")
+        for value, rows in lists.items():
+            values.append(value)
+            ids.extend(rows)
+            offsets.append(len(ids))
+        header = array.array("q", [self.rows, len(values), len(ids)])
+        return header.tobytes() + values.tobytes() + offsets.tobytes() + ids.tobytes()
+
+    def _write_atomic(self, name, data):
+        tmp = self._path(f"{name}.tmp-{os.getpid()}")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(name))
+
+    @staticmethod
+    def _empty_aggregates():
+        return {
+            "day_fingerprints": {}, # day -> Counter(fingerprint id)
+            "day_loops": {}, # day -> Counter(loop_count)
+            "labels": {}, # fingerprint id -> first error line seen
+            "last_seen": {}, # fingerprint id -> newest ts
+            "open": {}, # ref id -> (start ts, owner id) of the unresolved incident
+            "ref_last": {}, # ref id -> newest ts replayed
+            "incidents": {name: array.array(typecode) for name, typecode in INCIDENT_COLUMNS},
+            "mttr_dirty": False, # Set when an event arrives out of order; replayed at query time
+        }
+
+    # Lazy parts
+
+    def column(self, name):
+        if name not in self._columns:
+            typecode = dict(COLUMNS)[name]
+            col = array.array(typecode)
+            if self.rows:
+                with open(self._path(f"col_{name}.bin"), "rb") as f:
+                    col.frombytes(f.read(self.rows * col.itemsize))
+            self._columns[name] = col
+        return self._columns[name]
+
+    def postings(self, name):
+        """Posting lists of one indexed column: value id (or day) -> array of row ids."""
+        if name not in self._postings:
+            lists = self._load_postings(name)
+            if lists is None:
+                lists = {}
+                for row, value in enumerate(self.column(name)):
+                    lists.setdefault(value, array.array("i")).append(row)
+            self._postings[name] = lists
+        return self._postings[name]
+
+    def seen(self):
+        if self._seen is None:
+            hashes = array.array("q")
+            count = self.meta["extents"].get("seen", (0, 0))[0]
+            if count:
+                with open(self._path("seen.bin"), "rb") as f:
+                    hashes.frombytes(f.read(count * hashes.itemsize))
+            self._seen = set(hashes)
+            self._seen_new = array.array("q")
+        return self._seen
+
+    # Ingest
+
+    def add(self, event):
+        """Append one event. Returns False for a duplicate (already ingested from another copy)."""
+        key = _key_hash(event["key"])
+        seen = self.seen()
+        if key in seen:
+            return False
+        seen.add(key)
+        self._seen_new.append(key)
+        postings = {name: self.postings(name) for name in INDEXED} # Loaded before the row lands in the columns
+
+        row = self.rows
+        values = {
+            "ts": event["ts"],
+            "day": int(event["ts"] // 86400),
+            "loop_count": event["loop_count"],
+            "duration_ms": event["duration_ms"],
+        }
+        for name in DICTIONARIES:
+            values[name] = self.dicts[name].encode(event[name])
+        for name, _ in COLUMNS:
+            self.column(name).append(values[name])
+        for name in INDEXED:
+            postings[name].setdefault(values[name], array.array("i")).append(row)
+        self.rows += 1
+        self._aggregate(row, event.get("label"))
+        return True
+
+    def _aggregate(self, row, label=None):
+        agg = self.aggregates
+        day, fp, ts = self.column("day")[row], self.column("fingerprint")[row], self.column("ts")[row]
+        agg["day_fingerprints"].setdefault(day, collections.Counter())[fp] += 1
+        agg["day_loops"].setdefault(day, collections.Counter())[self.column("loop_count")[row]] += 1
+        if label and fp not in agg["labels"]:
+            agg["labels"][fp] = label
+        if ts > agg["last_seen"].get(fp, 0.0):
+            agg["last_seen"][fp] = ts
+        if not agg["mttr_dirty"]:
+            self._replay(row, agg)
+
+    def _replay(self, row, agg):
+        """Advance the per-ref incident state machine by one event (rows arrive in time order)."""
+        status = self.dicts["status"].values[self.column("status")[row]]
+        if status not in (FAIL_STATUS, PASS_STATUS):
+            return
+        ref, ts = self.column("ref")[row], self.column("ts")[row]
+        if ts < agg["ref_last"].get(ref, ts):
+            agg["mttr_dirty"] = True
+            return
+        agg["ref_last"][ref] = ts
+        if status == FAIL_STATUS:
+            agg["open"].setdefault(ref, (ts, self.column("owner")[row]))
+        elif ref in agg["open"]:
+            start, owner = agg["open"].pop(ref)
+            incidents = agg["incidents"]
+            incidents["owner"].append(owner)
+            incidents["start"].append(start)
+            incidents["end"].append(ts)
+
+    def _replay_all(self):
+        agg = self.aggregates
+        agg.update(open={}, ref_last={}, mttr_dirty=False,
+                   incidents={name: array.array(typecode) for name, typecode in INCIDENT_COLUMNS})
+        status_rows = self.postings("status")
+        rows = []
+        for name in (FAIL_STATUS, PASS_STATUS):
+            sid = self.dicts["status"].get(name)
+            if sid is not None:
+                rows.extend(status_rows.get(sid, ()))
+        ref, ts = self.column("ref"), self.column("ts")
+        rows.sort(key=lambda r: (ref[r], ts[r], r))
+        for row in rows:
+            self._replay(row, agg)
+
+    def _rebuild(self):
+        """Recompute aggregates from the columns (labels are not stored per row and are lost)."""
+        self.aggregates = self._empty_aggregates()
+        self.aggregates["mttr_dirty"] = True
+        for row in range(self.rows):
+            self._aggregate(row)
+        self._replay_all()
+
+    def commit(self):
+        """Persist new rows: append columns / dictionaries / dedup hashes, rewrite indexes, then meta."""
+        if self.rows == self._committed:
+            self._write_meta()
+            return
+        if self.aggregates["mttr_dirty"]:
+            self._replay_all()
+        for name, _ in COLUMNS:
+            col = self.column(name)
+            self._append_bytes(f"col_{name}.bin", self._committed * col.itemsize, col[self._committed:].tobytes())
+        extents = self.meta["extents"]
+        for name, dictionary in self.dicts.items():
+            count, size = extents.get(f"dict_{name}", (0, 0))
+            new = "".join(json.dumps(v) + "\n" for v in dictionary.values[count:]).encode("utf-8")
+            extents[f"dict_{name}"] = (len(dictionary.values), size + self._append_bytes(f"dict_{name}.txt", size, new))
+        if self._seen is not None:
+            count, size = extents.get("seen", (0, 0))
+            extents["seen"] = (count + len(self._seen_new), size + self._append_bytes("seen.bin", size, self._seen_new.tobytes()))
+            self._seen_new = array.array("q")
+        for name in INDEXED:
+            self._write_atomic(f"postings_{name}.bin", self._pack_postings(self.postings(name)))
+        aggregates = json.dumps({"rows": self.rows, "data": self.aggregates}, default=array.array.tolist, separators=(",", ":"))
+        self._write_atomic("aggregates.json", aggregates.encode("utf-8"))
+        self._committed = self.rows
+        self._write_meta()
+
+    def _append_bytes(self, name, committed_size, data):
+        """Truncate `name` to its committed size (drops a torn tail) and append `data`."""
+        path = self._path(name)
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.truncate(committed_size)
+            f.seek(committed_size)
+            f.write(data)
+        return len(data)
+
+    def _write_meta(self):
+        self.meta["rows"] = self.rows
+        self._write_atomic("meta.json", json.dumps(self.meta, separators=(",", ":")).encode("utf-8"))
+
+    # Sources
+
+    def ingest(self, paths):
+        """Incrementally ingest files / directories. Returns {"files", "added", "duplicates", "skipped"}."""
+        stats = collections.Counter(files=0, added=0, duplicates=0, skipped=0)
+        for path in _source_files(paths):
+            events = self._read_source(path, stats)
+            if events is None:
+                continue
+            stats["files"] += 1
+            for event in events:
+                if event is None:
+                    stats["skipped"] += 1
+                elif self.add(event):
+                    stats["added"] += 1
+                else:
+                    stats["duplicates"] += 1
+        self.commit()
+        return dict(stats)
+
+    def _read_source(self, path, stats):
+        """Events from `path` not ingested yet, or None when the file is unchanged / unknown."""
+        files = self.meta["files"]
+        st = os.stat(path)
+        if path.endswith(".ndjson"):
+            saved = files.get(path, {})
+            offset = saved.get("offset", 0)
+            if offset and (saved.get("file") != [st.st_dev, st.st_ino] or st.st_size < offset or saved.get("head") != _head_digest(path, offset)):
+                # Claimed and recreated (archival, friction_log.claim/release): the old offset may land
+                # mid-record in the new file even once it has grown past it. Inodes are reused, so the
+                # first bytes are compared too. Dedup keeps the re-read safe.
+                offset = 0
+            if st.st_size == offset:
+                return None
+            records, next_offset = friction_log.read(path, offset)
+            files[path] = {"offset": next_offset, "file": [st.st_dev, st.st_ino], "head": _head_digest(path, next_offset)}
+            return list(events_from_archive(records))
+
+        mark = {"size": st.st_size, "mtime": st.st_mtime}
+        if files.get(path) == mark:
+            return None
+        files[path] = mark
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[WARN] Skipping unreadable telemetry file {path}: {e}", file=sys.stderr)
+            stats["skipped"] += 1
+            return None
+        if isinstance(data, list):
+            return list(events_from_archive(e for e in data if isinstance(e, dict)))
+        if isinstance(data, dict) and "trace_id" in data and "status" in data:
+            return [event_from_trace(data)]
+        print(f"[WARN] Skipping {path}: neither a telemetry batch nor a Flight Recorder payload", file=sys.stderr)
+        stats["skipped"] += 1
+        return None
+
+    # Queries
+
+    def _day_range(self, days, now=None):
+        if not days:
+            return None
+        return int((now or time.time()) // 86400) - days + 1
+
+    def _select(self, first_day=None, **filters):
+        """Row ids matching all filters (string values), driven by the smallest posting list.
+
+        The day range is sized from the aggregates, so its postings load only when it wins.
+        """
+        candidates = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            fid = self.dicts[name].get(value)
+            if fid is None:
+                return []
+            rows = self.postings(name).get(fid, ())
+            candidates.append((len(rows), name, fid, rows))
+        if first_day is not None:
+            in_range = sum(sum(c.values()) for day, c in self.aggregates["day_loops"].items() if day >= first_day)
+            candidates.append((in_range, "day", first_day, None))
+        if not candidates:
+            return range(self.rows)
+
+        candidates.sort(key=lambda c: c[0])
+        _, name, _, rows = candidates[0]
+        if rows is None:
+            rows = [r for day, part in self.postings("day").items() if day >= first_day for r in part]
+        for _, name, wanted, _ in candidates[1:]:
+            col = self.column(name)
+            if name == "day":
+                rows = [r for r in rows if col[r] >= wanted]
+            else:
+                rows = [r for r in rows if col[r] == wanted]
+        return rows
+
+    def top_fingerprints(self, days=7, owner=None, status=None, limit=10, now=None):
+        """Most frequent fingerprints over the last `days` calendar days (UTC, including today)."""
+        first_day = self._day_range(days, now)
+        if owner is None and status is None:
+            counts = collections.Counter()
+            for day, per_day in self.aggregates["day_fingerprints"].items():
+                if first_day is None or day >= first_day:
+                    counts.update(per_day)
+        else:
+            fp = self.column("fingerprint")
+            counts = collections.Counter(fp[r] for r in self._select(first_day, owner=owner, status=status))
+        names, agg = self.dicts["fingerprint"].values, self.aggregates
+        return [
+            {"fingerprint": names[fid], "count": n, "label": agg["labels"].get(fid), "last_seen": agg["last_seen"].get(fid)}
+            for fid, n in counts.most_common(limit)
+        ]
+
+    def loop_distribution(self, days=None, owner=None, status=None, now=None):
+        """[(loop_count, events)] ascending."""
+        first_day = self._day_range(days, now)
+        if owner is None and status is None:
+            counts = collections.Counter()
+            for day, per_day in self.aggregates["day_loops"].items():
+                if first_day is None or day >= first_day:
+                    counts.update(per_day)
+        else:
+            loops = self.column("loop_count")
+            counts = collections.Counter(loops[r] for r in self._select(first_day, owner=owner, status=status))
+        return sorted(counts.items())
+
+    def mttr_by_owner(self, days=30, now=None):
+        """Mean / median time to recovery per owner for incidents resolved in the window.
+
+        An incident opens at the first `Error` trace on a branch and closes at the next `Ok`
+        trace on that branch; it is attributed to the owner of the opening failure.
+        """
+        if self.aggregates["mttr_dirty"]:
+            self._replay_all()
+        first_day = self._day_range(days, now)
+        since = first_day * 86400 if first_day is not None else None
+        incidents = self.aggregates["incidents"]
+        durations = collections.defaultdict(list)
+        for owner, start, end in zip(incidents["owner"], incidents["start"], incidents["end"]):
+            if since is None or end >= since:
+                durations[owner].append((end - start) / 3600)
+        open_counts = collections.Counter(owner for _, owner in self.aggregates["open"].values())
+        owners = self.dicts["owner"].values
+        result = [
+            {
+                "owner": owners[oid],
+                "incidents": len(hours),
+                "mean_hours": round(statistics.fmean(hours), 3),
+                "median_hours": round(statistics.median(hours), 3),
+                "open": open_counts.get(oid, 0),
+            }
+            for oid, hours in durations.items()
+        ]
+        return sorted(result, key=lambda r: r["mean_hours"], reverse=True)
+
+    def stats(self):
+        size = sum(os.path.getsize(self._path(n)) for n in os.listdir(self.directory) if os.path.isfile(self._path(n)))
+        days = self.aggregates["day_fingerprints"]
+        return {
+            "rows": self.rows,
+            "files": len(self.meta["files"]),
+            "distinct": {name: len(d.values) for name, d in self.dicts.items()},
+            "first_day": _day_str(min(days)) if days else None,
+            "last_day": _day_str(max(days)) if days else None,
+            "bytes": size,
+        }
+
+def _day_str(day):
+    return datetime.datetime.fromtimestamp(day * 86400, datetime.timezone.utc).strftime("%Y-%m-%d")
+
+def _source_files(paths):
+    """Telemetry files under `paths` in a stable order (blob bodies and claimed stores excluded)."""
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d != "blobs")
+            for name in sorted(files):
+                if name.endswith(".ndjson") or (name.endswith(".json") and name.startswith(("telemetry_", "trace_"))):
+                    yield os.path.join(root, name)
+
+def sync_gcs(uri, cache_dir):
+    """Mirror archived telemetry from `uri` into `cache_dir` (gsutil only copies new / changed objects)."""
+    os.makedirs(cache_dir, exist_ok=True)
+    cmd = ["gsutil", "-m", "-q", "rsync", "-r", "-x", rf"(^|.*/){BLOB_PREFIX}/.*", uri, cache_dir]
+    try:
+        subprocess.run(cmd, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"[ERROR] gsutil rsync from {uri} failed: {e}")
+        return False
+    return True
+
+def _print_rows(rows, as_json, formatter, elapsed_ms):
+    if as_json:
+        print(json.dumps(rows, indent=2))
+    else:
+        for row in rows:
+            print(formatter(row))
+    print(f"[INFO] {len(rows)} row(s) in {elapsed_ms:.1f} ms", file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Antigravity Triage Analytics over archived telemetry")
+    parser.add_argument("--store", default=STORE_DIR, help="Analytics store directory")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Ingest telemetry_*.json / trace_*.json / *.ndjson (files or directories)")
+    ingest.add_argument("paths", nargs="*", help="Local files or directories")
+    ingest.add_argument("--gcs", action="append", default=[], help="gs:// prefix to mirror first (repeatable)")
+
+    top = sub.add_parser("top", help="Top recurring fingerprints")
+    top.add_argument("--days", type=int, default=7, help="Calendar days including today (0 = all)")
+    top.add_argument("--owner")
+    top.add_argument("--status", help="e.g. Error, Ok, friction")
+    top.add_argument("--limit", type=int, default=10)
+
+    mttr = sub.add_parser("mttr", help="Mean time to recovery by owner")
+    mttr.add_argument("--days", type=int, default=30, help="Incidents resolved in the last N days (0 = all)")
+
+    loops = sub.add_parser("loops", help="loop_count distribution")
+    loops.add_argument("--days", type=int, default=0)
+    loops.add_argument("--owner")
+    loops.add_argument("--status")
+
+    sub.add_parser("stats", help="Store size and coverage")
+    args = parser.parse_args()
+
+    store = TriageStore(args.store)
+    if args.command == "ingest":
+        paths = list(args.paths)
+        for uri in args.gcs:
+            cache = os.path.join(args.store, "gcs_cache", uri.replace("gs://", "").strip("/").replace("/", "_"))
+            if sync_gcs(uri, cache):
+                paths.append(cache)
+        if not paths:
+            parser.error("nothing to ingest: pass paths and/or --gcs")
+        start = time.perf_counter()
+        result = store.ingest(paths)
+        print(f"[INFO] Ingested {result['added']} event(s) from {result['files']} new/changed file(s) "
+              f"({result['duplicates']} duplicate(s), {result['skipped']} skipped) in {time.perf_counter() - start:.2f}s; "
+              f"{store.rows} event(s) total.")
+        sys.exit(0)
+
+    start = time.perf_counter()
+    if args.command == "top":
+        rows = store.top_fingerprints(args.days, args.owner, args.status, args.limit)
+        _print_rows(rows, args.json, lambda r: f"{r['count']:>8}  {r['fingerprint'][:12]}  {_day_str(int(r['last_seen'] // 86400)) if r['last_seen'] else '-':10}  {r['label'] or '-'}",
+                    (time.perf_counter() - start) * 1000)
+    elif args.command == "mttr":
+        rows = store.mttr_by_owner(args.days)
+        _print_rows(rows, args.json, lambda r: f"{r['owner']:<32} {r['incidents']:>5} incident(s)  mean {r['mean_hours']:.2f}h  median {r['median_hours']:.2f}h  open {r['open']}",
+                    (time.perf_counter() - start) * 1000)
+    elif args.command == "loops":
+        rows = [{"loop_count": k, "events": n} for k, n in store.loop_distribution(args.days, args.owner, args.status)]
+        total = sum(r["events"] for r in rows) or 1
+        _print_rows(rows, args.json, lambda r: f"loop {r['loop_count']:>3}  {r['events']:>8}  {r['events'] * 100 / total:5.1f}%",
+                    (time.perf_counter() - start) * 1000)
+    else:
+        print(json.dumps(store.stats(), indent=2))
@@ -1,72 +1,94 @@
 import os
+import sys
 import json
 import time
-from datetime import datetime
-from google.cloud import storage
+
+# Shared observability layer: hydrated into .agent/observability, or templates/observability in a source checkout
+_HERE = os.path.dirname(os.path.abspath(__file__))
+for _root in (os.path.join(_HERE, '..'), os.path.join(_HERE, '..', '.agent')):
+    if os.path.isdir(os.path.join(_root, 'observability')):
+        sys.path.append(os.path.abspath(_root))
+        break
+from observability import profiling, friction_log
 
 # CONFIGURATION
 # The bucket name must be set in the environment
 BUCKET_NAME = os.getenv("ANTIGRAVITY_LOG_BUCKET")
 PROJECT_ID = os.getenv("GCP_PROJECT_ID")
-LOG_FILE = "docs/SDLC_Friction_Log.md"
+
+def to_archive_entries(records):
+    """Structured friction records -> archive entries (field names kept for existing consumers)."""
+    project = PROJECT_ID or "unknown-project"
+    return [
+        {
+            "project": project,
+            "timestamp": r.get("ts"),
+            "date": r.get("date"),
+            "trace_id": r.get("trace_id"),
+            "loop_count": r.get("loop_count"),
+            "error": r.get("error"),
+            "cause": r.get("cause"),
+            "agent": r.get("agent"),
+        }
+        for r in records
+    ]
 
 def archive_to_bucket():
     if not BUCKET_NAME:
         print("[WARN] Skipped: ANTIGRAVITY_LOG_BUCKET env var not set.")
         return
 
-    # Initialize GCS Client
+    # Initialize GCS Client (imported here so the hook stays fast when there is nothing to do)
     try:
-        storage_client = storage.Client(project=PROJECT_ID)
-        bucket = storage_client.bucket(BUCKET_NAME)
+        from google.cloud import storage
+    except ImportError:
+        print("[ERROR] google-cloud-storage not installed.")
+        return
+    try:
+        with profiling.phase("gcs_client"):
+            storage_client = storage.Client(project=PROJECT_ID)
+            bucket = storage_client.bucket(BUCKET_NAME)
     except Exception as e:
         print(f"[ERROR] Auth Error: {e}")
         return
 
-    # Parse Log File
-    entries = []
-    try:
-        with open(LOG_FILE, "r") as f:
-            lines = f.readlines()
-        
-        # Skip header
-        for line in lines[2:]:
-            if "|" in line:
-                parts = [p.strip() for p in line.split("|") if p.strip()]
-                if len(parts) >= 5:
-                    entries.append({
-                        "project": PROJECT_ID or "unknown-project",
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "trace_id": parts[1],
-                        "loop_count": parts[2],
-                        "error": parts[3],
-                        "cause": parts[4]
-                    })
-    except FileNotFoundError:
-        print("[WARN] Log file not found.")
-        return
+    # Hand-written rows from before the structured store are migrated once
+    if not os.path.exists(friction_log.STORE_PATH):
+        friction_log.import_markdown()
 
-    if not entries:
+    # Claim the store: agents keep appending to a fresh file while this batch uploads
+    claimed = friction_log.claim()
+    if not claimed:
         print("[INFO] No new logs to archive.")
         return
+    with profiling.phase("read_records"):
+        records, _ = friction_log.read(claimed)
+    entries = to_archive_entries(records)
 
     # Create a unique blob name for this sync event
     # Folder Structure: project-id/YYYY-MM-DD/timestamp_trace.json
     timestamp = int(time.time())
     blob_name = f"{PROJECT_ID}/telemetry_{timestamp}.json"
     
-    blob = bucket.blob(blob_name)
-    blob.upload_from_string(
-        data=json.dumps(entries, indent=2),
-        content_type='application/json'
-    )
+    try:
+        with profiling.phase("upload"):
+            blob = bucket.blob(blob_name)
+            blob.upload_from_string(
+                data=json.dumps(entries, indent=2),
+                content_type='application/json'
+            )
+    except Exception as e:
+        friction_log.release(claimed, archived=False)
+        print(f"[ERROR] Upload failed ({e}). Records returned to the friction log.")
+        return
     
     print(f"[SUCCESS] Archived {len(entries)} events to gs://{BUCKET_NAME}/{blob_name}")
     
-    # Rotate Log (Clear file)
-    with open(LOG_FILE, "w") as f:
-        f.write("# SDLC Friction Log (Rule 07)\n| Date | Trace ID | Loop Count | Error Summary | Root Cause |\n| :--- | :--- | :--- | :--- | :--- |\n")
+    # Rotate Log: drop the archived batch and re-render the markdown view
+    friction_log.release(claimed)
+    friction_log.render()
     print("[INFO] Local log file rotated.")
 
 if __name__ == "__main__":
+    profiling.start("archive_telemetry")
     archive_to_bucket()
@@ -17,6 +17,16 @@ cat <<EOT > $PRE_PUSH
 # Antigravity Pre-Push Hook
 # Runs QA Suite before allowing push.
 
+# Protocol F: when every pushed commit touches only docs, the Sentinel lets the push skip QA.
+# governance_client batches the commits into one OPA query, caches decisions and evaluates
+# the policy in-process when the container is down.
+if [ -f .agent/sentinel/governance_client.py ] && git rev-parse -q --verify "@{u}" >/dev/null; then
+    if python3 .agent/sentinel/governance_client.py --commits "@{u}..HEAD"; then
+        echo "[PASS] Documentation-only push (Protocol F). Skipping QA."
+        exit 0
+    fi
+fi
+
 echo "[HOOK] Running Antigravity QA Suite..."
 ./scripts/run_qa.sh
 
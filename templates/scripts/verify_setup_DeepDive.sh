@@ -34,7 +34,8 @@ done
 
 # Ensure logs exist for testing
 mkdir -p docs
-echo "| 2026-01-21 | TRACE-SETUP-001 | 1 | Setup Verification | Deep Dive Test |" > docs/SDLC_Friction_Log.md
+python3 templates/observability/friction_log.py append --trace-id TRACE-SETUP-001 --loop-count 1 \
+    --error "Setup Verification" --cause "Deep Dive Test" --render
 
 echo "--- 1. Connectivity Check: Redis ---"
 # Verify connection using python client directly
@@ -3,10 +3,10 @@ import sys
 import argparse
 import json
 import time
-try:
-    import redis
-except ImportError:
-    redis = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+from observability import telemetry, profiling
 
 # Antigravity Cost Guard (Rule 08)
 # Blocks execution if solvency is not guaranteed.
@@ -38,49 +38,11 @@ def load_global_config():
     else:
         print("[INFO] No Global Config found. Using Defaults.")
 
-class MockRedis:
-    """R 1.3 Budget Lease Model: Mock interface for Redis"""
-    def __init__(self):
-        print("[INFO] Connecting to Redis (Mock)...")
-        self.connected = True
-    
-    def set(self, key, value, ex=None):
-        print(f"[REDIS] SET {key} = {value} (EX={ex})")
-        return True
-
 def get_redis_client():
-    """Factory: Returns Real Redis if configured, else Mock."""
-    url = os.getenv("REDIS_URL")
-    host = os.getenv("REDIS_HOST")
-    port = int(os.getenv("REDIS_PORT", 6379))
-    user = os.getenv("REDIS_USER", "default")
-    password = os.getenv("REDIS_PASSWORD")
-    
-    if not redis:
-        return MockRedis()
-        
-    try:
-        if url:
-            client = redis.Redis.from_url(url, socket_timeout=5, decode_responses=True)
-            # Ping to verify connection
-            client.ping()
-            return client
-        elif host:
-            client = redis.Redis(
-                host=host, 
-                port=port, 
-                username=user, 
-                password=password, 
-                db=0, 
-                socket_timeout=5, 
-                decode_responses=True
-            )
-            client.ping()
-            return client
-    except Exception as e:
-        print(f"[WARN] Real Redis connection failed: {e}. Falling back to Mock.")
-    return MockRedis()
+    """Factory: the shared Brain client, or the in-memory Brain when offline."""
+    return redis_pool.get_client()
 
+@telemetry.traced("sentinel.solvency_check")
 def check_solvency(projected_cost_units, tier):
     """R 1.1 + R 1.2: Hardware-Aware Solvency Check"""
     load_global_config()
@@ -88,9 +50,10 @@ def check_solvency(projected_cost_units, tier):
     # QA Hardening: Prioritize Verified Global Baseline from Redis
     r = get_redis_client()
     redis_spend = None
-    if not isinstance(r, MockRedis):
+    if not redis_pool.is_memory(r):
         try:
-            val = r.get("global:current_spend")
+            with telemetry.span("redis.get", key="global:current_spend"):
+                val = r.get("global:current_spend")
             if val is not None:
                 redis_spend = float(val)
                 print(f"[INFO] Using Verified Redis Baseline: ${redis_spend}")
@@ -102,6 +65,7 @@ def check_solvency(projected_cost_units, tier):
     rate = TIER_PRICING.get(tier)
     if not rate:
         print(f"[ERROR] Invalid Hardware Tier: {tier}. Available: {list(TIER_PRICING.keys())}")
+        telemetry.mark_error(f"invalid tier {tier}")
         sys.exit(1)
         
     projected_cost = float(projected_cost_units) * rate
@@ -112,14 +76,17 @@ def check_solvency(projected_cost_units, tier):
     if total > MONTHLY_CAP:
         print(f"[BLOCK] Insolvency Triggered! Total ${total:.2f} > Cap ${MONTHLY_CAP:.2f}")
         print("Protocol: Request Override or Optimize Plan.")
+        telemetry.mark_error("insolvent")
         sys.exit(1)
     else:
         print(f"[PASS] Solvency Validated. Margin: ${MONTHLY_CAP - total:.2f}")
         
         # R 1.3: Acquire Lease
-        r = get_redis_client()
         lease_id = "lg-" + os.urandom(4).hex()
-        r.set(f"lease:{lease_id}", projected_cost, ex=3600)
+        with telemetry.span("redis.set", key="lease"):
+            r.set(f"lease:{lease_id}", projected_cost, ex=3600)
+        if redis_pool.is_memory(r):
+            print(f"[REDIS] SET lease:{lease_id} = {projected_cost} (EX=3600, in-memory Brain)")
         print(f"LEASE_TOKEN: {lease_id}")
 
 if __name__ == "__main__":
@@ -129,4 +96,7 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    check_solvency(args.units, args.tier)
+    profiling.start("cost_guard")
+    telemetry.init("antigravity-sentinel")
+    with profiling.phase("check_solvency"):
+        check_solvency(args.units, args.tier)
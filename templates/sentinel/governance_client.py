@@ -0,0 +1,309 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+import http.client
+import urllib.parse
+
+# Antigravity Governance Client (Protocol F)
+# Batched, cached `skip_gates` decisions against the Sentinel (OPA), with a compiled
+# in-process evaluator for the simple path rules when the container is down.
+
+OPA_URL = os.getenv("ANTIGRAVITY_OPA_URL", "http://localhost:8181")
+DECISION = "skip_gates"
+CACHE_PATH = os.path.expanduser(os.getenv("ANTIGRAVITY_GOVERNANCE_CACHE", "~/.antigravity/governance_cache.json"))
+CACHE_MAX_ENTRIES = 4096
+OPA_TIMEOUT = 2
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+POLICY_DIR_CANDIDATES = [
+    os.getenv("ANTIGRAVITY_POLICY_DIR", ""),
+    os.path.join(_HERE, "..", "policies"), # Installed: .agent/sentinel -> .agent/policies
+    os.path.join(_HERE, "..", "..", ".agent", "policies"), # Source: templates/sentinel
+]
+
+PACKAGE_RE = re.compile(r"^\s*package\s+([\w.]+)", re.M)
+RULE_HEAD_RE = re.compile(r"^is_safe\(", re.M) # Rule heads are top-level; calls are indented
+PATH_RULE_RE = re.compile(
+    r'is_safe\(\s*(\w+)\s*\)\s*if\s*\{\s*(startswith|endswith)\(\s*\1\s*,\s*"((?:[^"\\]|\\.)*)"\s*\)\s*\}'
+)
+
+class PathRuleTrie:
+    """Prefix trie plus reversed-suffix trie: one pass over a path answers every rule."""
+
+    def __init__(self):
+        self.prefixes = {}
+        self.suffixes = {}
+
+    @staticmethod
+    def _insert(root, text):
+        node = root
+        for ch in text:
+            node = node.setdefault(ch, {})
+        node[None] = True # Terminal marker
+
+    @staticmethod
+    def _walk(root, chars):
+        node = root
+        if None in node:
+            return True
+        for ch in chars:
+            node = node.get(ch)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+    def add_prefix(self, prefix):
+        self._insert(self.prefixes, prefix)
+
+    def add_suffix(self, suffix):
+        self._insert(self.suffixes, reversed(suffix))
+
+    def is_safe(self, path):
+        return self._walk(self.prefixes, path) or self._walk(self.suffixes, reversed(path))
+
+def policy_hash(modules, packages=None):
+    """Order-independent hash of Rego modules (optionally only those declaring one of `packages`).
+
+    Local files and the modules OPA serves (`GET /v1/policies`) hash alike when their
+    sources match, whatever they are named.
+    """
+    digests = []
+    for text in modules:
+        match = PACKAGE_RE.search(text)
+        if packages is None or (match and match.group(1) in packages):
+            digests.append(hashlib.sha256(text.encode("utf-8")).hexdigest())
+    return hashlib.sha256("\n".join(sorted(digests)).encode("utf-8")).hexdigest()
+
+def load_policy(policy_dir=None):
+    """Read every .rego file. Returns (source_text, bundle_hash)."""
+    if policy_dir is None:
+        policy_dir = next((d for d in POLICY_DIR_CANDIDATES if d and os.path.isdir(d)), None)
+    sources = []
+    if policy_dir:
+        for name in sorted(os.listdir(policy_dir)):
+            if name.endswith(".rego"):
+                with open(os.path.join(policy_dir, name), "r") as f:
+                    sources.append(f.read())
+    return "\n".join(sources), policy_hash(sources)
+
+def compile_policy(rego_text):
+    """Compile `is_safe(path)` startswith/endswith rules into a trie.
+
+    Returns (trie, complete). `complete` is False when some `is_safe` rule could not be
+    compiled; the trie then under-approximates "safe", so its verdicts are only trusted
+    in one direction (see GovernanceClient.reduce_input).
+    """
+    trie = PathRuleTrie()
+    compiled = 0
+    for _, op, literal in PATH_RULE_RE.findall(rego_text):
+        literal = json.loads(f'"{literal}"') # Unescape Rego string literal
+        if op == "startswith":
+            trie.add_prefix(literal)
+        else:
+            trie.add_suffix(literal)
+        compiled += 1
+    return trie, compiled == len(RULE_HEAD_RE.findall(rego_text))
+
+class GovernanceClient:
+    def __init__(self, opa_url=OPA_URL, policy_dir=None, cache_path=CACHE_PATH):
+        rego_text, self.bundle_hash = load_policy(policy_dir)
+        self.trie, self.complete = compile_policy(rego_text)
+        match = PACKAGE_RE.search(rego_text)
+        self.package = match.group(1) if match else "antigravity.governance"
+        self.decision_path = f"{self.package.replace('.', '/')}/{DECISION}"
+        self.packages = set(PACKAGE_RE.findall(rego_text))
+        self.served_hash = None # Hash of the same packages as OPA serves them (fetch_served_hash)
+        self.opa = urllib.parse.urlsplit(opa_url)
+        self.cache_path = cache_path
+        self.cache = self._load_cache()
+        self.stats = {"cache_hits": 0, "opa_queries": 0, "fallback": 0}
+
+    # --- Decision cache (keyed by policy bundle + sorted file set) ---
+
+    def _load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        if len(self.cache) > CACHE_MAX_ENTRIES:
+            # Dicts keep insertion order: drop the oldest decisions
+            self.cache = dict(list(self.cache.items())[-CACHE_MAX_ENTRIES:])
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def cache_key(self, files):
+        # Decisions belong to the policy that produced them: OPA's when known, else the local copy
+        digest = hashlib.sha256((self.served_hash or self.bundle_hash).encode("utf-8"))
+        for path in sorted(set(files)):
+            digest.update(b"\0" + path.encode("utf-8"))
+        return digest.hexdigest()
+
+    # --- Evaluation ---
+
+    def evaluate_local(self, files):
+        """Compiled fallback: skip_gates iff there are files and every one is safe."""
+        return len(files) > 0 and all(self.trie.is_safe(path) for path in files)
+
+    def policy_in_sync(self):
+        """True when OPA serves exactly the local policy the trie was compiled from."""
+        return self.served_hash == self.bundle_hash
+
+    def reduce_input(self, files):
+        """Drop paths the trie proves safe; keep one so `count(input.files) > 0` still holds.
+
+        Sound only while OPA serves the policy the trie was compiled from, and because the
+        rule is a conjunction over files: removing known-safe paths never changes the
+        verdict. An edited or stale local copy sends the full input instead.
+        """
+        unique = sorted(set(files))
+        if not self.policy_in_sync():
+            return unique
+        residual = [path for path in unique if not self.trie.is_safe(path)]
+        if not residual and unique:
+            residual = unique[:1]
+        return residual
+
+    def fetch_served_hash(self):
+        """Hash the modules OPA serves for our packages. Returns False when OPA is unreachable.
+
+        A non-200 answer (e.g. the policy API is not exposed) leaves `served_hash` unset,
+        which only disables pruning.
+        """
+        self.served_hash = None
+        conn = http.client.HTTPConnection(self.opa.hostname, self.opa.port or 8181, timeout=OPA_TIMEOUT)
+        try:
+            conn.request("GET", "/v1/policies")
+            resp = conn.getresponse()
+            raw = resp.read()
+            self.stats["opa_queries"] += 1
+            if resp.status == 200:
+                modules = [m.get("raw", "") for m in json.loads(raw).get("result", [])]
+                self.served_hash = policy_hash(modules, self.packages)
+            return True
+        except (OSError, http.client.HTTPException):
+            return False
+        except ValueError:
+            return True
+        finally:
+            conn.close()
+
+    def _post(self, conn, path, body):
+        conn.request("POST", path, body=json.dumps(body), headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+
+    def _query_opa(self, inputs):
+        """Evaluate {id: files} in one batch call, or sequentially over one keep-alive connection."""
+        conn = http.client.HTTPConnection(self.opa.hostname, self.opa.port or 8181, timeout=OPA_TIMEOUT)
+        try:
+            status, raw = self._post(
+                conn,
+                f"/v1/batch/data/{self.decision_path}",
+                {"inputs": {i: {"files": files} for i, files in inputs.items()}},
+            )
+            self.stats["opa_queries"] += 1
+            if status == 200:
+                responses = json.loads(raw).get("responses", {})
+                return {i: bool(responses.get(i, {}).get("result", False)) for i in inputs}
+
+            # Batch API unavailable (open-source OPA): fall back to single decisions
+            results = {}
+            for i, files in inputs.items():
+                status, raw = self._post(conn, f"/v1/data/{self.decision_path}", {"input": {"files": files}})
+                self.stats["opa_queries"] += 1
+                if status != 200:
+                    raise RuntimeError(f"OPA returned HTTP {status}")
+                results[i] = bool(json.loads(raw).get("result", False))
+            return results
+        finally:
+            conn.close()
+
+    def decide_many(self, file_sets):
+        """Return one skip_gates decision per file set, e.g. per commit in a push."""
+        reachable = self.fetch_served_hash()
+        decisions = [None] * len(file_sets)
+        misses = {}
+        for index, files in enumerate(file_sets):
+            key = self.cache_key(files)
+            if key in self.cache:
+                self.stats["cache_hits"] += 1
+                decisions[index] = self.cache[key]
+            elif not files:
+                decisions[index] = False # `count(input.files) > 0` can never hold
+            else:
+                misses.setdefault(key, []).append(index)
+
+        if misses:
+            inputs = {key: self.reduce_input(file_sets[indexes[0]]) for key, indexes in misses.items()}
+            try:
+                if not reachable:
+                    raise OSError(f"no answer from {self.opa.netloc}")
+                results = self._query_opa(inputs)
+                self.cache.update(results)
+                self._save_cache()
+            except (OSError, http.client.HTTPException, RuntimeError, ValueError) as e:
+                print(f"[WARN] Sentinel unreachable ({e}). Using compiled fallback evaluator.")
+                if not self.complete:
+                    print("[WARN] Some is_safe rules could not be compiled; fallback is stricter than the policy.")
+                self.stats["fallback"] += len(misses)
+                # Not cached: the fallback may be stricter than OPA if some rules were not compiled
+                results = {key: self.evaluate_local(inputs[key]) for key in misses}
+            for key, indexes in misses.items():
+                for index in indexes:
+                    decisions[index] = results[key]
+        return decisions
+
+    def decide(self, files):
+        return self.decide_many([files])[0]
+
+def commit_file_sets(rev_range):
+    """Files touched by each commit in `rev_range` (oldest first)."""
+    shas = subprocess.check_output(["git", "rev-list", "--reverse", rev_range], text=True).split()
+    return shas, [
+        subprocess.check_output(["git", "diff-tree", "--no-commit-id", "--name-only", "-r", "--root", sha], text=True).splitlines()
+        for sha in shas
+    ]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Antigravity Governance Client (skip_gates)")
+    parser.add_argument("files", nargs="*", help="Changed file paths")
+    parser.add_argument("--commits", help="Evaluate each commit in a git range, e.g. @{u}..HEAD")
+    parser.add_argument("--stdin", action="store_true", help="Read newline-separated paths from stdin")
+    parser.add_argument("--local", action="store_true", help="Skip OPA and use the compiled evaluator")
+    args = parser.parse_args()
+
+    client = GovernanceClient()
+    if args.commits:
+        labels, file_sets = commit_file_sets(args.commits)
+    else:
+        files = list(args.files)
+        if args.stdin:
+            files.extend(line.strip() for line in sys.stdin if line.strip())
+        labels, file_sets = ["input"], [files]
+
+    if args.local:
+        decisions = [client.evaluate_local(files) for files in file_sets]
+    else:
+        decisions = client.decide_many(file_sets)
+
+    for label, files, decision in zip(labels, file_sets, decisions):
+        print(f"[GOVERNANCE] {label[:12]}: skip_gates={str(decision).lower()} ({len(files)} files)")
+    print(f"[INFO] Stats: {json.dumps(client.stats)}")
+    # Exit 0 only when every commit may skip the gates
+    sys.exit(0 if decisions and all(decisions) else 1)
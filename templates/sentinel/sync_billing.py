@@ -2,46 +2,19 @@ import os
 import sys
 import json
 import argparse
-try:
-    import redis
-except ImportError:
-    redis = None
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from brain import redis_pool
+from observability import telemetry, profiling
 
 # Antigravity Billing Sync (Rule 08 Extension)
 # Fetches monthly spend from GCP and persists to Redis as a verifiable baseline.
 
 def get_redis_client():
-    """Factory: Returns Real Redis if configured, else None."""
-    url = os.getenv("REDIS_URL")
-    host = os.getenv("REDIS_HOST")
-    port = int(os.getenv("REDIS_PORT", 6379))
-    user = os.getenv("REDIS_USER", "default")
-    password = os.getenv("REDIS_PASSWORD")
-    
-    if not redis:
-        return None
-        
-    try:
-        if url:
-            client = redis.Redis.from_url(url, socket_timeout=5, decode_responses=True)
-            client.ping()
-            return client
-        elif host:
-            client = redis.Redis(
-                host=host, 
-                port=port, 
-                username=user, 
-                password=password, 
-                db=0, 
-                socket_timeout=5, 
-                decode_responses=True
-            )
-            client.ping()
-            return client
-    except:
-        return None
-    return None
+    """Factory: the shared Brain client, or None. A baseline must never land in memory only."""
+    return redis_pool.get_client(fallback=False)
 
+@telemetry.traced("billing.fetch_spend")
 def fetch_gcp_spend(billing_account=None):
     """
     Fetches the current month spend from GCP Billing.
@@ -59,13 +32,15 @@ def fetch_gcp_spend(billing_account=None):
     return 125.60 # Mocked current spend baseline
 
 def sync_to_redis(spend):
-    client = get_redis_client()
+    with telemetry.span("redis.connect"):
+        client = get_redis_client()
     if not client:
         print("[ERROR] Redis not connected. Cannot sync billing baseline.")
         sys.exit(1)
     
     # Store with a TTL of 24 hours (86400s) to ensure freshness
-    client.set("global:current_spend", spend, ex=86400)
+    with telemetry.span("redis.set", key="global:current_spend"):
+        client.set("global:current_spend", spend, ex=86400)
     print(f"[SUCCESS] Global Solvency Baseline Synced: ${spend} (Stored in Redis)")
 
 if __name__ == "__main__":
@@ -75,5 +50,9 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    spend = args.force_value if args.force_value is not None else fetch_gcp_spend(args.account)
-    sync_to_redis(spend)
+    profiling.start("sync_billing")
+    telemetry.init("antigravity-sentinel")
+    with profiling.phase("fetch_spend"):
+        spend = args.force_value if args.force_value is not None else fetch_gcp_spend(args.account)
+    with profiling.phase("sync_to_redis"):
+        sync_to_redis(spend)
@@ -0,0 +1,38 @@
+import unittest
+import sys
+import os
+import random
+
+# Add path to find the benchmark suite in templates/benchmarks/
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..", "benchmarks")))
+
+import bench_hot_paths as bench
+
+class TestRegressionGate(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.baseline = [1.0 + rng.uniform(-0.05, 0.05) for _ in range(15)]
+        self.same = [1.0 + rng.uniform(-0.05, 0.05) for _ in range(15)]
+        self.slower = [1.5 + rng.uniform(-0.05, 0.05) for _ in range(15)]
+
+    def test_mann_whitney(self):
+        self.assertLess(bench.mann_whitney_greater(self.slower, self.baseline), 0.001)
+        self.assertGreater(bench.mann_whitney_greater(self.same, self.baseline), bench.ALPHA)
+        self.assertGreater(bench.mann_whitney_greater(self.baseline, self.slower), 0.99)
+        self.assertEqual(bench.mann_whitney_greater([1.0] * 10, [1.0] * 10), 1.0)
+
+    def test_compare_flags_only_significant_slowdowns(self):
+        baseline = {"benchmarks": {"a": {"samples": self.baseline}, "b": {"samples": self.baseline}}}
+        rows = {row[0]: row for row in bench.compare({"a": self.slower, "b": self.same, "c": self.same}, baseline)}
+        self.assertTrue(rows["a"][5])
+        self.assertFalse(rows["b"][5])
+        self.assertIsNone(rows["c"][1]) # New benchmark: reported, never a regression
+        self.assertFalse(rows["c"][5])
+
+    def test_offline_workloads_run(self):
+        self.assertEqual(len(bench.BENCHMARKS["jira.compute_fingerprint"]()()), 200)
+        self.assertEqual(len(bench.BENCHMARKS["archive.read_records"]()()), 2000)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import socket
+import threading
+import subprocess
+
+# Add path to find the daemon and client in templates/observability
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "../observability")))
+
+import bridge_client
+import bridge_daemon
+import jira_bridge
+
+class TestBridgeDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addr = os.path.join(self.tmpdir, "bridge.sock")
+        self.batches = []
+        self.processed = threading.Event()
+
+        def process_batch(batch):
+            self.batches.append(batch)
+            self.processed.set()
+
+        self.daemon = bridge_daemon.BridgeDaemon(self.addr, process_batch=process_batch, batch_window=0.2)
+        self.daemon.start()
+
+    def tearDown(self):
+        self.daemon.stop()
+        os.rmdir(self.tmpdir)
+
+    def test_ping_and_submit(self):
+        self.assertEqual(bridge_client.send({"op": "ping"}, self.addr)["status"], "ok")
+        ack = bridge_client.send({"summary": "Build Failure", "description": "boom"}, self.addr)
+        self.assertEqual(ack, {"status": "queued"})
+        self.assertTrue(self.processed.wait(2))
+        self.assertEqual(self.batches[0][0]["summary"], "Build Failure")
+
+    def test_rejects_event_without_summary(self):
+        self.assertEqual(bridge_client.send({"description": "boom"}, self.addr)["status"], "error")
+
+    def test_concurrent_submitters_are_batched(self):
+        threads = [
+            threading.Thread(target=bridge_client.send, args=({"summary": f"Failure {i % 2}"}, self.addr))
+            for i in range(6)
+        ]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.daemon.stop()
+        self.assertEqual(sum(len(b) for b in self.batches), 6)
+        self.assertLess(len(self.batches), 6)
+
+    def test_unreachable_daemon_returns_none(self):
+        self.assertIsNone(bridge_client.send({"op": "ping"}, os.path.join(self.tmpdir, "missing.sock")))
+
+    def test_broken_exchange_returns_none(self):
+        path = os.path.join(self.tmpdir, "truncated.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        def reply_truncated():
+            conn, _ = server.accept()
+            conn.recv(1024)
+            conn.sendall(b'{"status": "que\n')
+            conn.close()
+        threading.Thread(target=reply_truncated, daemon=True).start()
+        try:
+            self.assertIsNone(bridge_client.send({"summary": "Build Failure"}, path))
+        finally:
+            server.close()
+            os.remove(path)
+
+    def test_group_by_fingerprint(self):
+        events = [{"summary": "A"}, {"summary": "B"}, {"summary": "A", "description": "No Desc"}]
+        groups = bridge_daemon.group_by_fingerprint(events, jira_bridge.compute_fingerprint)
+        self.assertEqual([len(g) for g in groups], [2, 1])
+
+    def test_submitter_context_only_adopts_ci_env(self):
+        saved_path = os.environ.get("PATH")
+        event = {"env": {"TRACE_ID": "t-1", "PATH": "/evil", "JIRA_BASE_URL": "http://attacker"}}
+        with bridge_daemon.submitter_context(event):
+            self.assertEqual(os.environ["TRACE_ID"], "t-1")
+            self.assertEqual(os.environ.get("PATH"), saved_path)
+            self.assertNotEqual(os.environ.get("JIRA_BASE_URL"), "http://attacker")
+        self.assertNotEqual(os.environ.get("TRACE_ID"), "t-1")
+
+    def test_tcp_intake_binds_loopback_only(self):
+        self.assertEqual(bridge_daemon.parse_addr("127.0.0.1:7821"), ("127.0.0.1", 7821))
+        self.assertEqual(bridge_daemon.parse_addr("[::1]:7821"), ("::1", 7821))
+        for addr in ("0.0.0.0:7821", "10.0.0.5:7821", "bridge.internal:7821"):
+            with self.assertRaises(ValueError):
+                bridge_daemon.parse_addr(addr)
+
+    def test_paths_confined_to_submitter_repo(self):
+        repo = tempfile.mkdtemp()
+        try:
+            subprocess.run(["git", "init", "-q", repo], check=True)
+            log = os.path.join(repo, "ci_failure.log")
+            open(log, "w").close()
+            root, paths = bridge_daemon.confine_paths({"cwd": repo, "file": "src/app.py", "log_file": "/etc/passwd"})
+            self.assertEqual(root, os.path.realpath(repo))
+            self.assertEqual(paths, {"file": os.path.join(root, "src", "app.py"), "log_file": None})
+            self.assertEqual(bridge_daemon.confine_paths({"cwd": repo, "log_file": log})[1]["log_file"], os.path.realpath(log))
+            self.assertEqual(bridge_daemon.confine_paths({"cwd": repo, "file": "../outside.py"})[1]["file"], None)
+            # Not submitted from a work tree: nothing is trusted
+            self.assertEqual(bridge_daemon.confine_paths({"cwd": "/", "log_file": "/etc/passwd"}), (None, {"file": None, "log_file": None}))
+        finally:
+            shutil.rmtree(repo)
+
+if __name__ == "__main__":
+    unittest.main()
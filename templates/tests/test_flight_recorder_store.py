@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+
+# Add paths to find flight_recorder_store (templates/observability) and the Brain stand-in (templates/brain)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "../observability")))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from flight_recorder_store import FlightRecorderStore
+from brain.redis_pool import MemoryRedis
+
+def make_state(**overrides):
+    state = {
+        "trace_id": "550e8400-e29b-41d4-a716-446655440000",
+        "status": "PLANNING",
+        "loop_count": 0,
+        "owner": "dev@example.com",
+        "handover_manifest": {"plan": "PLAN.md"},
+        "feedback_chain": [],
+    }
+    state.update(overrides)
+    return state
+
+class TestFlightRecorderStore(unittest.TestCase):
+    def setUp(self):
+        self.client = MemoryRedis()
+        self.store = FlightRecorderStore(self.client, ttl=60)
+        self.trace_id = make_state()["trace_id"]
+        self.store.create(make_state())
+
+    def test_round_trip_and_ttl(self):
+        state = self.store.load(self.trace_id)
+        self.assertEqual(state["status"], "PLANNING")
+        self.assertEqual(state["loop_count"], 0)
+        self.assertEqual(state["handover_manifest"], {"plan": "PLAN.md"})
+        self.assertGreater(self.client.ttl(f"fr:{self.trace_id}"), 0)
+
+    def test_transition_guard_and_loop_count(self):
+        self.assertTrue(self.store.transition(self.trace_id, "PLANNING", "NEEDS_REVISION", feedback=[{"from": "auditor", "verdict": "FAIL", "reason": "cost"}]))
+        self.assertFalse(self.store.transition(self.trace_id, "PLANNING", "PLAN_APPROVED"))
+        state = self.store.load(self.trace_id)
+        self.assertEqual(state["loop_count"], 1)
+        self.assertEqual(state["feedback_chain"], [{"from": "auditor", "verdict": "FAIL", "reason": "cost"}])
+        with self.assertRaises(ValueError):
+            self.store.transition(self.trace_id, "NEEDS_REVISION", "READY_FOR_MERGE")
+
+    def test_update_rejects_transition_and_unknown_fields(self):
+        for changes in ({"status": "PLAN_APPROVED"}, {"loop_count": 0}):
+            with self.assertRaises(ValueError):
+                self.store.update(self.trace_id, changes)
+        self.assertEqual(self.store.load(self.trace_id)["status"], "PLANNING")
+        for changes in ({"reviewer": "qa"}, {"cost_estimate": "cheap"}, {"owner": 7}):
+            with self.assertRaises(ValueError):
+                self.store.update(self.trace_id, changes)
+        self.store.update(self.trace_id, {"owner": "lead@example.com", "cost_estimate": 12})
+        self.assertEqual(self.store.load(self.trace_id)["cost_estimate"], 12.0)
+        self.assertEqual(self.store.load(self.trace_id)["owner"], "lead@example.com")
+
+    def test_manifest_deltas_replay(self):
+        self.store.update(self.trace_id, manifest={"plan": "PLAN_v2.md", "diff": "a.patch"})
+        self.store.update(self.trace_id, manifest={"diff": None})
+        history = self.store.manifest_history(self.trace_id)
+        self.assertEqual([v for v, _ in history], [1, 2, 3])
+        self.assertEqual(history[1][1], {"plan": "PLAN_v2.md", "diff": "a.patch"})
+        self.assertEqual(history[-1][1], self.store.load(self.trace_id)["handover_manifest"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import json
+import random
+import tempfile
+
+# Add path to find flight_recorder_validator in templates/observability
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "../observability")))
+
+import flight_recorder_validator as frv
+
+SCHEMA_PATH = os.path.abspath(os.path.join(current_dir, "../Flight_Recorder_Schema.json"))
+
+def valid_state():
+    return {
+        "trace_id": "550e8400-e29b-41d4-a716-446655440000",
+        "status": "BUILDING",
+        "loop_count": 1,
+        "owner": "dev@example.com",
+        "cost_estimate": 2.5,
+        "handover_manifest": {"plan_md_path": "PLAN.md", "solvency_token": "lg-1a2b3c4d"},
+        "feedback_chain": [{"from": "auditor", "verdict": "PASS", "reason": "ok"}],
+    }
+
+class TestFlightRecorderValidator(unittest.TestCase):
+    def setUp(self):
+        with open(SCHEMA_PATH, "r") as f:
+            self.schema = json.load(f)
+        self.cache_dir = tempfile.mkdtemp()
+        frv._VALIDATORS.clear()
+        self.validate = frv.load_validator(SCHEMA_PATH, cache_dir=self.cache_dir)
+
+    def test_valid_and_invalid_states(self):
+        self.assertEqual(self.validate(valid_state()), [])
+
+        state = valid_state()
+        del state["owner"]
+        state["status"] = "SHIPPED"
+        state["loop_count"] = True # bool is not an integer
+        state["feedback_chain"][0]["verdict"] = "MAYBE"
+        errors = self.validate(state)
+        self.assertIn("$: missing required property 'owner'", errors)
+        self.assertIn("$.loop_count: expected integer", errors)
+        self.assertIn("$.feedback_chain[0].verdict: not one of PASS, FAIL", errors)
+        self.assertTrue(any(e.startswith("$.status: not one of") for e in errors))
+        self.assertEqual(self.validate([]), ["$: expected object"])
+
+    def test_matches_reference_interpreter(self):
+        rng = random.Random(7)
+        mutations = [
+            lambda s: s.pop(rng.choice(list(s))),
+            lambda s: s.__setitem__("status", rng.choice(["PLANNING", "DONE", 3])),
+            lambda s: s.__setitem__("loop_count", rng.choice([2, 2.0, 2.5, "2", None])),
+            lambda s: s.__setitem__("handover_manifest", rng.choice([{}, [], {"preview_url": 1}])),
+            lambda s: s.setdefault("feedback_chain", []).append(rng.choice([{"verdict": "FAIL"}, {"verdict": {}}, "x"])),
+        ]
+        for _ in range(200):
+            state = valid_state()
+            for mutate in rng.sample(mutations, rng.randint(0, 3)):
+                mutate(state)
+            self.assertEqual(self.validate(state), frv.validate_reference(self.schema, state))
+
+    def test_generated_module_is_cached(self):
+        cached = [name for name in os.listdir(self.cache_dir) if name.endswith(".py")]
+        self.assertEqual(len(cached), 1)
+        module_path = os.path.join(self.cache_dir, cached[0])
+        os.utime(module_path, (0, 0))
+        frv._VALIDATORS.clear()
+        self.assertEqual(frv.load_validator(SCHEMA_PATH, cache_dir=self.cache_dir)(valid_state()), [])
+        self.assertEqual(os.path.getmtime(module_path), 0) # Reused, not regenerated
+
+    def test_corrupt_cache_falls_back_and_is_discarded(self):
+        cached = [name for name in os.listdir(self.cache_dir) if name.endswith(".py")]
+        module_path = os.path.join(self.cache_dir, cached[0])
+        with open(module_path, "w") as f:
+            f.write("def validate(obj:\n") # Truncated write
+        frv._VALIDATORS.clear()
+        validate = frv.load_validator(SCHEMA_PATH, cache_dir=self.cache_dir)
+        self.assertEqual(validate(valid_state()), [])
+        self.assertFalse(os.path.exists(module_path))
+
+        frv._VALIDATORS.clear()
+        frv.load_validator(SCHEMA_PATH, cache_dir=self.cache_dir)
+        self.assertTrue(os.path.exists(module_path)) # Regenerated by the next load
+
+    def test_validate_many_ndjson(self):
+        lines = [json.dumps(valid_state()), "", "{not json", json.dumps({"status": "PLANNING"})]
+        checked, failures = frv.validate_many(lines, self.validate)
+        self.assertEqual(checked, 3)
+        self.assertEqual([line for line, _ in failures], [3, 4])
+
+    def test_unsupported_keyword_is_rejected(self):
+        with self.assertRaises(ValueError):
+            frv.compile_validator({"type": "object", "additionalProperties": False})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Add path to find governance_client in templates/sentinel
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "../sentinel")))
+
+import governance_client
+
+POLICY_DIR = os.path.abspath(os.path.join(current_dir, "../../.agent/policies"))
+
+class StubOPA(BaseHTTPRequestHandler):
+    """Open-source OPA: no batch endpoint, single decisions evaluated like the Rego rule."""
+    calls = []
+    served = None # Rego modules returned by GET /v1/policies
+
+    def do_GET(self):
+        StubOPA.calls.append((self.path, None))
+        payload = json.dumps({"result": [{"id": f"m{i}.rego", "raw": raw} for i, raw in enumerate(StubOPA.served or [])]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StubOPA.calls.append((self.path, body))
+        if self.path.startswith("/v1/batch/"):
+            self.send_response(404); self.end_headers(); return
+        files = body["input"]["files"]
+        result = len(files) > 0 and all(f.startswith("docs/") or f.endswith(".md") for f in files)
+        payload = json.dumps({"result": result}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+class TestGovernanceClient(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, "cache.json")
+        StubOPA.calls = []
+        StubOPA.served = [governance_client.load_policy(POLICY_DIR)[0]]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compiles_repo_policy(self):
+        text, _ = governance_client.load_policy(POLICY_DIR)
+        trie, complete = governance_client.compile_policy(text)
+        self.assertTrue(complete)
+        self.assertTrue(trie.is_safe("docs/guide.txt"))
+        self.assertTrue(trie.is_safe("src/README.md"))
+        self.assertFalse(trie.is_safe("src/main.py"))
+        self.assertFalse(trie.is_safe("mydocs/x.py"))
+
+    def test_uncompiled_rules_mark_policy_incomplete(self):
+        _, complete = governance_client.compile_policy('is_safe(path) if { regex.match("^x", path) }')
+        self.assertFalse(complete)
+
+    def test_reduce_input_keeps_verdict_inputs(self):
+        client = governance_client.GovernanceClient("http://127.0.0.1:1", POLICY_DIR, None)
+        self.assertEqual(client.reduce_input(["docs/a", "b.md"]), ["b.md", "docs/a"]) # OPA's policy unknown: no pruning
+        client.served_hash = client.bundle_hash
+        self.assertEqual(client.reduce_input(["docs/a", "b.md", "docs/a"]), ["b.md"])
+        self.assertEqual(client.reduce_input(["docs/a", "src/x.py", "src/x.py"]), ["src/x.py"])
+
+    def test_fallback_when_sentinel_down(self):
+        client = governance_client.GovernanceClient("http://127.0.0.1:1", POLICY_DIR, self.cache_path)
+        self.assertEqual(client.decide_many([["docs/a.txt", "README.md"], ["src/x.py"], []]), [True, False, False])
+        self.assertEqual(client.stats["fallback"], 2)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+    def test_queries_opa_once_then_serves_from_cache(self):
+        server = HTTPServer(("127.0.0.1", 0), StubOPA)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}"
+            sets = [["docs/%d.txt" % i for i in range(1000)], ["docs/a.txt", "src/x.py"]]
+            client = governance_client.GovernanceClient(url, POLICY_DIR, self.cache_path)
+            self.assertEqual(client.decide_many(sets), [True, False])
+            # Known-safe paths were pruned before leaving the machine
+            self.assertEqual([len(b["input"]["files"]) for p, b in StubOPA.calls if p.startswith("/v1/data/")], [1, 1])
+
+            StubOPA.calls = []
+            reloaded = governance_client.GovernanceClient(url, POLICY_DIR, self.cache_path)
+            self.assertEqual(reloaded.decide_many([list(reversed(sets[0])), sets[1]]), [True, False])
+            self.assertEqual([p for p, _ in StubOPA.calls], ["/v1/policies"]) # No decision queries
+            self.assertEqual(reloaded.stats["cache_hits"], 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_stale_local_policy_sends_full_input(self):
+        # OPA serves a stricter policy than the local copy: nothing may be pruned
+        StubOPA.served = ['package antigravity.governance\nis_safe(path) if { startswith(path, "docs/") }\n']
+        server = HTTPServer(("127.0.0.1", 0), StubOPA)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = governance_client.GovernanceClient(f"http://127.0.0.1:{server.server_port}", POLICY_DIR, self.cache_path)
+            client.decide_many([["docs/a.txt", "README.md", "src/x.py"]])
+            self.assertFalse(client.policy_in_sync())
+            sent = [b["input"]["files"] for p, b in StubOPA.calls if p.startswith("/v1/data/")]
+            self.assertEqual(sent, [["README.md", "docs/a.txt", "src/x.py"]])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    unittest.main()
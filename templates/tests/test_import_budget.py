@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import subprocess
+import tempfile
+
+# Cold-start budget for the hook and gate entry points (they run on every commit/push).
+# Heavy SDKs must load only on the paths that use them; `-X importtime` shows both what an
+# entry point pulls in at import and what it costs.
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES = os.path.abspath(os.path.join(current_dir, ".."))
+AGENT = os.path.abspath(os.path.join(current_dir, "..", "..", ".agent"))
+
+BUDGET_MS = float(os.getenv("ANTIGRAVITY_IMPORT_BUDGET_MS", 150))
+RUNS = 3 # Best of N, after one run that warms the bytecode cache
+
+SDKS = ("vertexai", "google", "opentelemetry", "jira", "requests", "http.client", "redis")
+
+# (module directory, module, SDK packages it must not import at load time)
+ENTRY_POINTS = [
+    (os.path.join(AGENT, "runtime"), "orchestrator", SDKS),
+    (os.path.join(AGENT, "observability"), "jira_bridge", SDKS),
+    (os.path.join(TEMPLATES, "observability"), "jira_bridge", SDKS),
+    (os.path.join(TEMPLATES, "sentinel"), "cost_guard", SDKS),
+    (os.path.join(TEMPLATES, "sentinel"), "sync_billing", SDKS),
+    (os.path.join(TEMPLATES, "scripts"), "archive_telemetry", SDKS),
+]
+
+def import_profile(directory, module, env):
+    """{imported module: cumulative microseconds} for a fresh `import module`."""
+    code = f"import sys; sys.path.insert(0, {directory!r}); import {module}"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise AssertionError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+class TestImportBudget(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache = tempfile.TemporaryDirectory()
+        cls.env = dict(os.environ, PYTHONPYCACHEPREFIX=cls.cache.name)
+        cls.env.pop("PYTHONDONTWRITEBYTECODE", None) # Measure imports, not compilation
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cache.cleanup()
+
+    def test_entry_points(self):
+        for directory, module, forbidden in ENTRY_POINTS:
+            if not os.path.exists(os.path.join(directory, f"{module}.py")):
+                continue
+            with self.subTest(entry=os.path.relpath(os.path.join(directory, module), TEMPLATES)):
+                import_profile(directory, module, self.env)
+                runs = [import_profile(directory, module, self.env) for _ in range(RUNS)]
+
+                loaded = [name for name in runs[0] if name.split(".")[0] in forbidden or name in forbidden]
+                self.assertEqual(loaded, [], f"{module} imports heavy SDKs at load time")
+
+                best_ms = min(run[module] for run in runs) / 1000
+                self.assertLess(best_ms, BUDGET_MS, f"{module} import took {best_ms:.1f}ms (budget {BUDGET_MS:.0f}ms)")
+
+if __name__ == "__main__":
+    unittest.main()
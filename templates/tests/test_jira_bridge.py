@@ -2,6 +2,9 @@ import unittest
 import sys
 import os
 import json
+import gzip
+import tempfile
+from unittest import mock
 
 # Add path to find jira_bridge in templates/observability
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -44,5 +47,88 @@ class TestJiraBridge(unittest.TestCase):
         self.assertEqual(payload["logs"][0]["body"], logs)
         self.assertEqual(payload["logs"][0]["severity"], "ERROR")
 
+    def test_split_payload_content_addresses_logs(self):
+        """R 6.6 Envelope + blob split: identical bodies share one blob."""
+        first = jira_bridge.construct_flight_recorder_payload("t1", "abc", "Same stack trace", "a@b.com")
+        second = jira_bridge.construct_flight_recorder_payload("t2", "abc", "Same stack trace", "a@b.com")
+
+        env1, blobs1 = jira_bridge.split_payload(first)
+        env2, blobs2 = jira_bridge.split_payload(second)
+
+        self.assertEqual(list(blobs1), list(blobs2))
+        self.assertNotIn("body", env1["logs"][0])
+        self.assertEqual(env1["logs"][0]["body_ref"], env2["logs"][0]["body_ref"])
+        self.assertEqual(blobs1[env1["logs"][0]["body_sha256"]], blobs2[env2["logs"][0]["body_sha256"]])
+        self.assertEqual(gzip.decompress(next(iter(blobs1.values()))).decode(), "Same stack trace")
+        # Original payload is untouched (schema test above relies on it)
+        self.assertEqual(first["logs"][0]["body"], "Same stack trace")
+
+    def test_upload_blobs_skips_cached_digests(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, "index")
+            with mock.patch.object(jira_bridge, "BLOB_INDEX", index), \
+                 mock.patch.object(jira_bridge.subprocess, "call", return_value=1) as stat, \
+                 mock.patch.object(jira_bridge, "gsutil_cp", return_value=True) as cp:
+                _, blobs = jira_bridge.split_payload({"logs": [{"body": "boom"}]})
+                self.assertTrue(jira_bridge.upload_blobs(blobs, "gs://bucket"))
+                self.assertTrue(jira_bridge.upload_blobs(blobs, "gs://bucket"))
+                self.assertEqual(stat.call_count, 1)
+                self.assertEqual(cp.call_count, 1)
+                self.assertEqual(jira_bridge.load_blob_index("gs://other"), set())
+
+    def test_upload_blobs_removes_staging_and_records_existing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, "index")
+            staged = []
+
+            def cp(local_path, gcs_path, label, extra_args=()):
+                staged.append(local_path)
+                self.assertTrue(os.path.exists(local_path))
+                return True
+
+            _, blobs = jira_bridge.split_payload({"logs": [{"body": "new"}, {"body": "already remote"}]})
+            new_digest, remote_digest = list(blobs)
+            remote = lambda cmd, **kw: 0 if remote_digest in cmd[-1] else 1
+            with mock.patch.object(jira_bridge, "BLOB_INDEX", index), \
+                 mock.patch.object(jira_bridge.subprocess, "call", side_effect=remote), \
+                 mock.patch.object(jira_bridge, "gsutil_cp", side_effect=cp):
+                self.assertTrue(jira_bridge.upload_blobs(blobs, "gs://bucket"))
+                self.assertEqual(jira_bridge.load_blob_index("gs://bucket"), {new_digest, remote_digest})
+            self.assertEqual(len(staged), 1)
+            self.assertFalse(os.path.exists(staged[0]))
+            self.assertNotEqual(os.path.basename(staged[0]), f"{new_digest}.log.gz") # Not a predictable shared path
+
+    def test_blob_index_entries_expire(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = os.path.join(tmp, "index")
+            with mock.patch.object(jira_bridge, "BLOB_INDEX", index):
+                jira_bridge.record_blob("gs://bucket", "a" * 64, now=1000)
+                with open(index, "a") as f:
+                    f.write(f"gs://bucket {'b' * 64}\n") # Pre-expiry format: re-verified
+                self.assertEqual(jira_bridge.load_blob_index("gs://bucket", now=1000 + jira_bridge.BLOB_INDEX_TTL), {"a" * 64})
+                self.assertEqual(jira_bridge.load_blob_index("gs://bucket", now=1001 + jira_bridge.BLOB_INDEX_TTL), set())
+
+                # Writing prunes expired and pre-expiry entries
+                jira_bridge.record_blob("gs://other", "c" * 64, now=1001 + jira_bridge.BLOB_INDEX_TTL)
+                with open(index) as f:
+                    self.assertEqual([line.split()[1] for line in f], ["c" * 64])
+
+    def test_failed_digest_forgets_cached_duplicate(self):
+        from recurrence import RecurrenceCoalescer
+        from brain.redis_pool import MemoryRedis
+
+        coalescer = RecurrenceCoalescer(MemoryRedis(), window=60, max_count=1)
+        fingerprint = jira_bridge.compute_fingerprint("Build failed", "boom")
+        cache_key = ("TNG", fingerprint)
+        jira_bridge._DUPLICATE_CACHE[cache_key] = ({"key": "TNG-1"}, float("inf"))
+        self.addCleanup(jira_bridge._DUPLICATE_CACHE.pop, cache_key, None)
+
+        with mock.patch.object(jira_bridge, "get_coalescer", return_value=coalescer), \
+             mock.patch.object(jira_bridge, "get_git_info", return_value=("dev", "dev@example.com")), \
+             mock.patch.object(jira_bridge, "make_request", return_value=None):
+            self.assertEqual(jira_bridge.create_ticket("Build failed", "boom", "TNG", headers={"Authorization": "x"}), "TNG-1")
+        self.assertNotIn(cache_key, jira_bridge._DUPLICATE_CACHE)
+        self.assertEqual(coalescer.history(fingerprint)["stats"]["pending"], 1) # Retried on the next flush
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add path to find jira_mirror in templates/observability
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "../observability")))
+
+import jira_mirror
+
+def make_issue(key, updated, status="To Do", assignee="Jane Doe", fp="abc"):
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Failure {key}",
+            "status": {"name": status},
+            "assignee": {"displayName": assignee} if assignee else None,
+            "labels": ["auto-generated", f"fp:{fp}"],
+            "created": updated,
+            "updated": updated,
+        },
+    }
+
+class TestJiraMirror(unittest.TestCase):
+    def setUp(self):
+        self.mirror = jira_mirror.JiraMirror(":memory:")
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def test_sync_follows_next_page_token(self):
+        """Pagination: every page is applied and the token is forwarded."""
+        pages = [
+            {"issues": [make_issue("TNG-1", "2026-01-01T10:00:00.000+0000")], "nextPageToken": "p2"},
+            {"issues": [make_issue("TNG-2", "2026-01-01T11:00:00.000+0000")], "isLast": True},
+        ]
+        requests = []
+
+        def search(payload):
+            requests.append(dict(payload))
+            return pages[len(requests) - 1]
+
+        self.assertEqual(self.mirror.sync(search, "TNG"), 2)
+        self.assertNotIn("nextPageToken", requests[0])
+        self.assertEqual(requests[1]["nextPageToken"], "p2")
+        self.assertEqual(requests[0]["fields"], jira_mirror.SYNC_FIELDS)
+        self.assertEqual([i["key"] for i in self.mirror.query("TNG")], ["TNG-2", "TNG-1"])
+
+    def test_delta_sync_bounds_jql_and_updates_rows(self):
+        """Delta: the second sync only asks for issues updated since the last one."""
+        self.mirror.sync(lambda p: {"issues": [make_issue("TNG-1", "2026-01-01T10:30:00.000+0000")]}, "TNG")
+
+        requests = []
+        def search(payload):
+            requests.append(payload)
+            return {"issues": [make_issue("TNG-1", "2026-01-01T12:00:00.000+0000", status="Done")]}
+
+        self.mirror.sync(search, "TNG")
+        self.assertIn('updated >= "2026-01-01 10:29"', requests[0]["jql"])
+        self.assertEqual(self.mirror.query("TNG", status="Done")[0]["key"], "TNG-1")
+        self.assertEqual(self.mirror.query("TNG", status="To Do"), [])
+
+    def test_query_filters(self):
+        self.mirror.upsert("TNG", [
+            make_issue("TNG-1", "2026-01-01T10:00:00.000+0000", fp="aaa", assignee=None),
+            make_issue("TNG-2", "2026-01-02T10:00:00.000+0000", fp="bbb"),
+        ])
+        self.assertEqual([i["key"] for i in self.mirror.query("TNG", fingerprint="aaa")], ["TNG-1"])
+        self.assertEqual([i["key"] for i in self.mirror.query("TNG", assignee="Unassigned")], ["TNG-1"])
+        self.assertEqual(len(self.mirror.query("TNG", limit=1)), 1)
+
+    def test_sync_mock_is_incremental(self):
+        with tempfile.NamedTemporaryFile("w", delete=False) as f:
+            f.write("[TNG] Fix [Build] Failure (Owner: a@b.com) | FP: 0123456789abcdef\n")
+            path = f.name
+        try:
+            self.assertEqual(self.mirror.sync_mock(path, "TNG"), 1)
+            self.assertEqual(self.mirror.sync_mock(path, "TNG"), 0)
+            with open(path, "a") as f:
+                f.write("[OPS] Other Project (Owner: a@b.com) | FP: ffff\n")
+                f.write("[TNG] Second Failure (Owner: c@d.com) | FP: fedcba9876543210\n")
+            self.assertEqual(self.mirror.sync_mock(path, "TNG"), 1)
+            self.assertEqual(self.mirror.query("TNG")[0]["summary"], "Second Failure")
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()
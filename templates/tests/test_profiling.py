@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+# Add path to find the observability package in templates/
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from observability import profiling
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.original_dir = profiling.PROFILE_DIR
+        profiling.PROFILE_DIR = self.tmp.name
+
+    def tearDown(self):
+        profiling.finish()
+        profiling.PROFILE_DIR = self.original_dir
+        self.tmp.cleanup()
+
+    def test_disabled_is_inert(self):
+        run = subprocess.run
+        self.assertIsNone(profiling.start("test", modes=set()))
+        self.assertFalse(profiling.enabled())
+        self.assertIs(subprocess.run, run)
+        self.assertIs(profiling.phase("a"), profiling.phase("b"))
+        self.assertIsNone(profiling.snapshot())
+        self.assertIsNone(profiling.finish())
+
+    def test_requested_modes(self):
+        self.assertEqual(profiling.requested_modes(""), set())
+        self.assertEqual(profiling.requested_modes("all"), set(profiling.MODES))
+        self.assertEqual(profiling.requested_modes("cprofile, sample"), {"cprofile", "sample"})
+        self.assertEqual(profiling.requested_modes("timing"), {"timing"})
+
+    def test_artifacts(self):
+        run = subprocess.run
+        profiling.start("test", modes=profiling.MODES)
+        self.assertIsNot(subprocess.run, run)
+        with profiling.phase("work"):
+            sum(i * i for i in range(50000))
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+        snapshot = profiling.snapshot()
+        self.assertFalse(snapshot["final"])
+        self.assertEqual([p["name"] for p in snapshot["phases"]], ["work"])
+        self.assertEqual(snapshot["subprocesses"][0]["returncode"], 0)
+        self.assertEqual(snapshot["subprocesses"][0]["command"], f"{sys.executable} -c")
+
+        path = profiling.finish()
+        self.assertIs(subprocess.run, run)
+        with open(path) as f:
+            manifest = json.load(f)
+        self.assertTrue(manifest["final"])
+        self.assertTrue(manifest["cprofile_top"])
+        self.assertGreater(manifest["tracemalloc"]["peak_bytes"], 0)
+        self.assertTrue(os.path.exists(manifest["artifacts"]["pstats"]))
+        self.assertTrue(os.path.exists(manifest["artifacts"]["folded_stacks"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+
+# Add paths to find recurrence (templates/observability) and the Brain stand-in (templates/brain)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "../observability")))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+import recurrence
+from brain.redis_pool import MemoryRedis
+
+class TestRecurrenceCoalescer(unittest.TestCase):
+    def setUp(self):
+        self.client = MemoryRedis()
+        self.coalescer = recurrence.RecurrenceCoalescer(self.client, window=60, max_count=3)
+        self.posted = []
+
+    def post(self, issue_key, body):
+        self.posted.append((issue_key, body))
+        return True
+
+    def test_count_threshold_triggers_single_digest(self):
+        due = [self.coalescer.record("fp1", "TNG-1", f"t{i}", f"run/{i}", now=1000 + i) for i in range(3)]
+        self.assertEqual(due, [False, False, True])
+        self.assertTrue(self.coalescer.flush("fp1", self.post, now=1003))
+        self.assertEqual(len(self.posted), 1)
+        self.assertIn("3 new occurrence(s)", self.posted[0][1]["body"]["content"][0]["content"][0]["text"])
+
+        history = self.coalescer.history("fp1")
+        self.assertEqual(history["stats"]["count"], 3)
+        self.assertEqual(history["stats"]["pending"], 0)
+        self.assertEqual([r["trace_id"] for r in history["runs"]], ["t2", "t1", "t0"])
+
+    def test_time_window_flush_due(self):
+        self.coalescer.record("fp1", "TNG-1", "t0", "run/0", now=1000)
+        self.assertEqual(self.coalescer.flush_due(self.post, now=1030), 0)
+        self.assertEqual(self.coalescer.flush_due(self.post, now=1061), 1)
+        self.assertEqual(self.coalescer.flush_due(self.post, now=2000), 0)
+
+    def test_opening_occurrence_is_history_only(self):
+        self.assertFalse(self.coalescer.record("fp1", "TNG-1", "t0", "run/0", notify=False, now=1000))
+        self.assertEqual(self.coalescer.flush_due(self.post, now=5000), 0)
+        self.assertEqual(self.coalescer.history("fp1")["stats"]["first_seen"], "1000")
+
+    def test_failed_post_keeps_occurrences_pending(self):
+        for i in range(3):
+            self.coalescer.record("fp1", "TNG-1", f"t{i}", f"run/{i}", now=1000)
+        self.assertFalse(self.coalescer.flush("fp1", lambda key, body: False, now=1001))
+        self.assertEqual(self.coalescer.history("fp1")["stats"]["pending"], 3)
+        self.assertTrue(self.coalescer.flush("fp1", self.post, now=1002))
+
+    def test_keys_expire_after_ttl_refreshed_per_occurrence(self):
+        coalescer = recurrence.RecurrenceCoalescer(self.client, window=60, max_count=3, ttl=100)
+        coalescer.record("fp1", "TNG-1", "t0", "run/0", notify=False, now=1000)
+        self.client.expire(recurrence.stats_key("fp1"), 10)
+        coalescer.record("fp1", "TNG-1", "t1", "run/1", now=1001)
+        for key in (recurrence.stats_key("fp1"), recurrence.runs_key("fp1")):
+            self.assertTrue(0 < self.client.ttl(key) <= 100)
+
+    def test_digest_lists_only_pending_runs(self):
+        self.coalescer.record("fp1", "TNG-1", "t0", "run/0", notify=False, now=1000)
+        self.coalescer.record("fp1", "TNG-1", "t1", "run/1", count=2, now=1001)
+        self.coalescer.record("fp1", "TNG-1", "t2", "run/2", now=1002)
+        self.assertTrue(self.coalescer.flush("fp1", self.post, now=1003))
+
+        content = self.posted[0][1]["body"]["content"]
+        self.assertIn("3 new occurrence(s)", content[0]["content"][0]["text"])
+        listed = [item["content"][0]["content"][0]["text"] for item in content[1]["content"]]
+        self.assertEqual(len(listed), 2)
+        self.assertIn("Trace: t2 |", listed[0])
+        self.assertIn("Trace: t1 (x2) |", listed[1])
+
+    def test_lock_released_only_by_its_holder(self):
+        self.coalescer.record("fp1", "TNG-1", "t0", "run/0", now=1000)
+        lock = f"{recurrence.stats_key('fp1')}:lock"
+
+        def slow_post(issue_key, body):
+            # Our lock expired mid-post and another flusher took it over
+            self.client.delete(lock)
+            self.client.set(lock, "other-process", ex=30)
+            return True
+
+        self.assertTrue(self.coalescer.flush("fp1", slow_post, now=1001))
+        self.assertEqual(self.client.get(lock), "other-process")
+        self.client.delete(lock)
+        self.coalescer.record("fp1", "TNG-1", "t1", "run/1", now=1002)
+        self.assertTrue(self.coalescer.flush("fp1", self.post, now=1003))
+        self.assertIsNone(self.client.get(lock)) # Our own lock is removed
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import time
+import tempfile
+from unittest import mock
+
+# Add path to find the brain package in templates/
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from brain import redis_pool
+from brain.redis_pool import MemoryRedis
+
+class TestMemoryRedis(unittest.TestCase):
+    def setUp(self):
+        self.r = MemoryRedis()
+
+    def test_strings_expiry_and_counters(self):
+        self.assertTrue(self.r.set("k", 1.5, ex=60))
+        self.assertEqual(self.r.get("k"), "1.5")
+        self.assertIsNone(self.r.set("k", "x", nx=True))
+        self.assertEqual(self.r.incr("n"), 1)
+        self.assertEqual(self.r.incrby("n", 4), 5)
+        self.assertEqual(self.r.ttl("n"), -1)
+        self.assertEqual(self.r.ttl("missing"), -2)
+
+        self.r.set("short", "v", px=1)
+        time.sleep(0.01)
+        self.assertIsNone(self.r.get("short"))
+        self.assertEqual(self.r.exists("short", "k"), 1)
+
+        with self.assertRaises(redis_pool.ResponseError):
+            self.r.incr("k")
+        self.r.hset("h", "f", 1)
+        with self.assertRaises(redis_pool.ResponseError):
+            self.r.get("h")
+
+    def test_lists_and_sorted_sets(self):
+        self.r.lpush("l", "a", "b", "c")
+        self.assertEqual(self.r.lrange("l", 0, -1), ["c", "b", "a"])
+        self.r.ltrim("l", 0, 1)
+        self.assertEqual(self.r.lrange("l", 0, -1), ["c", "b"])
+
+        self.r.zadd("z", {"x": 3, "y": 1, "w": 2})
+        self.assertEqual(self.r.zrangebyscore("z", "-inf", 2), ["y", "w"])
+        self.assertEqual(self.r.zrangebyscore("z", "(1", "+inf"), ["w", "x"])
+        self.assertEqual(self.r.zadd("z", {"x": 9}, nx=True), 0)
+        self.assertEqual(self.r.zscore("z", "x"), 3.0)
+
+    def test_pipeline_watch_conflict(self):
+        self.r.set("balance", 10)
+        with self.r.pipeline() as pipe:
+            pipe.watch("balance")
+            self.assertEqual(pipe.get("balance"), "10") # Immediate between WATCH and MULTI
+            self.r.set("balance", 11) # Concurrent writer
+            pipe.multi()
+            pipe.set("balance", 0)
+            with self.assertRaises(redis_pool.WatchError):
+                pipe.execute()
+        self.assertEqual(self.r.get("balance"), "11")
+
+        pipe = self.r.pipeline()
+        pipe.incr("a").incr("a").get("a")
+        self.assertEqual(pipe.execute(), [1, 2, "2"])
+
+    def test_lua_lite(self):
+        script = """
+        local current = redis.call('INCRBY', KEYS[1], ARGV[1])
+        redis.call('EXPIRE', KEYS[1], ARGV[2])
+        return current
+        """
+        self.assertEqual(self.r.eval(script, 1, "lease", 5, 60), 5)
+        acquire = self.r.register_script(script)
+        self.assertEqual(acquire(keys=["lease"], args=[2, 60]), 7)
+        self.assertGreater(self.r.ttl("lease"), 0)
+        with self.assertRaises(redis_pool.ResponseError):
+            self.r.eval("if redis.call('GET', KEYS[1]) then return 1 end", 1, "lease")
+
+class TestGetClient(unittest.TestCase):
+    def setUp(self):
+        redis_pool.reset()
+        self.tmp = tempfile.mkdtemp()
+        self.patches = [
+            mock.patch.object(redis_pool, "HEALTH_FILE", os.path.join(self.tmp, "brain_offline")),
+            mock.patch.dict(os.environ, {"REDIS_HOST": "127.0.0.1", "REDIS_PORT": "1"}),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        redis_pool.reset()
+
+    def test_unconfigured_falls_back_to_shared_memory(self):
+        with mock.patch.dict(os.environ, {"ANTIGRAVITY_BRAIN": "memory"}):
+            first = redis_pool.get_client()
+            self.assertTrue(redis_pool.is_memory(first))
+            self.assertIs(first, redis_pool.get_client())
+            self.assertIsNone(redis_pool.get_client(fallback=False))
+
+    def test_failed_health_check_is_cached(self):
+        fake_redis = mock.MagicMock()
+        fake_redis.Redis.return_value.ping.side_effect = ConnectionError("refused")
+        with mock.patch.object(redis_pool, "redis", fake_redis):
+            self.assertIsNone(redis_pool.get_client(fallback=False))
+            self.assertTrue(redis_pool.is_memory(redis_pool.get_client()))
+            # Second call trusted the cached failure instead of reconnecting
+            self.assertEqual(fake_redis.Redis.return_value.ping.call_count, 1)
+            self.assertTrue(os.path.exists(redis_pool.HEALTH_FILE))
+            self.assertEqual(redis_pool.health()["backend"], "memory")
+
+    def test_healthy_client_is_pooled_and_reused(self):
+        fake_redis = mock.MagicMock()
+        with mock.patch.object(redis_pool, "redis", fake_redis):
+            client = redis_pool.get_client()
+            self.assertIs(client, redis_pool.get_client())
+            self.assertEqual(fake_redis.ConnectionPool.call_count, 1)
+            self.assertEqual(client.ping.call_count, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+import types
+import tempfile
+import subprocess
+import collections
+
+# Add path to find span_spool in templates/observability
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "../observability")))
+
+from span_spool import SpoolingSpanExporter, SpanExportResult, DropCountingSpanProcessor
+
+class FlakyExporter:
+    """Downstream stand-in: fails while `online` is False, records what it accepted."""
+    def __init__(self):
+        self.online = True
+        self.received = []
+
+    def export(self, spans):
+        if not self.online:
+            return SpanExportResult.FAILURE
+        self.received.extend(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+def make_spans(start, count):
+    return [{"name": f"span-{i}"} for i in range(start, start + count)]
+
+class TestSpoolingSpanExporter(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.downstream = FlakyExporter()
+
+    def exporter(self, **options):
+        options.setdefault("retry_interval", 0)
+        return SpoolingSpanExporter(self.downstream, self.dir, encode=dict, decode=dict, background=False, **options)
+
+    def test_spills_while_offline_and_replays_in_order(self):
+        exporter = self.exporter()
+        exporter.export(make_spans(0, 2))
+        self.downstream.online = False
+        self.assertEqual(exporter.export(make_spans(2, 3)), SpanExportResult.SUCCESS)
+        self.downstream.online = True
+        exporter.export(make_spans(5, 2)) # Queued behind the backlog, not sent ahead of it
+        self.assertEqual(len(self.downstream.received), 2)
+        self.assertEqual(exporter.stats()["queue_depth"], 5)
+
+        self.assertTrue(exporter.drain())
+        self.assertEqual([s["name"] for s in self.downstream.received], [f"span-{i}" for i in range(7)])
+        stats = exporter.stats()
+        self.assertEqual((stats["queue_depth"], stats["replayed"], stats["spilled"]), (0, 5, 5))
+        self.assertEqual(stats["mode"], "direct")
+
+    def test_backlog_survives_restart(self):
+        self.downstream.online = False
+        self.exporter().export(make_spans(0, 4))
+        self.downstream.online = True
+        restarted = self.exporter()
+        self.assertEqual(restarted.stats()["queue_depth"], 4)
+        self.assertTrue(restarted.drain())
+        self.assertEqual(len(self.downstream.received), 4)
+
+    def test_failed_replay_keeps_remaining_spans(self):
+        exporter = self.exporter()
+        self.downstream.online = False
+        exporter.export(make_spans(0, 3))
+        self.assertFalse(exporter.drain())
+        self.assertEqual(exporter.stats()["queue_depth"], 3)
+        self.assertTrue(exporter.store.has_backlog())
+
+    def test_bound_drops_oldest_segments(self):
+        exporter = self.exporter(max_bytes=200, segment_bytes=60)
+        self.downstream.online = False
+        for i in range(10):
+            exporter.export(make_spans(i * 2, 2))
+        stats = exporter.stats()
+        self.assertGreater(stats["dropped"], 0)
+        self.assertLessEqual(stats["queue_bytes"], 200 + 60)
+        self.assertEqual(stats["queue_depth"] + stats["dropped"], 20)
+
+        self.downstream.online = True
+        exporter.drain()
+        names = [s["name"] for s in self.downstream.received]
+        self.assertEqual(names, sorted(names, key=lambda n: int(n.split("-")[1]))) # Newest kept, order intact
+        self.assertEqual(names[-1], "span-19")
+
+    def test_lazy_factory_retried_until_available(self):
+        attempts = []
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("no credentials yet")
+            return self.downstream
+        exporter = SpoolingSpanExporter(factory, self.dir, encode=dict, decode=dict, background=False, retry_interval=0)
+        exporter.export(make_spans(0, 1))
+        self.assertEqual(exporter.stats()["queue_depth"], 1)
+        self.assertTrue(exporter.drain())
+        self.assertEqual(len(self.downstream.received), 1)
+
+    def test_depth_excludes_segments_of_live_processes(self):
+        other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            with open(os.path.join(self.dir, f"seg-{1:020d}-{other.pid}.ndjson"), "w") as f:
+                f.write('{"name":"theirs"}\n' * 3)
+            exporter = self.exporter()
+            self.assertEqual(exporter.stats()["queue_depth"], 0)
+            self.assertFalse(exporter.store.has_backlog())
+            exporter.export(make_spans(0, 1)) # No backlog of ours: sent directly
+            self.assertEqual(len(self.downstream.received), 1)
+        finally:
+            other.kill()
+            other.wait()
+        # Once its writer is gone the segment is ours to replay, and counted as it is claimed
+        self.assertTrue(exporter.store.has_backlog())
+        self.assertTrue(exporter.drain())
+        self.assertEqual(exporter.stats()["queue_depth"], 0)
+        self.assertEqual(exporter.stats()["replayed"], 3)
+
+    def test_counts_batch_queue_overflow(self):
+        class BatchProcessor:
+            """Stand-in with the SDK's bounded deque that evicts the oldest span."""
+            def __init__(self):
+                self.queue = collections.deque([], 2)
+            def on_end(self, span):
+                if span.context.trace_flags.sampled:
+                    self.queue.appendleft(span)
+            def force_flush(self, timeout_millis=30000):
+                return True
+
+        exporter = self.exporter()
+        processor = DropCountingSpanProcessor(BatchProcessor(), exporter)
+        span = lambda sampled: types.SimpleNamespace(context=types.SimpleNamespace(trace_flags=types.SimpleNamespace(sampled=sampled)))
+        for sampled in (True, True, True, False, True):
+            processor.on_end(span(sampled))
+        self.assertEqual(exporter.stats()["queue_dropped"], 2) # Unsampled spans never reach the queue
+        self.assertEqual(exporter.stats()["dropped"], 2)
+        self.assertTrue(processor.force_flush())
+
+if __name__ == "__main__":
+    unittest.main()
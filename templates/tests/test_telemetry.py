@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+# Add path to find the observability package in templates/
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from observability import telemetry
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        telemetry.reset()
+
+    def test_nested_spans_and_errors(self):
+        with telemetry.span("bridge.create_ticket") as root:
+            with telemetry.span("jira.http", method="GET"):
+                telemetry.annotate(response=True)
+            with self.assertRaises(RuntimeError):
+                with telemetry.span("git.blame"):
+                    raise RuntimeError("no repo")
+            children = telemetry.spans(within=root["span_id"])
+
+        self.assertEqual([s["name"] for s in children], ["jira.http", "git.blame"])
+        self.assertTrue(all(s["parent_span_id"] == root["span_id"] for s in children))
+        self.assertEqual(children[0]["attributes"], {"method": "GET", "response": True})
+        self.assertEqual(children[1]["status"]["code"], "Error")
+        self.assertGreaterEqual(children[0]["end_time_unix_nano"], children[0]["start_time_unix_nano"])
+        self.assertIsNone(telemetry.current())
+
+        stats = telemetry.summary()
+        self.assertEqual(stats["git.blame"]["errors"], 1)
+        self.assertEqual(stats["bridge.create_ticket"]["count"], 1)
+
+    def test_opentelemetry_loads_only_when_spans_can_export(self):
+        env = {k: v for k, v in os.environ.items() if k != "OTEL_EXPORTER_OTLP_ENDPOINT"}
+        with mock.patch.object(telemetry, "_otel", None), mock.patch.dict(sys.modules):
+            sys.modules.pop("opentelemetry", None)
+            with mock.patch.dict(os.environ, env, clear=True):
+                with telemetry.span("git.blame"):
+                    pass
+                self.assertIsNone(telemetry._otel) # Not even attempted
+
+            sys.modules["opentelemetry"] = None # The import now fails, so an attempt leaves _otel False
+            with mock.patch.dict(os.environ, {"OTEL_EXPORTER_OTLP_ENDPOINT": "http://127.0.0.1:4318"}):
+                with telemetry.span("git.blame"):
+                    pass
+                self.assertIs(telemetry._otel, False)
+
+    def test_percentiles(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(telemetry.percentile(values, 50), 50.0)
+        self.assertEqual(telemetry.percentile(values, 99), 99.0)
+        self.assertEqual(telemetry.percentile([], 99), 0.0)
+
+    def test_traced_decorator_and_mark_error(self):
+        @telemetry.traced("sentinel.solvency_check")
+        def check():
+            telemetry.mark_error("insolvent")
+            return 42
+
+        self.assertEqual(check(), 42)
+        self.assertEqual(telemetry.spans()[-1]["status"], {"code": "Error", "message": "insolvent"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add path to find the observability package in templates/
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(current_dir, "..")))
+
+from observability import friction_log, triage_analytics
+from observability.triage_analytics import TriageStore
+
+DAY = 86400
+NOW = 20000 * DAY + 3600 # 2024-10-04 01:00 UTC
+
+def trace(trace_id, ts, status, owner, ref="main", fingerprint="f" * 32, loop_count=None):
+    payload = {
+        "trace_id": trace_id,
+        "span_id": trace_id[:16],
+        "start_time_unix_nano": int(ts * 1e9),
+        "end_time_unix_nano": int((ts + 2) * 1e9),
+        "status": {"code": status},
+        "resource": {"vcs.ref.head.name": ref},
+        "attributes": {"owner": owner, "error.fingerprint": fingerprint},
+        "logs": [{"timestamp": "2024-10-04T00:00:00Z", "body_sha256": "a" * 64, "body_ref": "blobs/sha256/x.log.gz"}],
+    }
+    if loop_count is not None:
+        payload["attributes"]["loop_count"] = loop_count
+    return payload
+
+class TestTriageAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store_dir = os.path.join(self.tmp.name, "store")
+        self.archive = os.path.join(self.tmp.name, "archive")
+        os.makedirs(self.archive)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        with open(os.path.join(self.archive, name), "w") as f:
+            json.dump(data, f)
+
+    def batch(self, day_offset, errors):
+        date = triage_analytics._day_str(int(NOW // DAY) - day_offset)
+        return [
+            {"project": "p", "timestamp": f"{date}T00:00:0{i}Z", "date": date, "trace_id": f"t{day_offset}-{i}",
+             "loop_count": str(loop), "error": error, "cause": "cause", "agent": agent}
+            for i, (error, loop, agent) in enumerate(errors)
+        ]
+
+    def test_top_fingerprints_and_loops(self):
+        self.write("telemetry_1.json", self.batch(0, [("ImportError", 3, "builder"), ("ImportError", 5, "builder"), ("Timeout", 1, "qa")]))
+        self.write("telemetry_2.json", self.batch(10, [("Timeout", 2, "qa"), ("OldFailure", 4, "qa")]))
+        store = TriageStore(self.store_dir)
+        self.assertEqual(store.ingest([self.archive])["added"], 5)
+
+        top = store.top_fingerprints(days=7, now=NOW)
+        self.assertEqual([(r["label"], r["count"]) for r in top], [("ImportError", 2), ("Timeout", 1)])
+        self.assertEqual([r["count"] for r in store.top_fingerprints(days=0, now=NOW)], [2, 2, 1])
+        self.assertEqual([r["label"] for r in store.top_fingerprints(days=7, owner="qa", now=NOW)], ["Timeout"])
+        self.assertEqual(store.top_fingerprints(days=7, owner="nobody", now=NOW), [])
+        self.assertEqual(store.loop_distribution(), [(1, 1), (2, 1), (3, 1), (4, 1), (5, 1)])
+        self.assertEqual(store.loop_distribution(days=7, owner="builder", now=NOW), [(3, 1), (5, 1)])
+
+    def test_incremental_ingest_and_reopen(self):
+        self.write("telemetry_1.json", self.batch(0, [("ImportError", 3, "builder")]))
+        self.assertEqual(TriageStore(self.store_dir).ingest([self.archive])["added"], 1)
+
+        store = TriageStore(self.store_dir)
+        self.assertEqual(store.ingest([self.archive])["files"], 0) # Unchanged files are not re-read
+        self.write("telemetry_2.json", self.batch(0, [("ImportError", 3, "builder"), ("Timeout", 1, "qa")]))
+        result = store.ingest([self.archive])
+        self.assertEqual((result["added"], result["duplicates"]), (1, 1)) # Same record archived twice
+
+        reopened = TriageStore(self.store_dir)
+        self.assertEqual(reopened.rows, 2)
+        self.assertEqual(reopened.top_fingerprints(days=7, status="friction", now=NOW)[0]["label"], "ImportError")
+        self.assertEqual(reopened.stats()["distinct"]["owner"], 2)
+        # Indexes and aggregates round-trip through array bytes and JSON, not a rebuild
+        self.assertEqual(reopened.aggregates, store.aggregates)
+        self.assertEqual(reopened._load_postings("owner"), store.postings("owner"))
+        self.assertEqual([n for n in os.listdir(self.store_dir) if n.endswith(".pkl")], [])
+
+    def test_friction_store_offsets(self):
+        store_path = os.path.join(self.archive, "SDLC_Friction_Log.ndjson")
+        friction_log.append("t1", 2, "Loop limit", "flaky", path=store_path)
+        store = TriageStore(self.store_dir)
+        store.ingest([store_path])
+        friction_log.append("t2", 4, "Loop limit", "flaky", path=store_path)
+        self.assertEqual(store.ingest([store_path])["added"], 1)
+        self.assertEqual(store.loop_distribution(), [(2, 1), (4, 1)])
+
+    def test_friction_store_recreated_past_saved_offset(self):
+        store_path = os.path.join(self.archive, "SDLC_Friction_Log.ndjson")
+        for i in range(3):
+            friction_log.append(f"t{i}", 2, "Loop limit", "flaky", path=store_path)
+        store = TriageStore(self.store_dir)
+        store.ingest([store_path])
+        friction_log.release(friction_log.claim(store_path), store_path) # Archived: a fresh store follows
+        for i in range(3, 9):
+            friction_log.append(f"t{i}", 3, "Loop limit", "flaky", path=store_path)
+        self.assertEqual(store.ingest([store_path])["added"], 6)
+        self.assertEqual(store.loop_distribution(), [(2, 3), (3, 6)])
+
+    def test_mttr_by_owner(self):
+        hour = 3600
+        base = NOW - 2 * DAY
+        events = [
+            trace("a1", base, "Error", "dev1@tngshopper.com"),
+            trace("a2", base + hour, "Error", "dev2@tngshopper.com"), # Same incident, still dev1's
+            trace("a3", base + 3 * hour, "Ok", "dev2@tngshopper.com"),
+            trace("b1", base, "Error", "dev2@tngshopper.com", ref="feature"),
+            trace("b2", base + hour, "Ok", "dev2@tngshopper.com", ref="feature"),
+            trace("c1", base + 5 * hour, "Error", "dev2@tngshopper.com"), # Still open
+        ]
+        for i, payload in enumerate(events):
+            self.write(f"trace_{i}.json", payload)
+        store = TriageStore(self.store_dir)
+        store.ingest([self.archive])
+        mttr = {r["owner"]: r for r in store.mttr_by_owner(days=7, now=NOW)}
+        self.assertEqual(mttr["dev1@tngshopper.com"]["mean_hours"], 3.0)
+        self.assertEqual((mttr["dev2@tngshopper.com"]["mean_hours"], mttr["dev2@tngshopper.com"]["open"]), (1.0, 1))
+
+        # A late-arriving failure inside the resolved window is replayed in time order
+        self.write("trace_late.json", trace("late", base - hour, "Error", "dev2@tngshopper.com", ref="feature"))
+        store.ingest([self.archive])
+        mttr = {r["owner"]: r for r in TriageStore(self.store_dir).mttr_by_owner(days=7, now=NOW)}
+        self.assertEqual(mttr["dev2@tngshopper.com"]["mean_hours"], 2.0)
+
+    def test_envelopes_group_by_fingerprint_attribute(self):
+        event = triage_analytics.event_from_trace(trace("t1", NOW, "Error", "dev1@tngshopper.com", loop_count=4))
+        self.assertEqual((event["fingerprint"], event["loop_count"], event["duration_ms"]), ("f" * 32, 4, 2000.0))
+        payload = trace("t2", NOW, "Error", "dev1@tngshopper.com")
+        del payload["attributes"]["error.fingerprint"]
+        self.assertEqual(triage_analytics.event_from_trace(payload)["fingerprint"], "a" * 64) # body_sha256, no blob fetch
+
+if __name__ == "__main__":
+    unittest.main()
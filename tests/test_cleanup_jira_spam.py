@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import types
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "utils")))
+
+import cleanup_jira_spam
+
+def issue(key, created, labels):
+    return types.SimpleNamespace(key=key, fields=types.SimpleNamespace(created=created, labels=labels))
+
+def test_build_jql_defaults_and_selectors():
+    parser = cleanup_jira_spam.build_parser()
+    assert cleanup_jira_spam.build_jql(parser.parse_args([])) == 'project = TNG AND labels = "antigravity-auto" ORDER BY created ASC'
+    # Only the templates bridge writes fp: labels, and it labels its tickets auto-generated
+    assert cleanup_jira_spam.build_jql(parser.parse_args(["--duplicates", "--older-than", "30"])) == (
+        'project = TNG AND labels = "auto-generated" AND created <= -30d ORDER BY created ASC'
+    )
+    assert cleanup_jira_spam.build_jql(parser.parse_args(["--label", "", "--project", "OPS"])) == "project = OPS ORDER BY created ASC"
+    assert cleanup_jira_spam.build_jql(parser.parse_args(["--jql", "key = TNG-1", "--label", "x"])) == "key = TNG-1"
+
+def test_dry_run_unless_yes():
+    parser = cleanup_jira_spam.build_parser()
+    assert not parser.parse_args([]).yes
+    assert parser.parse_args(["--yes"]).yes
+
+def test_select_duplicates_keeps_oldest_per_fingerprint():
+    issues = [
+        issue("TNG-3", "2026-01-03", ["auto-generated", "fp:a"]),
+        issue("TNG-1", "2026-01-01", ["auto-generated", "fp:a"]),
+        issue("TNG-2", "2026-01-02", ["fp:b"]),
+        issue("TNG-4", "2026-01-04", ["fp:b"]),
+        issue("TNG-5", "2026-01-05", None), # No fingerprint: never a duplicate
+    ]
+    assert [i.key for i in cleanup_jira_spam.select_duplicates(issues)] == ["TNG-3", "TNG-4"]
+
+def test_rate_limiter_spaces_calls_across_threads():
+    limiter = cleanup_jira_spam.RateLimiter(50) # 20 ms apart
+    start = time.monotonic()
+    threads = [threading.Thread(target=limiter.wait) for _ in range(6)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert time.monotonic() - start >= 5 * 0.02 * 0.9
+
+    unlimited = cleanup_jira_spam.RateLimiter(0)
+    start = time.monotonic()
+    for _ in range(100):
+        unlimited.wait()
+    assert time.monotonic() - start < 0.05
+
+def test_dry_run_reads_checkpoint_without_writing(tmp_path, monkeypatch, capsys):
+    checkpoint = tmp_path / "cleanup.checkpoint"
+    checkpoint.write_text("TNG-1\n")
+    issues = [issue("TNG-1", "2026-01-01", []), issue("TNG-2", "2026-01-02", [])]
+
+    class FakeJira:
+        def __init__(self, **kwargs):
+            pass
+        def search_issues(self, jql, **kwargs):
+            return issues
+
+    monkeypatch.setitem(sys.modules, "jira", types.SimpleNamespace(JIRA=FakeJira))
+    monkeypatch.setenv("JIRA_USER_EMAIL", "bot@example.com")
+    monkeypatch.setenv("JIRA_API_TOKEN", "token")
+    cleanup_jira_spam.main(["--checkpoint", str(checkpoint)])
+
+    out = capsys.readouterr().out
+    assert "Matched 2 issues (1 already processed)" in out
+    assert "Would delete TNG-2" in out and "Would delete TNG-1" not in out
+    assert checkpoint.read_text() == "TNG-1\n"
+
+    cleanup_jira_spam.main(["--checkpoint", str(checkpoint), "--reset-checkpoint"])
+    assert "Matched 2 issues (0 already processed)" in capsys.readouterr().out
+    assert checkpoint.read_text() == "TNG-1\n" # A dry run never clears it either
@@ -1,13 +1,15 @@
 import os
 import sys
-from jira import JIRA
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Ticket list provided by Forensic Audit
-SPAM_TICKETS = [
-    "TNG-41", "TNG-40", "TNG-39", "TNG-32",
-    "TNG-42", "TNG-43", "TNG-44", "TNG-45", "TNG-46", "TNG-47", "TNG-48", "TNG-49", "TNG-50", "TNG-51", "TNG-52", "TNG-53", "TNG-54", "TNG-55", "TNG-56", "TNG-57", "TNG-58", "TNG-59", "TNG-62",
-    "TNG-66", "TNG-67", "TNG-68", "TNG-69", "TNG-70", "TNG-71", "TNG-72", "TNG-73", "TNG-74", "TNG-75", "TNG-76", "TNG-77", "TNG-78"
-]
+# Selection defaults: tickets opened by the bridges carry these labels
+DEFAULT_PROJECT = "TNG"
+DEFAULT_LABEL = "antigravity-auto" # .agent bridge (no fingerprint labels)
+DUPLICATES_LABEL = "auto-generated" # templates bridge, the only one that sets `fp:<hash>`
+DEFAULT_CHECKPOINT = os.path.expanduser("~/.antigravity/jira_cleanup.checkpoint")
 
 def load_env_file(filepath):
     """Manually load .env variables if not present."""
@@ -25,10 +27,117 @@ def load_env_file(filepath):
                     value = value[1:-1]
                 os.environ[key] = value
 
-def main():
+class RateLimiter:
+    """Spaces calls across all workers to at most `rate` per second."""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+class Checkpoint:
+    """Append-only record of processed keys so an interrupted run can resume.
+
+    A `read_only` checkpoint reports previous progress but never writes (dry runs).
+    """
+    def __init__(self, path, read_only=False):
+        self.path = path
+        self.read_only = read_only
+        self.lock = threading.Lock()
+        self.done = set()
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                self.done = {line.strip() for line in f if line.strip()}
+
+    def mark(self, key):
+        if not self.path or self.read_only:
+            return
+        with self.lock:
+            self.done.add(key)
+            with open(self.path, "a") as f:
+                f.write(f"{key}\n")
+
+def resolve_label(args):
+    """The label selector; --duplicates needs the bridge that writes `fp:` labels."""
+    if args.label is not None:
+        return args.label
+    return DUPLICATES_LABEL if args.duplicates else DEFAULT_LABEL
+
+def build_jql(args):
+    """Translate CLI selectors into a single JQL query."""
+    if args.jql:
+        return args.jql
+    clauses = [f"project = {args.project}"]
+    label = resolve_label(args)
+    if label:
+        clauses.append(f"labels = \"{label}\"")
+    if args.older_than is not None:
+        clauses.append(f"created <= -{args.older_than}d")
+    return " AND ".join(clauses) + " ORDER BY created ASC"
+
+def search_all(jira, jql, fields="labels,created"):
+    """Page through every match; field projection keeps each page small."""
+    if hasattr(jira, "enhanced_search_issues"):
+        return list(jira.enhanced_search_issues(jql, maxResults=0, fields=fields))
+    return list(jira.search_issues(jql, maxResults=False, fields=fields))
+
+def select_duplicates(issues):
+    """Keep the oldest issue per `fp:` label; return the rest."""
+    seen = set()
+    duplicates = []
+    for issue in sorted(issues, key=lambda i: i.fields.created):
+        fingerprints = [l for l in (issue.fields.labels or []) if l.startswith("fp:")]
+        if not fingerprints:
+            continue
+        if fingerprints[0] in seen:
+            duplicates.append(issue)
+        else:
+            seen.add(fingerprints[0])
+    return duplicates
+
+def process_issue(jira, issue, args, limiter):
+    """Delete or transition a single issue. Search results are used directly (no re-fetch)."""
+    limiter.wait()
+    if args.action == "transition":
+        jira.transition_issue(issue, args.transition)
+        return "Transitioned"
+    issue.delete()
+    return "Deleted"
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Antigravity Jira Cleaner (dry run unless --yes)")
+    parser.add_argument("--project", default=DEFAULT_PROJECT, help="Project key to search")
+    parser.add_argument("--jql", help="Raw JQL selector (overrides --project/--label/--older-than)")
+    parser.add_argument("--label", help=f"Only select issues with this label (default: {DEFAULT_LABEL}, or {DUPLICATES_LABEL} with --duplicates; '' for any)")
+    parser.add_argument("--older-than", type=int, help="Only select issues created at least N days ago")
+    parser.add_argument("--duplicates", action="store_true", help="Only select repeat `fp:` issues, keeping the oldest")
+    parser.add_argument("--action", choices=["delete", "transition"], default="delete")
+    parser.add_argument("--transition", default="Done", help="Target transition name for --action transition")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent API workers")
+    parser.add_argument("--rate", type=float, default=10.0, help="Max API calls per second across workers")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="Resume file of processed keys")
+    parser.add_argument("--reset-checkpoint", action="store_true", help="Ignore and clear a previous checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="List the selection without changing anything (the default)")
+    parser.add_argument("--yes", action="store_true", help="Actually delete / transition the selection")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.yes:
+        args.dry_run = True
+
     print("🧹 Antigravity Jira Cleaner")
     print("-------------------------")
-    
+
     # Load .env relative to script location (../.env)
     env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.env'))
     load_env_file(env_path)
@@ -44,27 +153,55 @@ def main():
 
     try:
         print(f"🔌 Connecting to {server} as {email}...")
+        from jira import JIRA # Imported here so the selection helpers work without the SDK
         jira = JIRA(server=server, basic_auth=(email, token))
-        
+
+        jql = build_jql(args)
+        print(f"🔎 Selecting: {jql}")
+        issues = search_all(jira, jql)
+        if args.duplicates:
+            issues = select_duplicates(issues)
+
+        if args.reset_checkpoint and not args.dry_run and os.path.exists(args.checkpoint):
+            os.remove(args.checkpoint)
+        # A dry run reads the checkpoint to report resumable progress; --reset-checkpoint previews a fresh start
+        checkpoint = Checkpoint(None if args.dry_run and args.reset_checkpoint else args.checkpoint, read_only=args.dry_run)
+        pending = [i for i in issues if i.key not in checkpoint.done]
+        print(f"📋 Matched {len(issues)} issues ({len(issues) - len(pending)} already processed).")
+
+        if args.dry_run:
+            for issue in pending:
+                print(f"   [DRY-RUN] Would {args.action} {issue.key}")
+            print("-------------------------")
+            print(f"🏁 Dry Run Complete. {len(pending)} issues selected. Re-run with --yes to {args.action} them.")
+            return
+
+        checkpoint_dir = os.path.dirname(args.checkpoint)
+        if checkpoint_dir: # A bare filename lives in the working directory
+            os.makedirs(checkpoint_dir, exist_ok=True)
+        limiter = RateLimiter(args.rate)
         success_count = 0
         fail_count = 0
 
-        for ticket_id in SPAM_TICKETS:
-            print(f"   🗑️  Processing {ticket_id}...", end=" ")
-            try:
-                issue = jira.issue(ticket_id)
-                issue.delete()
-                print("✅ Deleted")
-                success_count += 1
-            except Exception as e:
-                if "404" in str(e):
-                    print("⚠️  Not Found (Already deleted?)")
-                else:
-                    print(f"❌ Error: {str(e)}")
-                fail_count += 1
-        
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futures = {pool.submit(process_issue, jira, issue, args, limiter): issue.key for issue in pending}
+            for future in as_completed(futures):
+                ticket_id = futures[future]
+                try:
+                    outcome = future.result()
+                    print(f"   🗑️  {ticket_id}: ✅ {outcome}")
+                    checkpoint.mark(ticket_id)
+                    success_count += 1
+                except Exception as e:
+                    if "404" in str(e):
+                        print(f"   🗑️  {ticket_id}: ⚠️  Not Found (Already deleted?)")
+                        checkpoint.mark(ticket_id)
+                    else:
+                        print(f"   🗑️  {ticket_id}: ❌ Error: {str(e)}")
+                    fail_count += 1
+
         print("-------------------------")
-        print(f"🏁 Cleanup Complete. Deleted: {success_count} | Failed/Skipped: {fail_count}")
+        print(f"🏁 Cleanup Complete. Processed: {success_count} | Failed/Skipped: {fail_count}")
 
     except Exception as e:
         print(f"\n❌ Critical Connection Error: {str(e)}")